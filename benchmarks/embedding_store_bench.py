@@ -0,0 +1,74 @@
+"""
+Memory and recall of the quantized embedding store against exact float32
+cosine search, for each store type.
+
+Reads description embeddings from a create_final_entities.parquet, or
+generates clustered random vectors. Queries are stored vectors plus noise.
+Memory is reported next to a float64 list per node, the least the
+description_embedding property costs in the graph.
+
+    python benchmarks/embedding_store_bench.py --count 100000 --dim 1536
+    python benchmarks/embedding_store_bench.py --parquet par2/create_final_entities.parquet
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "searches"))
+from embedding_store import STORE_DTYPES, EmbeddingStore, build_store
+
+def clustered_vectors(count, dim, clusters, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    return centers[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, dim), dtype=np.float32)
+
+def parquet_vectors(path):
+    table = pq.read_table(path, columns=["description_embedding"])
+    table = table.filter(table.column("description_embedding").is_valid())
+    embeddings = table.column("description_embedding").combine_chunks()
+    return embeddings.flatten().to_numpy().reshape(len(embeddings), -1).astype(np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parquet", help="create_final_entities.parquet to read embeddings from")
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = parquet_vectors(args.parquet) if args.parquet else clustered_vectors(args.count, args.dim, args.clusters)
+    count, dim = vectors.shape
+    ids = [f"entity-{i}" for i in range(count)]
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, count, args.queries)] + 0.3 * rng.standard_normal((args.queries, dim), dtype=np.float32)
+    print(f"{count} vectors of dimension {dim}, {args.queries} queries, recall@{args.k}")
+    print(f"  float64 node property: {count * dim * 8 / 2**20:10.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as folder:
+        exact = None
+        for dtype in STORE_DTYPES:
+            path = os.path.join(folder, dtype)
+            meta = build_store(ids, vectors, path, dtype)
+            store = EmbeddingStore(path)
+            start = time.perf_counter()
+            single = [store.search(query, args.k) for query in queries]
+            single_ms = (time.perf_counter() - start) * 1000 / len(queries)
+            start = time.perf_counter()
+            store.search_many(queries, args.k)
+            batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+            found = [{entity_id for entity_id, _ in hits} for hits in single]
+            if exact is None:
+                exact = found
+            recall = np.mean([len(f & e) / len(e) for f, e in zip(found, exact)])
+            print(f"  {dtype:>7} store: {meta['bytes'] / 2**20:10.1f} MiB  recall {recall:.4f}  "
+                  f"{single_ms:7.2f} ms/query single  {batch_ms:7.2f} ms/query batched")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Build time and per-query latency of the entity-name matcher used by
+entity_search, against the spaCy pipeline it replaced when spaCy is installed.
+
+Entity names are synthetic one- to four-word names; each query embeds a
+few of them in filler text.
+
+    python benchmarks/entity_extraction.py --entities 100000 --queries 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "searches"))
+from entity_matcher import EntityMatcher
+
+FILLER = "how does the policy of affect trade between and over the last decade".split()
+
+def synthetic_names(n, rng):
+    vocabulary = max(100, n // 4)
+    lengths = rng.integers(1, 5, n)
+    ends = np.cumsum(lengths)
+    words = rng.integers(0, vocabulary, ends[-1])
+    names = {" ".join(f"WORD{i}" for i in words[end - length:end]) for end, length in zip(ends, lengths)}
+    return sorted(names)
+
+def synthetic_queries(names, n, rng):
+    queries = []
+    for _ in range(n):
+        words = [FILLER[i] for i in rng.integers(0, len(FILLER), 8)]
+        for i in rng.integers(0, len(names), 3):
+            words.insert(rng.integers(0, len(words) + 1), names[i].title())
+        queries.append(" ".join(words))
+    return queries
+
+def percentiles(latencies):
+    latencies = np.asarray(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    names = synthetic_names(args.entities, rng)
+    queries = synthetic_queries(names, args.queries, rng)
+
+    start = time.perf_counter()
+    matcher = EntityMatcher(names)
+    print(f"built matcher over {matcher.count} names in {time.perf_counter() - start:.2f} s")
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        matcher.find(query)
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = percentiles(latencies)
+    print(f"{'matcher':>8}: p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+    try:
+        import spacy
+        nlp = spacy.load("en_core_web_sm")
+    except (ImportError, OSError) as e:
+        print(f"skipping spaCy: {e}")
+        return
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        [ent.text for ent in nlp(query).ents]
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = percentiles(latencies)
+    print(f"{'spacy':>8}: p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+if __name__ == "__main__":
+    main()
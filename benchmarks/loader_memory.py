@@ -0,0 +1,105 @@
+"""
+Peak-RSS comparison of the whole-file loader and the streaming loader.
+
+Writes a synthetic create_final_entities.parquet with embedding vectors,
+then consumes it in a fresh subprocess per mode and reports its peak RSS.
+The file is written as one row group by default, like pandas and GraphRAG
+write it; the streaming loader's peak should follow --batch-size, not
+--row-group-size.
+
+    python benchmarks/loader_memory.py --rows 200000 --dim 1536
+    python benchmarks/loader_memory.py --rows 200000 --row-group-size 10000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS = ["name", "type", "description", "human_readable_id", "id", "description_embedding", "text_unit_ids"]
+
+def write_entities(path, rows, dim, row_group_size=None):
+    # Each write_table call below becomes one row group
+    row_group_size = row_group_size or rows
+    writer = None
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, row_group_size):
+        n = min(row_group_size, rows - start)
+        ids = [f"entity-{i}" for i in range(start, start + n)]
+        embeddings = rng.random((n, dim), dtype=np.float32)
+        table = pa.table({
+            "name": [f"NAME {i}" for i in range(start, start + n)],
+            "type": ["ORGANIZATION"] * n,
+            "description": [f"description of entity {i}" for i in range(start, start + n)],
+            "human_readable_id": np.arange(start, start + n),
+            "id": ids,
+            "description_embedding": pa.FixedSizeListArray.from_arrays(embeddings.ravel(), dim).cast(pa.list_(pa.float32())),
+            "text_unit_ids": [[f"chunk-{i}", f"chunk-{i + 1}"] for i in range(start, start + n)],
+        })
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    writer.close()
+
+def peak_rss_kb():
+    # Linux keeps ru_maxrss across exec, so it would report the parent's
+    # peak from writing the file; VmHWM starts afresh with the new process
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def consume(mode, path, batch_size):
+    sys.path.insert(0, ROOT)
+    import load_to_mem
+
+    rows = 0
+    if mode == "dataframe":
+        import pandas as pd
+        df = pd.read_parquet(path, columns=COLUMNS)
+        for start in range(0, len(df), batch_size):
+            batch = df.iloc[start:start + batch_size]
+            records = [load_to_mem.convert_numpy_types(record) for record in batch.to_dict('records')]
+            rows += len(records)
+    else:
+        for records in load_to_mem.iter_parquet_batches(path, COLUMNS, batch_size):
+            rows += len(records)
+
+    print(f"{mode:>10}: {rows} rows, peak RSS {peak_rss_kb() / 1024:.1f} MiB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--row-group-size", type=int, default=None,
+                        help="rows per parquet row group (default: the whole file in one)")
+    parser.add_argument("--batch-size", type=int, default=400)
+    parser.add_argument("--consume", choices=["dataframe", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.consume:
+        consume(args.consume, args.path, args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "create_final_entities.parquet")
+        write_entities(path, args.rows, args.dim, args.row_group_size)
+        row_groups = pq.ParquetFile(path).metadata.num_row_groups
+        print(f"file size {os.path.getsize(path) / 2**20:.1f} MiB, {args.rows} rows x {args.dim} dims, "
+              f"{row_groups} row groups")
+        for mode in ("dataframe", "streaming"):
+            subprocess.run(
+                [sys.executable, __file__, "--consume", mode, "--path", path, "--batch-size", str(args.batch_size)],
+                check=True,
+            )
+
+if __name__ == "__main__":
+    main()
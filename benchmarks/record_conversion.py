@@ -0,0 +1,78 @@
+"""
+Microbenchmark of batch-to-Bolt record conversion.
+
+Compares the per-record convert_numpy_types walk over df.to_dict('records'),
+including the Arrow-to-pandas step the old loader paid in read_parquet, with
+Arrow's to_pylist and the columnar records_from_batch path, on batches shaped
+like create_final_entities and create_final_relationships.
+
+    python benchmarks/record_conversion.py --rows 5000 --dim 1536
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from load_to_mem import convert_numpy_types, records_from_batch
+
+def entity_batch(rows, dim):
+    rng = np.random.default_rng(0)
+    embeddings = rng.random((rows, dim), dtype=np.float32)
+    return pa.record_batch({
+        "name": [f"NAME {i}" for i in range(rows)],
+        "type": ["ORGANIZATION"] * rows,
+        "description": [f"description of entity {i}" for i in range(rows)],
+        "human_readable_id": np.arange(rows),
+        "id": [f"entity-{i}" for i in range(rows)],
+        "description_embedding": pa.FixedSizeListArray.from_arrays(embeddings.ravel(), dim).cast(pa.list_(pa.float32())),
+        "text_unit_ids": [[f"chunk-{i}", f"chunk-{i + 1}"] for i in range(rows)],
+    })
+
+def relationship_batch(rows):
+    rng = np.random.default_rng(0)
+    return pa.record_batch({
+        "source": [f"NAME {i}" for i in range(rows)],
+        "target": [f"NAME {i + 1}" for i in range(rows)],
+        "id": [f"rel-{i}" for i in range(rows)],
+        "rank": rng.integers(0, 50, rows),
+        "weight": rng.random(rows),
+        "human_readable_id": np.arange(rows).astype(str),
+        "description": [f"relationship {i}" for i in range(rows)],
+        "text_unit_ids": [[f"chunk-{i}"] * 3 for i in range(rows)],
+    })
+
+def compare(name, record_batch, repeat):
+    def legacy():
+        df = record_batch.to_pandas()
+        return [convert_numpy_types(record) for record in df.to_dict('records')]
+
+    assert records_from_batch(record_batch) == legacy()
+
+    timings = {
+        "convert_numpy_types": legacy,
+        "to_pylist": record_batch.to_pylist,
+        "records_from_batch": lambda: records_from_batch(record_batch),
+    }
+    print(f"{name} ({record_batch.num_rows} rows)")
+    baseline = None
+    for label, fn in timings.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"  {label:>20}: {best * 1000:8.1f} ms  ({baseline / best:4.1f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    compare("entities", entity_batch(args.rows, args.dim), args.repeat)
+    compare("relationships", relationship_batch(args.rows), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Payload size, peak client memory and latency of each search strategy's
+list results against its *_search_iter variant reading ids and scores
+only, for a large limit.
+
+Needs a loaded Memgraph. List runs bypass the result cache so both sides
+go to the database.
+
+    python benchmarks/result_streaming.py --limit 1000 --page-size 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "searches"))
+from gqlalchemy import Memgraph
+from hybrid_search import ITER_STRATEGIES, STRATEGIES
+from search_throughput import SAMPLE_QUERIES
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = run()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(rows), len(json.dumps(rows, default=str)), peak, seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=7687)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES))
+    args = parser.parse_args()
+
+    memgraph = Memgraph(host=args.host, port=args.port)
+    for name in args.strategies:
+        search, search_iter = STRATEGIES[name].uncached, ITER_STRATEGIES[name]
+        for query in SAMPLE_QUERIES[:3]:
+            full = measure(lambda: search(query, memgraph, args.limit))
+            # Only the id and score fields, which every iterator always returns
+            paged = measure(lambda: list(search_iter(query, memgraph, fields=[], limit=args.limit,
+                                                     page_size=args.page_size)))
+            print(f"{name:>20} {query[:30]!r:>32}: "
+                  f"list {full[0]:5} rows {full[1] / 1024:9.1f} KiB peak {full[2] / 1024:9.1f} KiB {full[3] * 1000:8.1f} ms | "
+                  f"iter {paged[0]:5} rows {paged[1] / 1024:9.1f} KiB peak {paged[2] / 1024:9.1f} KiB {paged[3] * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
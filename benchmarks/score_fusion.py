@@ -0,0 +1,78 @@
+"""
+Latency of hybrid_search's score fusion as candidates per strategy grow.
+
+Compares the array-based fuse() against the dict-per-item merge it
+replaced, on synthetic results shaped like each strategy's rows. The
+last two columns force fuse's dict and bincount merges, to check where
+ARRAY_MERGE_MIN should sit.
+
+    python benchmarks/score_fusion.py --candidates 100 1000 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "searches"))
+import score_fusion
+from score_fusion import DEFAULT_WEIGHTS, STRATEGY_FIELDS, fuse
+
+def synthetic_results(n, rng):
+    results = {}
+    for strategy, (id_type, id_field, text_field, score_field) in STRATEGY_FIELDS.items():
+        ids = rng.integers(0, n * 2, n)
+        scores = np.sort(rng.random(n))[::-1]
+        results[strategy] = [{id_field: f"{id_type}-{i}", 'name': f"NAME {i}", text_field: f"text {i}",
+                              score_field: float(score)} for i, score in zip(ids, scores)]
+    results['community_detection'] = [{'community': c, 'entities': [f"NAME {i}" for i in rng.integers(0, n * 2, 20)],
+                                       'relevance': int(n // 20 - c)} for c in range(max(1, n // 20))]
+    return results
+
+def dict_merge(results, limit):
+    combined = {}
+    for strategy, rows in results.items():
+        weight = DEFAULT_WEIGHTS[strategy]
+        if strategy == 'community_detection':
+            for row in rows:
+                for entity in row['entities']:
+                    entry = combined.setdefault(entity, {'text': f"Part of community {row['community']}", 'score': 0.0})
+                    entry['score'] += row['relevance'] * weight
+            continue
+        _, id_field, text_field, score_field = STRATEGY_FIELDS[strategy]
+        for row in rows:
+            entry = combined.setdefault(row[id_field], {'text': row[text_field], 'score': 0.0})
+            entry['score'] += row[score_field] * weight
+    ranked = sorted(combined.items(), key=lambda item: item[1]['score'], reverse=True)[:limit]
+    return [{'id': key, 'text': value['text'], 'score': value['score']} for key, value in ranked]
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.candidates:
+        results = synthetic_results(n, rng)
+        legacy = timed(lambda: dict_merge(results, args.limit), args.repeat)
+        line = f"{n:>7} per strategy: dict merge {legacy:8.2f} ms"
+        for fusion in ("rrf", "minmax"):
+            line += f"  fuse({fusion}) {timed(lambda: fuse(results, args.limit, fusion), args.repeat):8.2f} ms"
+        default = score_fusion.ARRAY_MERGE_MIN
+        for merge, minimum in (("dict", float("inf")), ("bincount", 0)):
+            score_fusion.ARRAY_MERGE_MIN = minimum
+            line += f"  fuse {merge} path {timed(lambda: fuse(results, args.limit), args.repeat):8.2f} ms"
+        score_fusion.ARRAY_MERGE_MIN = default
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Queries per second of each search strategy, one query at a time against
+the *_search_batch variants that send the whole batch in one statement.
+
+Needs a loaded Memgraph. Single-query runs bypass the result cache so
+both sides do the same work.
+
+    python benchmarks/search_throughput.py --queries 256 --batch-size 32
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "searches"))
+from gqlalchemy import Memgraph
+from hybrid_search import BATCH_STRATEGIES, STRATEGIES
+
+SAMPLE_QUERIES = [
+    "renewable energy impact on climate change",
+    "artificial intelligence in healthcare",
+    "supply chain disruptions",
+    "central bank interest rate policy",
+    "ocean plastic pollution",
+    "quantum computing research",
+    "urban public transport",
+    "vaccine development",
+]
+
+def distinct_queries(count, run):
+    # Strings no other run uses, so neither the embedding cache nor the
+    # result cache can serve them
+    return [f"{SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]} {run} {i}" for i in range(count)]
+
+def throughput(run, queries, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(queries), batch_size):
+        run(queries[i:i + batch_size])
+    return len(queries) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=7687)
+    parser.add_argument("--queries", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES))
+    args = parser.parse_args()
+
+    memgraph = Memgraph(host=args.host, port=args.port)
+
+    for name in args.strategies:
+        search = STRATEGIES[name].uncached
+        single = throughput(lambda batch: [search(query, memgraph, args.limit) for query in batch],
+                            distinct_queries(args.queries, f"{name} single"), args.batch_size)
+        batched = throughput(lambda batch: BATCH_STRATEGIES[name](batch, memgraph, args.limit),
+                             distinct_queries(args.queries, f"{name} batch"), args.batch_size)
+        print(f"{name:>20}: single {single:8.1f} q/s  batch {batched:8.1f} q/s  ({batched / single:.1f}x)")
+
+if __name__ == "__main__":
+    main()
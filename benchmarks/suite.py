@@ -0,0 +1,221 @@
+"""
+End-to-end benchmark: generate a synthetic GraphRAG dataset, time every
+load_to_mem.py import stage, the text and vector index builds, and every
+search strategy, then store the results as JSON for later comparison.
+
+--target memgraph runs against a Memgraph server (use a scratch instance;
+--reset wipes it first). --target stub runs against an in-process stand-in
+that accepts every statement and returns no rows, which isolates the
+client-side cost: Parquet reading, conversion, batching, encoding, BM25,
+IVF and fusion.
+
+    python benchmarks/suite.py --target stub --entities 5000
+    python benchmarks/suite.py --target memgraph --reset --compare benchmarks/results/baseline.json
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "searches"))
+import load_to_mem
+import semantic_search
+import text_index
+from connection_pool import ConnectionPool
+from graph_analytics import refresh_analytics
+from graph_version import bump_graph_version
+from hybrid_search import STRATEGIES, hybrid_search
+from synthetic_graphrag import generate
+from vector_index import build_index_from_parquet
+
+RESULTS_FOLDER = os.path.join(ROOT, "benchmarks", "results")
+# A metric this much slower than the baseline is reported as a regression,
+# unless it moved by less than the noise floor
+REGRESSION_THRESHOLD = 0.10
+NOISE_FLOOR_MS = 1.0
+
+class InProcessMemgraph:
+    """
+    Stand-in for a Memgraph client: accepts every statement, returns no rows.
+    """
+    _host = "in-process"
+    _port = 0
+    _username = ""
+    _password = ""
+    _encrypted = False
+    _client_name = "benchmark"
+    _cached_connection = None
+
+    def execute(self, query, parameters=None):
+        pass
+
+    def execute_and_fetch(self, query, parameters=None):
+        return iter(())
+
+class InProcessPool(ConnectionPool):
+    def __init__(self, size):
+        super().__init__(InProcessMemgraph._host, InProcessMemgraph._port, size)
+
+    def _connect(self):
+        return InProcessMemgraph()
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def benchmark_import(pool, folder, workers, batch_size):
+    load_to_mem.GRAPHRAG_FOLDER = folder
+    load_to_mem.QUARANTINE_FOLDER = os.path.join(folder, "quarantine")
+    all_stats, seconds = timed(load_to_mem.run_import, pool, workers, batch_size)
+    stages = {}
+    for stats in all_stats:
+        elapsed = stats.end_s - stats.start_s
+        stages[stats.table] = {"seconds": elapsed, "rows": stats.rows,
+                               "rows_per_second": stats.rows / elapsed if elapsed else None}
+    return {"total_seconds": seconds, "stages": stages}
+
+def benchmark_indexes(folder):
+    text_index_path = os.path.join(folder, "text_index.sqlite")
+    vector_index_path = os.path.join(folder, "vector_index")
+    _, text_seconds = timed(load_to_mem.refresh_text_index, path=text_index_path)
+    _, vector_seconds = timed(build_index_from_parquet, os.path.join(folder, "create_final_entities.parquet"),
+                              vector_index_path)
+    # Point the searches at the freshly built indexes
+    text_index.TEXT_INDEX_PATH = text_index_path
+    semantic_search.VECTOR_INDEX_PATH = vector_index_path
+    return {"text_index_seconds": text_seconds, "vector_index_seconds": vector_seconds}
+
+def benchmark_searches(memgraph, queries, limit):
+    searches = {name: search.uncached for name, search in STRATEGIES.items()}
+    searches["hybrid"] = lambda query, memgraph, limit: hybrid_search.uncached(query, memgraph, limit, parallel=False)
+    results = {}
+    for name, search in searches.items():
+        latencies = []
+        error = None
+        for query in queries:
+            start = time.perf_counter()
+            try:
+                search(query, memgraph, limit)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                break
+            latencies.append(time.perf_counter() - start)
+        if error:
+            results[name] = {"error": error}
+            print(f"{name:>20}: failed ({error})")
+            continue
+        latencies = np.asarray(latencies) * 1000
+        results[name] = {"p50_ms": float(np.percentile(latencies, 50)), "p95_ms": float(np.percentile(latencies, 95)),
+                         "mean_ms": float(latencies.mean()), "qps": float(1000 / latencies.mean())}
+        print(f"{name:>20}: p50 {results[name]['p50_ms']:8.2f} ms  p95 {results[name]['p95_ms']:8.2f} ms")
+    return results
+
+def _timings(result, prefix=""):
+    """
+    Flatten every latency-like metric (seconds, *_ms) into {path: value}.
+    """
+    flat = {}
+    for key, value in result.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_timings(value, f"{path}."))
+        elif isinstance(value, (int, float)) and (key.endswith("seconds") or key.endswith("_ms")):
+            flat[path] = value
+    return flat
+
+def compare(result, baseline_path, threshold=REGRESSION_THRESHOLD):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"Compared with {baseline_path} (commit {baseline.get('commit')}):")
+    current, previous = _timings(result), _timings(baseline)
+    regressions = 0
+    for path in sorted(current.keys() & previous.keys()):
+        if not previous[path]:
+            continue
+        ratio = current[path] / previous[path]
+        change_ms = (current[path] - previous[path]) * (1 if path.endswith("_ms") else 1000)
+        flag = "REGRESSION" if ratio > 1 + threshold and change_ms > NOISE_FLOOR_MS else ""
+        regressions += bool(flag)
+        print(f"  {path:<55} {previous[path]:10.4f} -> {current[path]:10.4f}  ({ratio:5.2f}x) {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["stub", "memgraph"], default="stub")
+    parser.add_argument("--host", default=load_to_mem.MEMGRAPH_HOST)
+    parser.add_argument("--port", type=int, default=load_to_mem.MEMGRAPH_PORT)
+    parser.add_argument("--reset", action="store_true", help="delete everything in the target Memgraph first")
+    parser.add_argument("--data", help="generate the dataset here instead of a temporary folder")
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--entities", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--workers", type=int, default=load_to_mem.IMPORT_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=load_to_mem.BATCH_SIZE)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--skip-analytics", action="store_true")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>-<target>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.data or tmp
+        dataset = {"documents": args.documents, "entities": args.entities, "dim": args.dim}
+        _, generate_seconds = timed(generate, folder, args.documents, entities=args.entities, dim=args.dim)
+        print(f"Generated dataset in {generate_seconds:.2f} s.")
+
+        if args.target == "stub":
+            pool = InProcessPool(size=max(args.workers, 1) + 1)
+        else:
+            pool = ConnectionPool(args.host, args.port, size=max(args.workers, 1) + 1)
+        with pool:
+            if args.reset:
+                with pool.connection() as memgraph:
+                    memgraph.execute("MATCH (n) DETACH DELETE n")
+            result = {
+                "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "target": args.target,
+                "dataset": dataset,
+                "settings": {"workers": args.workers, "batch_size": args.batch_size,
+                             "queries": args.queries, "limit": args.limit},
+                "import": benchmark_import(pool, folder, args.workers, args.batch_size),
+                "indexes": benchmark_indexes(folder),
+            }
+            with pool.connection() as memgraph:
+                if args.target == "memgraph":
+                    bump_graph_version(memgraph)
+                    if not args.skip_analytics:
+                        _, result["indexes"]["analytics_seconds"] = timed(refresh_analytics, memgraph, True)
+                rng = np.random.default_rng(0)
+                queries = [f"Entity {i} term{i} impact" for i in rng.integers(0, args.entities, args.queries)]
+                result["search"] = benchmark_searches(memgraph, queries, args.limit)
+
+    output = args.output or os.path.join(
+        RESULTS_FOLDER, f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{args.target}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare and compare(result, args.compare):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
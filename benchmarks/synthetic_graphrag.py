@@ -0,0 +1,153 @@
+"""
+Write a synthetic GraphRAG output folder with the create_final_*.parquet
+tables load_to_mem.py and csv_import.py read, at a configurable scale.
+
+Text is drawn from a fixed vocabulary and every chunk mentions some entity
+names, so keyword, entity and community search have something to find.
+The same arguments and seed always produce the same files.
+
+    python benchmarks/synthetic_graphrag.py synthetic --documents 100 --entities 5000
+"""
+import argparse
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ENTITY_TYPES = ["ORGANIZATION", "PERSON", "GEO", "EVENT"]
+ROW_GROUP_SIZE = 10_000
+
+def _vocabulary(size=5000):
+    return np.array([f"term{i}" for i in range(size)])
+
+def _sentences(rng, vocabulary, count, words):
+    picks = rng.integers(0, len(vocabulary), (count, words))
+    return [" ".join(vocabulary[row]) for row in picks]
+
+def _write(path, table):
+    pq.write_table(table, path, row_group_size=ROW_GROUP_SIZE)
+    return table.num_rows
+
+def generate(folder, documents=100, chunks_per_document=10, entities=2000, relationships_per_entity=3,
+             communities=None, findings_per_report=3, dim=1536, seed=0):
+    """
+    Write the six create_final_*.parquet files to folder; returns row counts per file.
+    """
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    vocabulary = _vocabulary()
+    communities = communities or max(1, entities // 20)
+    counts = {}
+
+    document_ids = [f"doc-{i}" for i in range(documents)]
+    chunk_count = documents * chunks_per_document
+    chunk_ids = [f"chunk-{i}" for i in range(chunk_count)]
+    chunk_documents = np.repeat(np.arange(documents), chunks_per_document)
+
+    entity_ids = [f"entity-{i}" for i in range(entities)]
+    entity_names = [f"ENTITY {i} {vocabulary[i % len(vocabulary)].upper()}" for i in range(entities)]
+    # Each entity is mentioned in one to three chunks
+    mentions = [rng.choice(chunk_count, rng.integers(1, 4), replace=False) for _ in range(entities)]
+    chunk_entities = [[] for _ in range(chunk_count)]
+    for entity, chunks in enumerate(mentions):
+        for chunk in chunks:
+            chunk_entities[chunk].append(entity)
+
+    relationship_count = entities * relationships_per_entity
+    sources = rng.integers(0, entities, relationship_count)
+    targets = (sources + rng.integers(1, max(2, entities), relationship_count)) % entities
+    relationship_ids = [f"rel-{i}" for i in range(relationship_count)]
+
+    counts["create_final_documents.parquet"] = _write(os.path.join(folder, "create_final_documents.parquet"), pa.table({
+        "id": document_ids,
+        "title": [f"document {i}.txt" for i in range(documents)],
+        "raw_content": _sentences(rng, vocabulary, documents, 50),
+        "text_unit_ids": [chunk_ids[i * chunks_per_document:(i + 1) * chunks_per_document] for i in range(documents)],
+    }))
+
+    texts = _sentences(rng, vocabulary, chunk_count, 120)
+    texts = [" ".join([text, *(entity_names[e].title() for e in chunk_entities[i])]) for i, text in enumerate(texts)]
+    counts["create_final_text_units.parquet"] = _write(os.path.join(folder, "create_final_text_units.parquet"), pa.table({
+        "id": chunk_ids,
+        "text": texts,
+        "n_tokens": pa.array(rng.integers(200, 300, chunk_count), pa.int64()),
+        "document_ids": [[document_ids[d]] for d in chunk_documents],
+        "entity_ids": [[entity_ids[e] for e in chunk_entities[i]] for i in range(chunk_count)],
+    }))
+
+    embeddings = rng.standard_normal((entities, dim), dtype=np.float32)
+    counts["create_final_entities.parquet"] = _write(os.path.join(folder, "create_final_entities.parquet"), pa.table({
+        "id": entity_ids,
+        "name": [f'"{name}"' for name in entity_names],
+        "type": [f'"{ENTITY_TYPES[i % len(ENTITY_TYPES)]}"' for i in range(entities)],
+        "description": _sentences(rng, vocabulary, entities, 30),
+        "human_readable_id": pa.array(np.arange(entities), pa.int64()),
+        "graph_embedding": pa.nulls(entities, pa.list_(pa.float64())),
+        "text_unit_ids": [[chunk_ids[c] for c in chunks] for chunks in mentions],
+        "description_embedding": pa.ListArray.from_arrays(
+            pa.array(np.arange(0, (entities + 1) * dim, dim), pa.int32()), pa.array(embeddings.ravel(), pa.float64())),
+    }))
+
+    counts["create_final_relationships.parquet"] = _write(os.path.join(folder, "create_final_relationships.parquet"), pa.table({
+        "source": [f'"{entity_names[s]}"' for s in sources],
+        "target": [f'"{entity_names[t]}"' for t in targets],
+        "weight": rng.random(relationship_count) * 10,
+        "description": _sentences(rng, vocabulary, relationship_count, 15),
+        "text_unit_ids": [[chunk_ids[mentions[s][0]]] for s in sources],
+        "id": relationship_ids,
+        "human_readable_id": [str(i) for i in range(relationship_count)],
+        "source_degree": pa.array(np.bincount(sources, minlength=entities)[sources], pa.int64()),
+        "target_degree": pa.array(np.bincount(targets, minlength=entities)[targets], pa.int64()),
+        "rank": pa.array(rng.integers(1, 50, relationship_count), pa.int64()),
+    }))
+
+    community_of = rng.integers(0, communities, relationship_count)
+    community_relationships = [np.flatnonzero(community_of == c) for c in range(communities)]
+    counts["create_final_communities.parquet"] = _write(os.path.join(folder, "create_final_communities.parquet"), pa.table({
+        "id": [str(c) for c in range(communities)],
+        "title": [f"Community {c}" for c in range(communities)],
+        "level": pa.array(np.zeros(communities, dtype=np.int64)),
+        "raw_community": [str(c) for c in range(communities)],
+        "relationship_ids": [[relationship_ids[r] for r in rels] for rels in community_relationships],
+        "text_unit_ids": [sorted({chunk_ids[mentions[sources[r]][0]] for r in rels}) for rels in community_relationships],
+    }))
+
+    findings = [[{"summary": summary, "explanation": explanation}
+                 for summary, explanation in zip(_sentences(rng, vocabulary, findings_per_report, 8),
+                                                 _sentences(rng, vocabulary, findings_per_report, 40))]
+                for _ in range(communities)]
+    summaries = _sentences(rng, vocabulary, communities, 60)
+    counts["create_final_community_reports.parquet"] = _write(os.path.join(folder, "create_final_community_reports.parquet"), pa.table({
+        "community": [str(c) for c in range(communities)],
+        "full_content": [f"# Community {c}\n\n{summary}" for c, summary in enumerate(summaries)],
+        "level": pa.array(np.zeros(communities, dtype=np.int64)),
+        "rank": rng.random(communities) * 10,
+        "title": [f"Community {c} report" for c in range(communities)],
+        "rank_explanation": _sentences(rng, vocabulary, communities, 20),
+        "summary": summaries,
+        "findings": pa.array(findings, pa.list_(pa.struct([("summary", pa.string()), ("explanation", pa.string())]))),
+        "full_content_json": ["{}"] * communities,
+        "id": [f"report-{c}" for c in range(communities)],
+    }))
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder")
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--chunks-per-document", type=int, default=10)
+    parser.add_argument("--entities", type=int, default=2000)
+    parser.add_argument("--relationships-per-entity", type=int, default=3)
+    parser.add_argument("--communities", type=int, default=None)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = generate(args.folder, args.documents, args.chunks_per_document, args.entities,
+                      args.relationships_per_entity, args.communities, dim=args.dim, seed=args.seed)
+    for filename, rows in counts.items():
+        print(f"{filename}: {rows} rows")
+
+if __name__ == "__main__":
+    main()
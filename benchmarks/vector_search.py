@@ -0,0 +1,78 @@
+"""
+Recall@k and latency of the IVF vector index against the exact scan.
+
+The exact scan scores every entity, as semantic_search does with
+mg.vector.similarity.cosine when no index is built. Embeddings are
+synthetic clustered vectors; queries are perturbed copies of entities.
+
+    python benchmarks/vector_search.py --entities 100000 --dim 384 --nprobe 4 8 16 32
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "searches"))
+from vector_index import IVFIndex, build_index
+
+def clustered_vectors(n, dim, clusters, rng):
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    return centers[labels] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+
+def exact_search(vectors, query, k):
+    scores = vectors @ (query / np.linalg.norm(query))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+def percentiles(latencies):
+    latencies = np.asarray(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = clustered_vectors(args.entities, args.dim, args.clusters, rng)
+    ids = [f"entity-{i}" for i in range(args.entities)]
+    queries = vectors[rng.choice(args.entities, args.queries)] + 0.3 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    latencies = []
+    truth = []
+    for query in queries:
+        start = time.perf_counter()
+        truth.append({ids[i] for i in exact_search(normalized, query, args.k)})
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = percentiles(latencies)
+    print(f"{'exact':>10}: recall@{args.k} 1.000  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        meta = build_index(ids, vectors, path)
+        print(f"built {meta['n_lists']} lists in {time.perf_counter() - start:.1f} s")
+        index = IVFIndex(path)
+        for nprobe in args.nprobe:
+            latencies = []
+            recall = 0.0
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                hits = index.search(query, args.k, nprobe)
+                latencies.append(time.perf_counter() - start)
+                recall += len(expected & {entity_id for entity_id, _ in hits}) / args.k
+            p50, p99 = percentiles(latencies)
+            print(f"{f'nprobe={nprobe}':>10}: recall@{args.k} {recall / len(queries):.3f}  "
+                  f"p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
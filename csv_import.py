@@ -0,0 +1,326 @@
+import os
+import time
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
+
+LIST_SEPARATOR = ";"
+
+# Indexes edge statements look their endpoints up by. The bulk backend
+# creates them after the node files are loaded, so bulk node creation
+# doesn't maintain them; the merge backend creates them up front.
+lookup_indexes = [
+    "CREATE INDEX ON :__Document__(id);",
+    "CREATE INDEX ON :__Chunk__(id);",
+    "CREATE INDEX ON :__Entity__;",
+    "CREATE INDEX ON :__Entity__(id);",
+    "CREATE INDEX ON :__Entity__(name);",
+    "CREATE INDEX ON :__Community__(community);",
+    "CREATE INDEX ON :Finding(id);",
+    "CREATE EDGE INDEX ON :RELATED(id);",
+]
+
+def _list_to_string(column):
+    """
+    Join a list column into a LIST_SEPARATOR-delimited string column.
+    """
+    if not pa.types.is_string(column.type.value_type):
+        column = pc.cast(column, pa.list_(pa.string()))
+    return pc.binary_join(column, LIST_SEPARATOR)
+
+def _clean_name(column):
+    return pc.replace_substring(column, '"', '')
+
+def _cypher_value(name, arrow_type):
+    """
+    Cypher expression turning the CSV string in row.<name> back into its parquet type.
+    """
+    field = f"row.{name}"
+    if pa.types.is_integer(arrow_type):
+        return f"toInteger({field})"
+    if pa.types.is_floating(arrow_type):
+        return f"toFloat({field})"
+    if pa.types.is_boolean(arrow_type):
+        return f"toBoolean({field})"
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type) or pa.types.is_fixed_size_list(arrow_type):
+        items = f"split(coalesce({field}, ''), '{LIST_SEPARATOR}')"
+        if pa.types.is_floating(arrow_type.value_type):
+            return f"[x IN {items} WHERE x <> '' | toFloat(x)]"
+        if pa.types.is_integer(arrow_type.value_type):
+            return f"[x IN {items} WHERE x <> '' | toInteger(x)]"
+        return f"[x IN {items} WHERE x <> '']"
+    return field
+
+class CsvWriter:
+    """
+    Streams record batches of one node or edge file to CSV and remembers the
+    Cypher type conversion of every column for the LOAD CSV statement.
+    """
+
+    def __init__(self, folder, filename):
+        self.path = os.path.join(folder, filename)
+        self.writer = None
+        self.values = {}
+        self.rows = 0
+
+    def write(self, columns):
+        flat = {}
+        for name, column in columns.items():
+            self.values.setdefault(name, _cypher_value(name, column.type))
+            if pa.types.is_list(column.type) or pa.types.is_large_list(column.type) \
+                    or pa.types.is_fixed_size_list(column.type):
+                column = _list_to_string(column)
+            flat[name] = column
+        table = pa.table(flat)
+        if self.writer is None:
+            self.writer = pcsv.CSVWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def _batches(folder, filename, columns, batch_size):
+    parquet_file = pq.ParquetFile(os.path.join(folder, filename))
+    yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+
+def _exploded(record_batch, list_column, id_column):
+    """
+    One (id, list item) pair per element of a list column.
+    """
+    lists = record_batch.column(list_column)
+    parents = pc.list_parent_indices(lists)
+    return pc.take(record_batch.column(id_column), parents), pc.list_flatten(lists)
+
+def export_csv(graphrag_folder, csv_folder, batch_size=100_000, embeddings=True):
+    """
+    Convert the create_final_*.parquet tables into node and edge CSV files,
+    leaving out description_embedding unless embeddings is set.
+    Returns the writers of all files, keyed by file stem.
+    Community membership is resolved here from the relationship table, so
+    the database never scans RELATED edges by id.
+    """
+    os.makedirs(csv_folder, exist_ok=True)
+    files = {}
+
+    def writer(stem):
+        if stem not in files:
+            files[stem] = CsvWriter(csv_folder, f"{stem}.csv")
+        return files[stem]
+
+    for batch in _batches(graphrag_folder, "create_final_documents.parquet", ["id", "title"], batch_size):
+        writer("documents").write({"id": batch.column("id"), "title": batch.column("title")})
+
+    for batch in _batches(graphrag_folder, "create_final_text_units.parquet",
+                          ["id", "text", "n_tokens", "document_ids"], batch_size):
+        writer("chunks").write({name: batch.column(name) for name in ("id", "text", "n_tokens")})
+        chunk_ids, document_ids = _exploded(batch, "document_ids", "id")
+        writer("chunk_documents").write({"chunk_id": chunk_ids, "document_id": document_ids})
+
+    entity_columns = ["name", "type", "description", "human_readable_id", "id", "text_unit_ids"]
+    if embeddings:
+        entity_columns.append("description_embedding")
+    for batch in _batches(graphrag_folder, "create_final_entities.parquet", entity_columns, batch_size):
+        entities = {
+            "id": batch.column("id"),
+            "human_readable_id": batch.column("human_readable_id"),
+            "description": batch.column("description"),
+            "name": _clean_name(batch.column("name")),
+            "type": batch.column("type"),
+        }
+        if embeddings:
+            entities["description_embedding"] = batch.column("description_embedding")
+        writer("entities").write(entities)
+        entity_ids, chunk_ids = _exploded(batch, "text_unit_ids", "id")
+        writer("entity_chunks").write({"chunk_id": chunk_ids, "entity_id": entity_ids})
+
+    endpoints = []
+    for batch in _batches(graphrag_folder, "create_final_relationships.parquet",
+                          ["source", "target", "id", "rank", "weight",
+                           "human_readable_id", "description", "text_unit_ids"], batch_size):
+        source, target = _clean_name(batch.column("source")), _clean_name(batch.column("target"))
+        writer("relationships").write({
+            "source": source,
+            "target": target,
+            "id": batch.column("id"),
+            "rank": batch.column("rank"),
+            "weight": batch.column("weight"),
+            "human_readable_id": batch.column("human_readable_id"),
+            "description": batch.column("description"),
+            "text_unit_ids": batch.column("text_unit_ids"),
+        })
+        endpoints.append(pa.table({"rel_id": batch.column("id"), "source": source, "target": target}))
+    endpoints = pa.concat_tables(endpoints) if endpoints else None
+
+    for batch in _batches(graphrag_folder, "create_final_communities.parquet",
+                          ["id", "level", "title", "relationship_ids"], batch_size):
+        writer("communities").write({name: batch.column(name) for name in ("id", "level", "title")})
+        if endpoints is None:
+            continue
+        community_ids, rel_ids = _exploded(batch, "relationship_ids", "id")
+        joined = pa.table({"community": community_ids, "rel_id": rel_ids}).join(endpoints, "rel_id")
+        members = pa.concat_tables([
+            joined.select(["community", "source"]).rename_columns(["community", "name"]),
+            joined.select(["community", "target"]).rename_columns(["community", "name"]),
+        ]).group_by(["community", "name"]).aggregate([])
+        writer("community_members").write({"community": members.column("community"),
+                                           "name": members.column("name")})
+
+    for batch in _batches(graphrag_folder, "create_final_community_reports.parquet",
+                          ["community", "level", "title", "summary", "findings",
+                           "rank", "rank_explanation", "full_content"], batch_size):
+        writer("community_reports").write({
+            name: batch.column(name)
+            for name in ("community", "level", "title", "rank", "rank_explanation", "full_content", "summary")
+        })
+        findings = batch.column("findings")
+        communities = pc.take(batch.column("community"), pc.list_parent_indices(findings))
+        finding_structs = pc.list_flatten(findings)
+        offsets = findings.offsets.to_numpy()
+        finding_idx = pa.array(
+            [i for start, end in zip(offsets, offsets[1:]) for i in range(end - start)], pa.int64())
+        # The same "<community>:<index>" ids the merge backend's prepare_findings gives
+        finding_ids = pc.binary_join_element_wise(
+            pc.cast(communities, pa.string()), pc.cast(finding_idx, pa.string()), ":")
+        columns = {"id": finding_ids, "community": communities, "finding_idx": finding_idx}
+        for field in finding_structs.type:
+            columns[field.name] = pc.struct_field(finding_structs, field.name)
+        writer("findings").write(columns)
+
+    for file in files.values():
+        file.close()
+    return files
+
+def _load(path, body):
+    return f'LOAD CSV FROM "{path}" WITH HEADER NULLIF "" AS row\n{body}'
+
+def load_statements(files, server_folder):
+    """
+    LOAD CSV statements in execution order as (phase, file stem, query).
+    Phase "nodes" runs before indexes exist, phase "edges" after.
+    """
+    def path(stem):
+        return f"{server_folder}/{stem}.csv"
+
+    def values(stem, alias, exclude=()):
+        return ",\n    ".join(
+            f"{alias}.{name} = {value}" for name, value in files[stem].values.items() if name not in exclude)
+
+    statements = []
+    if "documents" in files:
+        statements.append(("nodes", "documents", _load(path("documents"), f"""
+CREATE (d:__Document__)
+SET {values("documents", "d")}
+""")))
+    if "chunks" in files:
+        statements.append(("nodes", "chunks", _load(path("chunks"), f"""
+CREATE (c:__Chunk__)
+SET {values("chunks", "c")}
+""")))
+    if "entities" in files:
+        # The type label is the same backtick-quoted literal entity_statement sets,
+        # so both backends build the same graph
+        statements.append(("nodes", "entities", _load(path("entities"), f"""
+CREATE (e:__Entity__)
+SET {values("entities", "e", exclude=("type",))}
+FOREACH (ignore IN CASE WHEN row.type IS NOT NULL AND row.type <> '' THEN [1] ELSE [] END |
+    SET e:__Entity__:`replace(value.type, '"', '')`)
+""")))
+    if "communities" in files:
+        statements.append(("nodes", "communities", _load(path("communities"), f"""
+CREATE (c:__Community__)
+SET c.community = {files["communities"].values["id"]},
+    {values("communities", "c", exclude=("id",))}
+""")))
+    if "community_reports" in files:
+        # Reports MERGE onto community nodes, so they wait for the community index
+        statements.append(("edges", "community_reports", _load(path("community_reports"), f"""
+MERGE (c:__Community__ {{community: {files["community_reports"].values["community"]}}})
+SET {values("community_reports", "c", exclude=("community",))}
+""")))
+    if "chunk_documents" in files:
+        statements.append(("edges", "chunk_documents", _load(path("chunk_documents"), """
+MATCH (c:__Chunk__ {id: row.chunk_id})
+MATCH (d:__Document__ {id: row.document_id})
+CREATE (c)-[:PART_OF]->(d)
+""")))
+    if "entity_chunks" in files:
+        statements.append(("edges", "entity_chunks", _load(path("entity_chunks"), """
+MATCH (c:__Chunk__ {id: row.chunk_id})
+MATCH (e:__Entity__ {id: row.entity_id})
+CREATE (c)-[:HAS_ENTITY]->(e)
+""")))
+    if "relationships" in files:
+        statements.append(("edges", "relationships", _load(path("relationships"), f"""
+MATCH (source:__Entity__ {{name: row.source}})
+MATCH (target:__Entity__ {{name: row.target}})
+CREATE (source)-[rel:RELATED]->(target)
+SET {values("relationships", "rel", exclude=("source", "target"))}
+""")))
+    if "community_members" in files:
+        statements.append(("edges", "community_members", _load(path("community_members"), f"""
+MATCH (c:__Community__ {{community: {files["community_members"].values["community"]}}})
+MATCH (e:__Entity__ {{name: row.name}})
+CREATE (e)-[:IN_COMMUNITY]->(c)
+""")))
+    if "findings" in files:
+        # Every finding has its own id, so they are plain CREATEs in the node
+        # phase and get linked to their community once the indexes exist
+        statements.append(("nodes", "findings", _load(path("findings"), f"""
+CREATE (f:Finding)
+SET {values("findings", "f", exclude=("community",))}
+""")))
+        statements.append(("edges", "findings", _load(path("findings"), f"""
+MATCH (c:__Community__ {{community: {files["findings"].values["community"]}}})
+MATCH (f:Finding {{id: row.id}})
+CREATE (c)-[:HAS_FINDING]->(f)
+""")))
+    return statements
+
+def bulk_import(memgraph, constraints, graphrag_folder, csv_folder, server_folder=None, embeddings=True):
+    """
+    Cold-load an empty database from CSV files with LOAD CSV.
+    embeddings=False leaves description_embedding off the entity nodes.
+    Runs in IN_MEMORY_ANALYTICAL storage mode: node files first, then the
+    lookup indexes, then edge files, and finally the unique constraints once
+    the database is back in transactional mode.
+    """
+    existing = next(memgraph.execute_and_fetch("MATCH (n) RETURN count(n) AS nodes"))["nodes"]
+    if existing:
+        raise RuntimeError(f"CSV backend needs an empty database, found {existing} nodes; use the merge backend")
+
+    start_s = time.time()
+    files = export_csv(graphrag_folder, csv_folder, embeddings=embeddings)
+    print(f"Exported {sum(f.rows for f in files.values())} CSV rows in {time.time() - start_s:.2f} s.")
+
+    server_folder = server_folder or os.path.abspath(csv_folder)
+    statements = load_statements(files, server_folder)
+
+    memgraph.execute("STORAGE MODE IN_MEMORY_ANALYTICAL;")
+    try:
+        for phase in ("nodes", "edges"):
+            if phase == "edges":
+                for index in lookup_indexes:
+                    try:
+                        memgraph.execute(index)
+                        print(f"Created index: {index}")
+                    except Exception as e:
+                        print(f"Index might already exist or failed: {e}")
+            for _, stem, query in (s for s in statements if s[0] == phase):
+                stage_start = time.time()
+                memgraph.execute(query)
+                print(f"Loaded {files[stem].rows} rows from {stem}.csv in {time.time() - stage_start:.2f} s.")
+    finally:
+        memgraph.execute("STORAGE MODE IN_MEMORY_TRANSACTIONAL;")
+
+    for constraint in constraints:
+        try:
+            memgraph.execute(constraint)
+            print(f"Created constraint: {constraint}")
+        except Exception as e:
+            print(f"Constraint might already exist or failed: {e}")
+
+    print(f"Bulk import finished in {time.time() - start_s:.2f} s.")
+    return files
@@ -0,0 +1,90 @@
+import json
+import sqlite3
+
+class ImportManifest:
+    """
+    Local record of which GraphRAG rows are loaded into Memgraph.
+    Stores one content fingerprint per (table, id), with ids JSON-encoded so
+    integer and string keys round-trip unchanged. A delta run stages the
+    fingerprints of the incoming parquet file, diffs them against what was
+    loaded last time and commits the new state once the table is imported.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+        CREATE TABLE IF NOT EXISTS loaded (
+            tbl TEXT NOT NULL,
+            id TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            PRIMARY KEY (tbl, id)
+        ) WITHOUT ROWID;
+        CREATE TEMP TABLE incoming (
+            tbl TEXT NOT NULL,
+            id TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            PRIMARY KEY (tbl, id)
+        ) WITHOUT ROWID;
+        """)
+
+    def begin(self, table):
+        self.connection.execute("DELETE FROM incoming WHERE tbl = ?", (table,))
+
+    def stage(self, table, fingerprints):
+        """
+        Add (id, fingerprint) pairs of the incoming file.
+        """
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO incoming (tbl, id, fingerprint) VALUES (?, ?, ?)",
+            ((table, json.dumps(row_id), fingerprint) for row_id, fingerprint in fingerprints),
+        )
+
+    def changed_ids(self, table):
+        """
+        Ids that are new or whose content changed since the last load.
+        """
+        rows = self.connection.execute("""
+        SELECT i.id FROM incoming i
+        LEFT JOIN loaded l ON l.tbl = i.tbl AND l.id = i.id
+        WHERE i.tbl = ? AND (l.fingerprint IS NULL OR l.fingerprint <> i.fingerprint)
+        """, (table,))
+        return {json.loads(row_id) for row_id, in rows}
+
+    def deleted_ids(self, table):
+        """
+        Ids loaded last time that are missing from the incoming file.
+        """
+        rows = self.connection.execute("""
+        SELECT l.id FROM loaded l
+        WHERE l.tbl = ? AND NOT EXISTS (
+            SELECT 1 FROM incoming i WHERE i.tbl = l.tbl AND i.id = l.id
+        )
+        """, (table,))
+        return [json.loads(row_id) for row_id, in rows]
+
+    def commit(self, table, failed_ids=()):
+        """
+        Make the staged fingerprints the loaded state of a table.
+        Rows that failed to import keep their previous fingerprint (or stay
+        absent), so the next delta run retries them.
+        """
+        with self.connection:
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS failed (id TEXT PRIMARY KEY)")
+            self.connection.execute("DELETE FROM failed")
+            self.connection.executemany("INSERT OR IGNORE INTO failed (id) VALUES (?)",
+                                        ((json.dumps(row_id),) for row_id in failed_ids))
+            self.connection.execute("""
+            DELETE FROM loaded WHERE tbl = ? AND NOT EXISTS (
+                SELECT 1 FROM incoming i WHERE i.tbl = loaded.tbl AND i.id = loaded.id
+            )
+            """, (table,))
+            self.connection.execute("""
+            INSERT OR REPLACE INTO loaded (tbl, id, fingerprint)
+            SELECT tbl, id, fingerprint FROM incoming
+            WHERE tbl = ? AND id NOT IN (SELECT id FROM failed)
+            """, (table,))
+            self.connection.execute("DELETE FROM incoming WHERE tbl = ?", (table,))
+
+    def close(self):
+        self.connection.close()
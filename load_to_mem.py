@@ -1,19 +1,66 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
 import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import pandas as pd
-from gqlalchemy import Memgraph
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from gqlalchemy.exceptions import GQLAlchemyDatabaseError
 import backoff
+from csv_import import bulk_import, lookup_indexes
+from import_manifest import ImportManifest
+
+# The search modules import each other by bare name, so put their folder on the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "searches"))
+from connection_pool import ConnectionPool
+from embedding_store import DESCRIPTION_STORE_PATH, NODE2VEC_STORE_PATH, STORE_DTYPES, build_store_from_parquet, remove_store
+from graph_analytics import refresh_analytics
+from graph_version import bump_graph_version
+from telemetry import count, span, serve_metrics, timed, write_json
+from text_index import TextIndex
+from vector_index import build_index_from_parquet
 
 # Configuration
 GRAPHRAG_FOLDER = "par2"
 MEMGRAPH_HOST = "localhost"
 MEMGRAPH_PORT = 7687
+IMPORT_WORKERS = 4
+BATCH_SIZE = 100
+MIN_BATCH_SIZE = 10
+MAX_BATCH_SIZE = 5000
+QUEUE_DEPTH = 4
+# Bytes read from a parquet file at a time; see open_parquet
+READ_BUFFER_SIZE = 1 << 20
+QUARANTINE_FOLDER = "quarantine"
+MANIFEST_PATH = "import_manifest.sqlite"
+CSV_FOLDER = "csv"
+# Read by the searches, which resolve the same repository-relative paths
+TEXT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "text_index.sqlite")
+VECTOR_INDEX_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vector_index")
+# Where Memgraph sees CSV_FOLDER, e.g. a mounted docker volume; None means the same absolute path
+CSV_SERVER_FOLDER = None
+TRANSIENT_ERROR_MARKERS = ("conflicting transactions", "timeout", "timed out", "serialization error")
+# Extra rounds of retries for a single row that keeps hitting transient errors
+ROW_RETRY_ROUNDS = 3
 
-# Create Memgraph connection
-memgraph = Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT)
+def is_transient_error(error):
+    """
+    Conflicts and timeouts succeed on retry; anything else is a problem with the data.
+    """
+    message = str(error).lower()
+    return any(marker in message for marker in TRANSIENT_ERROR_MARKERS)
 
-@backoff.on_exception(backoff.expo, GQLAlchemyDatabaseError, max_tries=5)
+@backoff.on_exception(backoff.expo, GQLAlchemyDatabaseError, max_tries=5,
+                      giveup=lambda e: not is_transient_error(e))
 def execute_with_retry(memgraph, query, parameters):
     return memgraph.execute(query, parameters)
 
@@ -33,99 +80,379 @@ def convert_numpy_types(obj):
         return [convert_numpy_types(item) for item in obj]
     return obj
 
-def batched_import(statement, df, batch_size=100):
+def _column_to_pylist(column):
     """
-    Import a dataframe into Memgraph using a batched approach.
-    Handles numpy array conversion and implements retry mechanism.
+    Convert one Arrow column to Python values in a single columnar pass.
+    Scalar columns go through NumPy, whose tolist() builds Python objects in C.
+    Uniform-length float list columns (embeddings) are reshaped into a matrix
+    and converted at once; other list columns (e.g. text_unit_ids) convert
+    their flat child array once and are sliced by offsets.
+    Nested or nullable lists fall back to Arrow's per-element converter.
     """
-    total = len(df)
-    start_s = time.time()
-    for start in range(0, total, batch_size):
-        batch = df.iloc[start : min(start + batch_size, total)]
-        # Convert the batch to records and handle numpy types
-        records = [convert_numpy_types(record) for record in batch.to_dict('records')]
-        try:
+    column_type = column.type
+    if pa.types.is_integer(column_type) or pa.types.is_floating(column_type):
+        if column.null_count == 0:
+            return column.to_numpy().tolist()
+    elif pa.types.is_string(column_type) or pa.types.is_large_string(column_type):
+        return column.to_numpy(zero_copy_only=False).tolist()
+    elif pa.types.is_fixed_size_list(column_type) and column.null_count == 0:
+        values = column.flatten()
+        if pa.types.is_floating(values.type) and values.null_count == 0:
+            return values.to_numpy().reshape(-1, column_type.list_size).tolist()
+    elif (pa.types.is_list(column_type) or pa.types.is_large_list(column_type)) and column.null_count == 0:
+        value_type = column_type.value_type
+        if not pa.types.is_nested(value_type) and len(column):
+            offsets = column.offsets.to_numpy()
+            values = column.values.slice(offsets[0], offsets[-1] - offsets[0])
+            lengths = np.diff(offsets)
+            if pa.types.is_floating(value_type) and values.null_count == 0 and lengths[0] > 0 and (lengths == lengths[0]).all():
+                return values.to_numpy().reshape(-1, lengths[0]).tolist()
+            values = _column_to_pylist(values)
+            bounds = (offsets - offsets[0]).tolist()
+            return [values[start:end] for start, end in zip(bounds, bounds[1:])]
+    return column.to_pylist()
+
+def records_from_batch(record_batch):
+    """
+    Convert an Arrow record batch into a list of Bolt parameter records.
+    Columns are converted as a whole and then zipped into rows, replacing the
+    per-value isinstance walk of convert_numpy_types.
+    """
+    columns = [_column_to_pylist(column) for column in record_batch.columns]
+    return [dict(zip(record_batch.schema.names, row)) for row in zip(*columns)]
+
+def records_from_dataframe(df):
+    """
+    Convert a pandas dataframe into Bolt parameter records via Arrow.
+    """
+    return records_from_batch(pa.RecordBatch.from_pandas(df, preserve_index=False))
+
+def open_parquet(path):
+    """
+    Open a parquet file for streaming. By default Arrow reads each row group
+    whole before decoding its first batch, so peak memory follows the row
+    group size the file was written with (pandas writes up to a million rows
+    per group) rather than the batch size. A buffered stream without
+    pre-buffering reads pages as the batches need them instead.
+    """
+    return pq.ParquetFile(path, buffer_size=READ_BUFFER_SIZE, pre_buffer=False)
+
+def iter_parquet_batches(path, columns, batch_size=BATCH_SIZE):
+    """
+    Stream a parquet file as lists of parameter records.
+    Record batches are decoded a few pages at a time and converted straight
+    to Python values, so neither the whole table nor a whole row group is
+    ever held in memory.
+    """
+    parquet_file = open_parquet(path)
+    filename = os.path.basename(path)
+    record_batches = parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+    while True:
+        with span("import_parquet_read", file=filename):
+            record_batch = next(record_batches, None)
+        if record_batch is None:
+            return
+        count("import_bytes_read_total", record_batch.nbytes, file=filename)
+        with span("import_convert", file=filename):
+            records = records_from_batch(record_batch)
+        yield records
+
+class AdaptiveBatchSize:
+    """
+    Hill-climbing batch size controller for one connection.
+    The size grows while per-row latency keeps improving, steps back when a
+    larger batch turns out slower, and halves on timeouts or conflicts.
+    """
+
+    def __init__(self, initial=BATCH_SIZE, minimum=MIN_BATCH_SIZE, maximum=MAX_BATCH_SIZE, growth=1.5):
+        self.size = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.growth = growth
+        self.best_latency = None
+
+    def observe(self, rows, elapsed):
+        if rows < self.size:
+            # Partial batches (stream tails, bisection halves) say nothing about this size
+            return
+        latency = elapsed / rows
+        if self.best_latency is None or latency < self.best_latency * 0.95:
+            self.best_latency = latency
+            self.size = min(self.maximum, int(self.size * self.growth) + 1)
+        elif latency > self.best_latency * 1.25:
+            self.size = max(self.minimum, int(self.size / self.growth))
+
+    def shrink(self):
+        self.size = max(self.minimum, self.size // 2)
+        self.best_latency = None
+
+class ImportStats:
+    """
+    Thread-safe throughput counters for one imported table.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.rows = 0
+        self.quarantined = 0
+        self.batches = 0
+        self.retries = 0
+        self.server_seconds = 0.0
+        self.start_s = time.time()
+        self.end_s = None
+        self.lock = threading.Lock()
+
+    def add(self, rows=0, quarantined=0, batches=0, retries=0, server_seconds=0.0):
+        with self.lock:
+            self.rows += rows
+            self.quarantined += quarantined
+            self.batches += batches
+            self.retries += retries
+            self.server_seconds += server_seconds
+
+    def finish(self):
+        self.end_s = time.time()
+
+    def report(self):
+        elapsed = (self.end_s or time.time()) - self.start_s
+        rate = self.rows / elapsed if elapsed else 0.0
+        return (f"{self.table}: {self.rows} rows in {elapsed:.2f} s ({rate:.0f} rows/s), "
+                f"{self.batches} batches, {self.retries} retried, {self.quarantined} quarantined")
+
+class Quarantine:
+    """
+    Append-only JSON lines file collecting rows Memgraph rejected.
+    The file is only created once the first bad row shows up. Rows are
+    written straight to it; only their id_column values stay in memory,
+    for the delta import's manifest.
+    """
+
+    def __init__(self, path, id_column="id"):
+        self.path = path
+        self.id_column = id_column
+        self.failed_ids = []
+        self.lock = threading.Lock()
+
+    def add(self, record, error):
+        with self.lock:
+            self.failed_ids.append(record.get(self.id_column))
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps({"error": str(error), "row": record}, default=str) + "\n")
+
+def import_records(statement, records, memgraph, controller=None, stats=None, quarantine=None, retry_round=0):
+    """
+    Send one UNWIND batch. Failed batches are bisected: on timeouts and
+    conflicts the controller shrinks, on data errors the halves are retried
+    until the offending rows are isolated and quarantined. A single row
+    only goes to quarantine for a data error; on transient errors it is
+    retried ROW_RETRY_ROUNDS more times and the error raised after that.
+    Returns the number of rows committed, leaving out quarantined ones.
+    """
+    controller = controller or AdaptiveBatchSize()
+    stats = stats or ImportStats("rows")
+    start_s = time.perf_counter()
+    try:
+        # Covers Bolt serialization and server execution, which the driver doesn't separate
+        with span("import_execute", table=stats.table):
             execute_with_retry(
                 memgraph,
                 "UNWIND $rows AS value " + statement,
                 {'rows': records}
             )
-        except GQLAlchemyDatabaseError as e:
-            print(f"Error importing batch starting at index {start}: {e}")
-            print("Retrying with smaller batch size...")
-            batched_import(statement, batch, batch_size=batch_size//2)
-        
-        if (start + batch_size) % 1000 == 0 or (start + batch_size) >= total:
-            print(f"Imported {min(start + batch_size, total)} / {total} rows in {time.time() - start_s:.2f} s.")
-    
-    print(f"Total: {total} rows imported in {time.time() - start_s:.2f} s.")
-    return total
+    except GQLAlchemyDatabaseError as e:
+        transient = is_transient_error(e)
+        if transient:
+            controller.shrink()
+        if len(records) == 1 and transient:
+            if retry_round >= ROW_RETRY_ROUNDS:
+                # The row itself is fine, so stop rather than quarantine it
+                raise
+            print(f"Retrying row {records[0].get('id')} after transient error: {e}")
+            stats.add(retries=1)
+            count("import_batch_retries_total", table=stats.table, reason="transient")
+            time.sleep(2 ** retry_round)
+            return import_records(statement, records, memgraph, controller, stats, quarantine, retry_round + 1)
+        if len(records) == 1:
+            print(f"Quarantining row {records[0].get('id')}: {e}")
+            if quarantine is not None:
+                quarantine.add(records[0], e)
+            stats.add(quarantined=1)
+            count("import_rows_quarantined_total", table=stats.table)
+            return 0
+        print(f"Error importing batch of {len(records)} rows ({'transient' if transient else 'data'}): {e}")
+        stats.add(retries=1)
+        count("import_batch_retries_total", table=stats.table, reason="transient" if transient else "data")
+        middle = len(records) // 2
+        return (import_records(statement, records[:middle], memgraph, controller, stats, quarantine)
+                + import_records(statement, records[middle:], memgraph, controller, stats, quarantine))
+
+    elapsed = time.perf_counter() - start_s
+    controller.observe(len(records), elapsed)
+    stats.add(rows=len(records), batches=1, server_seconds=elapsed)
+    count("import_rows_total", len(records), table=stats.table)
+    count("import_batches_total", table=stats.table)
+    return len(records)
+
+def batched_import(statement, batches, memgraph, total=None, batch_size=BATCH_SIZE, stats=None, quarantine=None,
+                   report=True):
+    """
+    Import an iterable of record batches into Memgraph.
+    Incoming batches are re-chunked to the adaptive batch size; progress is
+    printed every 1000 rows read unless report is False. Returns the number
+    of rows committed; quarantined rows are not counted.
+    """
+    controller = AdaptiveBatchSize(batch_size)
+    stats = stats or ImportStats("rows")
+    read = 0
+    committed = 0
+    pending = []
+    start_s = time.time()
+
+    def send(chunk):
+        nonlocal read, committed
+        committed += import_records(statement, chunk, memgraph, controller, stats, quarantine)
+        previous, read = read, read + len(chunk)
+        if report and (previous // 1000 != read // 1000 or read == total):
+            print(f"Imported {committed} / {total if total is not None else '?'} rows in {time.time() - start_s:.2f} s "
+                  f"({read - committed} quarantined, batch size {controller.size}).")
+
+    for records in batches:
+        pending.extend(records)
+        offset = 0
+        while len(pending) - offset >= controller.size:
+            size = controller.size
+            send(pending[offset:offset + size])
+            offset += size
+        del pending[:offset]
+    if pending:
+        send(pending)
+
+    if report:
+        print(f"Total: {committed} rows committed in {time.time() - start_s:.2f} s.")
+    return committed
+
+def partition_records(records, key_column, partitions):
+    """
+    Split records into disjoint partitions by hashing the MERGE key.
+    Rows sharing a key always land in the same partition, so concurrent
+    workers never MERGE the same node.
+    """
+    buckets = [[] for _ in range(partitions)]
+    for record in records:
+        buckets[zlib.crc32(str(record[key_column]).encode()) % partitions].append(record)
+    return buckets
+
+def _drain(batch_queue, stop):
+    """
+    Batches from batch_queue until its None sentinel, or until stop is set
+    because the import failed elsewhere.
+    """
+    while not stop.is_set():
+        try:
+            records = batch_queue.get(timeout=1)
+        except queue.Empty:
+            continue
+        if records is None:
+            return
+        yield records
+
+def parallel_import(statement, batches, key_column, pool, total=None, workers=IMPORT_WORKERS,
+                    batch_size=BATCH_SIZE, stats=None, quarantine=None):
+    """
+    Import record batches over connections checked out of pool, which must
+    hold at least `workers` connections.
+    The calling thread keeps reading and partitioning batches while each
+    worker, owning one connection and one key partition, writes its share
+    as UNWIND batches. Bounded queues keep reading at most a few batches
+    ahead of the slowest worker. Without a key_column the rows can't be
+    split without conflicts, so one connection writes them all. Workers
+    don't print; the calling thread reports progress from the shared stats
+    and prints one total for the stage.
+    """
+    if workers <= 1 or key_column is None:
+        with pool.connection() as memgraph:
+            return batched_import(statement, batches, memgraph, total, batch_size=batch_size,
+                                  stats=stats, quarantine=quarantine)
+
+    start_s = time.time()
+    stats = stats or ImportStats("rows")
+    queues = [queue.Queue(maxsize=QUEUE_DEPTH) for _ in range(workers)]
+    stop = threading.Event()
+    with contextlib.ExitStack() as checked_out, ThreadPoolExecutor(max_workers=workers) as executor:
+        connections = [checked_out.enter_context(pool.connection()) for _ in range(workers)]
+        futures = [
+            executor.submit(batched_import, statement, _drain(batch_queue, stop), connection, None,
+                            batch_size, stats, quarantine, False)
+            for batch_queue, connection in zip(queues, connections)
+        ]
+
+        def put(i, item):
+            while True:
+                try:
+                    return queues[i].put(item, timeout=1)
+                except queue.Full:
+                    if futures[i].done():
+                        # Raises the worker's own error if it failed
+                        futures[i].result()
+                        raise RuntimeError("import worker stopped unexpectedly")
+
+        try:
+            read = 0
+            for records in batches:
+                for i, partition in enumerate(partition_records(records, key_column, workers)):
+                    if partition:
+                        put(i, partition)
+                previous, read = read, read + len(records)
+                if previous // 1000 != read // 1000:
+                    print(f"Read {read} / {total if total is not None else '?'} rows, {stats.rows} committed "
+                          f"in {time.time() - start_s:.2f} s.")
+            for i in range(workers):
+                put(i, None)
+        except BaseException:
+            # Reading or a worker failed: release the other workers instead of
+            # leaving them waiting for batches, which would hang the executor
+            stop.set()
+            raise
+        imported = sum(future.result() for future in futures)
+
+    print(f"Total: {imported} / {total} rows committed by {workers} workers in {time.time() - start_s:.2f} s.")
+    return imported
 
 # Create constraints
 constraints = [
     "CREATE CONSTRAINT ON (c:__Chunk__) ASSERT c.id IS UNIQUE;",
     "CREATE CONSTRAINT ON (d:__Document__) ASSERT d.id IS UNIQUE;",
     "CREATE CONSTRAINT ON (c:__Community__) ASSERT c.community IS UNIQUE;",
+    "CREATE CONSTRAINT ON (f:Finding) ASSERT f.id IS UNIQUE;",
     "CREATE CONSTRAINT ON (e:__Entity__) ASSERT e.id IS UNIQUE;",
     "CREATE CONSTRAINT ON (e:__Entity__) ASSERT e.name IS UNIQUE;",
     "CREATE CONSTRAINT ON (e:__Covariate__) ASSERT e.title IS UNIQUE;"
 ]
 
-for constraint in constraints:
-    try:
-        memgraph.execute(constraint)
-        print(f"Created constraint: {constraint}")
-    except Exception as e:
-        print(f"Constraint might already exist or failed: {e}")
-
-# Import documents
-print("Importing documents...")
-doc_df = pd.read_parquet(
-    f"{GRAPHRAG_FOLDER}/create_final_documents.parquet", 
-    columns=["id", "title"]
-)
-
 document_statement = """
 MERGE (d:__Document__ {id: value.id})
 SET d.title = value.title
 """
 
-batched_import(document_statement, doc_df)
-
-# Import text chunks
-print("Importing text chunks...")
-text_df = pd.read_parquet(
-    f"{GRAPHRAG_FOLDER}/create_final_text_units.parquet",
-    columns=["id", "text", "n_tokens", "document_ids"]
-)
-
 text_statement = """
 MERGE (c:__Chunk__ {id: value.id})
 SET c.text = value.text,
     c.n_tokens = value.n_tokens
-WITH c, value
+"""
+
+chunk_document_statement = """
+MATCH (c:__Chunk__ {id: value.id})
 UNWIND value.document_ids AS document_id
 MATCH (d:__Document__ {id: document_id})
 MERGE (c)-[:PART_OF]->(d)
 """
 
-batched_import(text_statement, text_df)
-
-# Import entities
-print("Importing entities...")
-entity_df = pd.read_parquet(
-    f"{GRAPHRAG_FOLDER}/create_final_entities.parquet",
-    columns=[
-        "name", "type", "description", "human_readable_id",
-        "id", "description_embedding", "text_unit_ids"
-    ]
-)
-
 entity_statement = """
 MERGE (e:__Entity__ {id: value.id})
 SET e.human_readable_id = value.human_readable_id,
     e.description = value.description,
-    e.name = replace(value.name, '"', ''),
+    e.name = value.name,
     e.description_embedding = value.description_embedding
 WITH e, value
 CALL {
@@ -133,27 +460,18 @@ CALL {
     FOREACH (ignore IN CASE WHEN value.type IS NOT NULL AND value.type <> '' THEN [1] ELSE [] END |
         SET e:__Entity__:`replace(value.type, '"', '')`)
 }
-WITH e, value
+"""
+
+entity_mention_statement = """
+MATCH (e:__Entity__ {id: value.id})
 UNWIND value.text_unit_ids AS text_unit_id
 MATCH (c:__Chunk__ {id: text_unit_id})
 MERGE (c)-[:HAS_ENTITY]->(e)
 """
 
-batched_import(entity_statement, entity_df)
-
-# Import relationships
-print("Importing relationships...")
-rel_df = pd.read_parquet(
-    f"{GRAPHRAG_FOLDER}/create_final_relationships.parquet",
-    columns=[
-        "source", "target", "id", "rank", "weight",
-        "human_readable_id", "description", "text_unit_ids"
-    ]
-)
-
 rel_statement = """
-MATCH (source:__Entity__ {name: replace(value.source, '"', '')})
-MATCH (target:__Entity__ {name: replace(value.target, '"', '')})
+MATCH (source:__Entity__ {id: value.source_id})
+MATCH (target:__Entity__ {id: value.target_id})
 MERGE (source)-[rel:RELATED {id: value.id}]->(target)
 SET rel.rank = value.rank,
     rel.weight = value.weight,
@@ -162,37 +480,18 @@ SET rel.rank = value.rank,
     rel.text_unit_ids = value.text_unit_ids
 """
 
-batched_import(rel_statement, rel_df)
-
-# Import communities
-print("Importing communities...")
-community_df = pd.read_parquet(
-    f"{GRAPHRAG_FOLDER}/create_final_communities.parquet",
-    columns=["id", "level", "title", "text_unit_ids", "relationship_ids"]
-)
-
 community_statement = """
 MERGE (c:__Community__ {community: value.id})
 SET c.level = value.level,
     c.title = value.title
-WITH c, value
-UNWIND value.relationship_ids as rel_id
-MATCH (start:__Entity__)-[r:RELATED {id: rel_id}]->(end:__Entity__)
-MERGE (start)-[:IN_COMMUNITY]->(c)
-MERGE (end)-[:IN_COMMUNITY]->(c)
 """
 
-batched_import(community_statement, community_df)
-
-# Import community reports
-print("Importing community reports...")
-community_report_df = pd.read_parquet(
-    f"{GRAPHRAG_FOLDER}/create_final_community_reports.parquet",
-    columns=[
-        "id", "community", "level", "title", "summary",
-        "findings", "rank", "rank_explanation", "full_content"
-    ]
-)
+community_member_statement = """
+MATCH (c:__Community__ {community: value.id})
+UNWIND value.entity_ids AS entity_id
+MATCH (e:__Entity__ {id: entity_id})
+MERGE (e)-[:IN_COMMUNITY]->(c)
+"""
 
 community_report_statement = """
 MERGE (c:__Community__ {community: value.community})
@@ -200,18 +499,608 @@ SET c.level = value.level,
     c.title = value.title,
     c.rank = value.rank,
     c.rank_explanation = value.rank_explanation,
-    c.full_content = value.full_content,
     c.summary = value.summary
-WITH c, value
-UNWIND range(0, size(value.findings)-1) AS finding_idx
-WITH c, finding_idx, value.findings[finding_idx] as finding
-MERGE (f:Finding {id: finding_idx})
-SET f += finding
+"""
+
+# One record per finding (see prepare_findings); its id is unique, so
+# findings of different communities never contend for the same node
+finding_statement = """
+MATCH (c:__Community__ {community: value.community})
+MERGE (f:Finding {id: value.id})
+SET f += value.finding,
+    f.finding_idx = value.finding_idx
 MERGE (c)-[:HAS_FINDING]->(f)
 """
 
-batched_import(community_report_statement, community_report_df)
+# Report full_content is the largest text in the graph, so it loads in its
+# own stage rather than inflating every community report batch
+community_content_statement = """
+MATCH (c:__Community__ {community: value.community})
+SET c.full_content = value.full_content
+"""
+
+# Findings used to be merged on their list position alone, which collapsed
+# every report's findings onto a handful of shared nodes
+legacy_findings_statement = """
+MATCH (f:Finding)
+WHERE valueType(f.id) = "INTEGER"
+DETACH DELETE f
+"""
+
+# Statements used by delta imports. Deletes remove rows that disappeared
+# from the parquet output; prunes drop the edges an upsert re-creates, so a
+# changed row does not keep links to chunks or documents it no longer has.
+# Edge stages delete a vanished row by pruning its edges; the vertex stage
+# then removes the node itself.
+document_delete_statement = """
+MATCH (d:__Document__ {id: value.id})
+DETACH DELETE d
+"""
+
+text_delete_statement = """
+MATCH (c:__Chunk__ {id: value.id})
+DETACH DELETE c
+"""
+
+text_prune_statement = """
+MATCH (c:__Chunk__ {id: value.id})-[r:PART_OF]->(:__Document__)
+DELETE r
+"""
+
+entity_delete_statement = """
+MATCH (e:__Entity__ {id: value.id})
+DETACH DELETE e
+"""
+
+entity_prune_statement = """
+MATCH (:__Chunk__)-[r:HAS_ENTITY]->(e:__Entity__ {id: value.id})
+DELETE r
+"""
+
+rel_delete_statement = """
+MATCH (:__Entity__)-[r:RELATED {id: value.id}]->(:__Entity__)
+DELETE r
+"""
+
+community_delete_statement = """
+MATCH (c:__Community__ {community: value.id})
+DETACH DELETE c
+"""
+
+community_prune_statement = """
+MATCH (:__Entity__)-[r:IN_COMMUNITY]->(c:__Community__ {community: value.id})
+DELETE r
+"""
+
+community_report_delete_statement = """
+MATCH (c:__Community__ {community: value.id})
+REMOVE c.rank, c.rank_explanation, c.summary
+"""
+
+finding_delete_statement = """
+MATCH (:__Community__ {community: value.id})-[:HAS_FINDING]->(f:Finding)
+DETACH DELETE f
+"""
+
+community_content_delete_statement = """
+MATCH (c:__Community__ {community: value.id})
+REMOVE c.full_content
+"""
+
+def without_embeddings(stage):
+    """
+    The entities stage for --embeddings float16/int8: description_embedding
+    isn't read, so entity_statement sets it to null, which removes it from
+    the nodes. semantic_search reads the embedding store instead.
+    """
+    return stage._replace(columns=[column for column in stage.columns if column != "description_embedding"])
+
+def refresh_embedding_store(dtype):
+    """
+    Build the description embedding store from the entities parquet, or
+    retire it when embeddings are kept on the nodes (dtype "graph"). The
+    node2vec store is retired then too, even if analytics don't run to
+    replace it: searches would otherwise keep reading stale node2vec
+    vectors from a store the import no longer maintains.
+    """
+    if dtype == "graph":
+        if remove_store(DESCRIPTION_STORE_PATH):
+            print("Removed the description embedding store; embeddings are on the nodes again.")
+        if remove_store(NODE2VEC_STORE_PATH):
+            print("Removed the node2vec embedding store; node2vec embeddings go on the nodes.")
+        return
+    start_s = time.time()
+    with span("import_embedding_store"):
+        meta = build_store_from_parquet(f"{GRAPHRAG_FOLDER}/create_final_entities.parquet",
+                                        DESCRIPTION_STORE_PATH, dtype)
+    print(f"Stored {meta['count']} description embeddings as {dtype} ({meta['bytes'] / 2**20:.1f} MiB) "
+          f"in {time.time() - start_s:.2f} s.")
+
+def clean_name(name):
+    return name.replace('"', '') if name is not None else None
+
+class IdMaps:
+    """
+    Client-side lookups that let edge statements MATCH endpoints by indexed id.
+    name_to_id maps cleaned entity names to entity ids; rel_endpoints maps a
+    relationship id to its (source id, target id) pair.
+    """
+
+    def __init__(self, graphrag_folder):
+        entities = pq.read_table(f"{graphrag_folder}/create_final_entities.parquet", columns=["name", "id"])
+        names = pc.replace_substring(entities.column("name"), '"', '').to_pylist()
+        self.name_to_id = dict(zip(names, entities.column("id").to_pylist()))
+
+        relationships = pq.read_table(f"{graphrag_folder}/create_final_relationships.parquet",
+                                      columns=["id", "source", "target"])
+        sources = pc.replace_substring(relationships.column("source"), '"', '').to_pylist()
+        targets = pc.replace_substring(relationships.column("target"), '"', '').to_pylist()
+        self.rel_endpoints = {
+            rel_id: (self.name_to_id.get(source), self.name_to_id.get(target))
+            for rel_id, source, target in zip(relationships.column("id").to_pylist(), sources, targets)
+        }
+
+def prepare_entities(records, id_maps):
+    for record in records:
+        record["name"] = clean_name(record["name"])
+    return records
+
+def prepare_relationships(records, id_maps):
+    for record in records:
+        record["source_id"] = id_maps.name_to_id.get(clean_name(record["source"]))
+        record["target_id"] = id_maps.name_to_id.get(clean_name(record["target"]))
+    return records
+
+def prepare_findings(records, id_maps):
+    """
+    One record per finding of each report, with a stable id made of the
+    community and the finding's position in the report.
+    """
+    findings = []
+    for record in records:
+        for finding_idx, finding in enumerate(record["findings"] or []):
+            findings.append({
+                "id": f"{record['community']}:{finding_idx}",
+                "community": record["community"],
+                "finding_idx": finding_idx,
+                "finding": finding,
+            })
+    return findings
+
+def count_findings(path):
+    return pc.sum(pc.list_value_length(pq.read_table(path, columns=["findings"]).column("findings"))).as_py() or 0
+
+def prepare_communities(records, id_maps):
+    for record in records:
+        members = set()
+        for rel_id in record.pop("relationship_ids") or []:
+            members.update(entity_id for entity_id in id_maps.rel_endpoints.get(rel_id, ()) if entity_id)
+        record["entity_ids"] = sorted(members)
+    return records
+
+Stage = namedtuple("Stage", [
+    "name", "filename", "columns", "statement",
+    "partition_key", "id_column", "delete_statement", "prune_statement", "prepare", "count_rows",
+], defaults=[None, None])
+
+# Import stages in dependency order: each stage MATCHes nodes created by the
+# stages before it. Partition keys group rows that write the same node, so
+# concurrent workers never touch one vertex. Creating an edge writes both
+# endpoints, and rows linking chunks, entities and communities share those
+# endpoints freely, so edge stages have no partition key and run with a
+# single writer once the vertex stages they connect are in place.
+# Stages whose prepare step expands rows count the records they send with
+# count_rows; the others send one record per parquet row.
+stages = [
+    Stage(
+        "documents", "create_final_documents.parquet",
+        ["id", "title"],
+        document_statement, "id", "id",
+        document_delete_statement, None,
+    ),
+    Stage(
+        "text chunks", "create_final_text_units.parquet",
+        ["id", "text", "n_tokens"],
+        text_statement, "id", "id",
+        text_delete_statement, None,
+    ),
+    Stage(
+        "chunk documents", "create_final_text_units.parquet",
+        ["id", "document_ids"],
+        chunk_document_statement, None, "id",
+        text_prune_statement, text_prune_statement,
+    ),
+    Stage(
+        "entities", "create_final_entities.parquet",
+        ["name", "type", "description", "human_readable_id", "id", "description_embedding"],
+        entity_statement, "id", "id",
+        entity_delete_statement, None, prepare_entities,
+    ),
+    Stage(
+        "entity mentions", "create_final_entities.parquet",
+        ["id", "text_unit_ids"],
+        entity_mention_statement, None, "id",
+        entity_prune_statement, entity_prune_statement,
+    ),
+    Stage(
+        "relationships", "create_final_relationships.parquet",
+        [
+            "source", "target", "id", "rank", "weight",
+            "human_readable_id", "description", "text_unit_ids"
+        ],
+        rel_statement, None, "id",
+        rel_delete_statement, rel_delete_statement, prepare_relationships,
+    ),
+    Stage(
+        "communities", "create_final_communities.parquet",
+        ["id", "level", "title"],
+        community_statement, "id", "id",
+        community_delete_statement, None,
+    ),
+    Stage(
+        "community members", "create_final_communities.parquet",
+        ["id", "relationship_ids"],
+        community_member_statement, None, "id",
+        community_prune_statement, community_prune_statement, prepare_communities,
+    ),
+    Stage(
+        "community reports", "create_final_community_reports.parquet",
+        ["id", "community", "level", "title", "summary", "rank", "rank_explanation"],
+        community_report_statement, "community", "community",
+        community_report_delete_statement, None,
+    ),
+    Stage(
+        "findings", "create_final_community_reports.parquet",
+        ["community", "findings"],
+        finding_statement, "community", "community",
+        finding_delete_statement, finding_delete_statement, prepare_findings, count_findings,
+    ),
+    Stage(
+        "community report content", "create_final_community_reports.parquet",
+        ["community", "full_content"],
+        community_content_statement, "community", "community",
+        community_content_delete_statement, None,
+    ),
+]
+
+def _fingerprint_columns(record_batch):
+    """
+    Per-row byte strings for every column of a record batch.
+    Embedding columns are hashed from their float32/float64 buffers rather
+    than from millions of Python floats.
+    """
+    columns = []
+    for column in record_batch.columns:
+        column_type = column.type
+        if (pa.types.is_list(column_type) or pa.types.is_fixed_size_list(column_type)) \
+                and pa.types.is_floating(column_type.value_type) and column.null_count == 0:
+            offsets = column.offsets.to_numpy() if pa.types.is_list(column_type) else None
+            values = column.flatten().to_numpy()
+            if offsets is None:
+                columns.append([row.tobytes() for row in values.reshape(len(column), -1)])
+            else:
+                bounds = (offsets - offsets[0]).tolist()
+                columns.append([values[start:end].tobytes() for start, end in zip(bounds, bounds[1:])])
+        else:
+            columns.append([repr(value).encode() for value in _column_to_pylist(column)])
+    return columns
+
+def iter_fingerprints(path, columns, id_column, batch_size=10_000):
+    """
+    Stream (id, content hash) pairs of a parquet file.
+    """
+    parquet_file = open_parquet(path)
+    for record_batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        ids = _column_to_pylist(record_batch.column(id_column))
+        for row_id, values in zip(ids, zip(*_fingerprint_columns(record_batch))):
+            yield row_id, hashlib.blake2b(b"\x1f".join(values), digest_size=16).hexdigest()
+
+def filter_batches(batches, id_column, ids):
+    """
+    Keep only the records whose id is in ids.
+    """
+    for records in batches:
+        selected = [record for record in records if record[id_column] in ids]
+        if selected:
+            yield selected
+
+def add_dependent_changes(changes, id_maps):
+    """
+    Relationship rows name their endpoints and community rows list
+    relationship ids; both only resolve to entity ids on import. When an
+    entity is replaced, the edges they created go with the old node while
+    their fingerprints stay the same, so mark them changed as well: every
+    relationship with a changed endpoint, and every community holding a
+    changed relationship has its members re-sent.
+    """
+    entities, _ = changes["entities"]
+    relationships, _ = changes["relationships"]
+    communities, _ = changes["community members"]
+    dependent_relationships = {
+        rel_id for rel_id, endpoints in id_maps.rel_endpoints.items()
+        if rel_id not in relationships and not entities.isdisjoint(endpoints)
+    }
+    relationships |= dependent_relationships
+    table = pq.read_table(f"{GRAPHRAG_FOLDER}/create_final_communities.parquet", columns=["id", "relationship_ids"])
+    dependent_communities = {
+        community_id for community_id, rel_ids in zip(table.column("id").to_pylist(),
+                                                      table.column("relationship_ids").to_pylist())
+        if community_id not in communities and not relationships.isdisjoint(rel_ids or ())
+    }
+    communities |= dependent_communities
+    if dependent_relationships or dependent_communities:
+        print(f"Re-sending {len(dependent_relationships)} relationships and {len(dependent_communities)} "
+              f"communities whose entities changed")
+
+def create_constraints(memgraph):
+    for constraint in constraints:
+        try:
+            memgraph.execute(constraint)
+            print(f"Created constraint: {constraint}")
+        except Exception as e:
+            print(f"Constraint might already exist or failed: {e}")
+    for index in lookup_indexes:
+        try:
+            memgraph.execute(index)
+            print(f"Created index: {index}")
+        except Exception as e:
+            print(f"Index might already exist or failed: {e}")
+
+def stage_batches(stage, batch_size, id_maps, ids=None):
+    """
+    Stream the records of one stage, optionally restricted to the given ids,
+    with the stage's client-side preparation applied.
+    """
+    batches = iter_parquet_batches(f"{GRAPHRAG_FOLDER}/{stage.filename}", stage.columns, batch_size)
+    if ids is not None:
+        batches = filter_batches(batches, stage.id_column, ids)
+    if stage.prepare is None:
+        return batches
+    return (stage.prepare(records, id_maps) for records in batches)
+
+def import_stage(stage, batches, total, pool, workers, batch_size):
+    stats = ImportStats(stage.name)
+    quarantine = Quarantine(f"{QUARANTINE_FOLDER}/{stage.name.replace(' ', '_')}.jsonl", stage.id_column)
+    print(f"Importing {stage.name}...")
+    with span("import_stage", table=stage.name):
+        parallel_import(stage.statement, batches, stage.partition_key, pool, total=total, workers=workers,
+                        batch_size=batch_size, stats=stats, quarantine=quarantine)
+    stats.finish()
+    return stats, quarantine
+
+def _id_batches(ids, batch_size):
+    ids = list(ids)
+    for start in range(0, len(ids), batch_size):
+        yield [{"id": row_id} for row_id in ids[start:start + batch_size]]
+
+def run_import(pool, workers=IMPORT_WORKERS, batch_size=BATCH_SIZE):
+    """
+    Run every import stage in dependency order, streaming each parquet file.
+    """
+    with pool.connection() as memgraph:
+        memgraph.execute(legacy_findings_statement)
+        create_constraints(memgraph)
+    id_maps = IdMaps(GRAPHRAG_FOLDER)
+
+    all_stats = []
+    for stage in stages:
+        path = f"{GRAPHRAG_FOLDER}/{stage.filename}"
+        total = stage.count_rows(path) if stage.count_rows else pq.ParquetFile(path).metadata.num_rows
+        # Read enough rows per batch that every worker gets a full batch_size share
+        batches = stage_batches(stage, batch_size * max(workers, 1), id_maps)
+        stats, _ = import_stage(stage, batches, total, pool, workers, batch_size)
+        all_stats.append(stats)
+
+    print("Import summary:")
+    for stats in all_stats:
+        print(f"  {stats.report()}")
+    return all_stats
+
+def _text_documents(filename, columns, id_column, fields, ids=None):
+    """
+    Stream (id, field values) pairs for the text index, optionally only for the given ids.
+    """
+    batches = iter_parquet_batches(f"{GRAPHRAG_FOLDER}/{filename}", columns, 10_000)
+    if ids is not None:
+        batches = filter_batches(batches, id_column, ids)
+    for records in batches:
+        for record in records:
+            yield record[id_column], [field(record) for field in fields]
+
+def _community_documents():
+    """
+    Titles come from the community table, summaries from the community reports.
+    """
+    documents = {}
+    for records in iter_parquet_batches(f"{GRAPHRAG_FOLDER}/create_final_communities.parquet", ["id", "title"]):
+        for record in records:
+            documents[str(record["id"])] = [record["title"], None]
+    for records in iter_parquet_batches(f"{GRAPHRAG_FOLDER}/create_final_community_reports.parquet",
+                                        ["community", "title", "summary"]):
+        for record in records:
+            documents[str(record["community"])] = [record["title"], record["summary"]]
+    return documents.items()
+
+@timed("import_text_index")
+def refresh_text_index(changes=None, path=TEXT_INDEX_PATH):
+    """
+    Update the BM25 text index read by keyword, PageRank and community search.
+    Without changes every collection is rebuilt; with the delta import's
+    {stage name: (changed ids, deleted ids)} only chunks and entities that
+    changed are replaced. Communities are small and always rebuilt.
+    """
+    start_s = time.time()
+    text_index = TextIndex(path)
+    text_index.create()
+    sources = {
+        "chunks": ("text chunks", "create_final_text_units.parquet", ["id", "text"],
+                   [lambda r: r["text"]]),
+        "entities": ("entities", "create_final_entities.parquet", ["id", "name", "description"],
+                     [lambda r: clean_name(r["name"]), lambda r: r["description"]]),
+    }
+    for collection, (stage_name, filename, columns, fields) in sources.items():
+        if changes is None:
+            text_index.clear(collection)
+            count = text_index.upsert(collection, _text_documents(filename, columns, "id", fields))
+        else:
+            changed, deleted = changes[stage_name]
+            text_index.delete(collection, deleted)
+            count = text_index.upsert(collection, _text_documents(filename, columns, "id", fields, changed)) \
+                if changed else 0
+        print(f"Indexed {count} {collection} for text search.")
+    text_index.clear("communities")
+    count = text_index.upsert("communities", _community_documents())
+    print(f"Indexed {count} communities for text search in {time.time() - start_s:.2f} s.")
+
+def run_delta_import(pool, workers=IMPORT_WORKERS, batch_size=BATCH_SIZE, manifest_path=MANIFEST_PATH,
+                     update_text_index=True, bump_version=True):
+    """
+    Send only rows that were inserted, changed or deleted since the last run.
+    Every table is fingerprinted and diffed against the manifest first.
+    Deletions then run in reverse dependency order, so a replaced entity
+    releases its unique name before its successor is merged. Changed rows
+    finally go through prune + upsert in dependency order. An empty manifest
+    makes the first delta run a full load. The graph version is bumped when
+    anything changed, unless bump_version is False because the caller still
+    rebuilds state derived from the graph and bumps it afterwards.
+    Returns the per-stage ImportStats and whether any row was inserted,
+    changed or deleted.
+    """
+    with pool.connection() as memgraph:
+        memgraph.execute(legacy_findings_statement)
+        create_constraints(memgraph)
+    id_maps = IdMaps(GRAPHRAG_FOLDER)
+    manifest = ImportManifest(manifest_path)
+
+    changes = {}
+    for stage in stages:
+        manifest.begin(stage.name)
+        manifest.stage(stage.name, iter_fingerprints(
+            f"{GRAPHRAG_FOLDER}/{stage.filename}", stage.columns, stage.id_column))
+        changes[stage.name] = (manifest.changed_ids(stage.name), manifest.deleted_ids(stage.name))
+        changed, deleted = changes[stage.name]
+        print(f"{stage.name}: {len(changed)} inserted or changed, {len(deleted)} deleted")
+    add_dependent_changes(changes, id_maps)
+
+    with pool.connection() as memgraph:
+        for stage in reversed(stages):
+            _, deleted = changes[stage.name]
+            if deleted:
+                print(f"Deleting {len(deleted)} {stage.name}...")
+                batched_import(stage.delete_statement, _id_batches(deleted, batch_size), memgraph, len(deleted),
+                               batch_size=batch_size)
+
+    all_stats = []
+    for stage in stages:
+        changed, _ = changes[stage.name]
+        if not changed:
+            manifest.commit(stage.name)
+            continue
+        if stage.prune_statement:
+            print(f"Pruning edges of {len(changed)} changed {stage.name}...")
+            with pool.connection() as memgraph:
+                batched_import(stage.prune_statement, _id_batches(changed, batch_size), memgraph, len(changed),
+                               batch_size=batch_size)
+        batches = stage_batches(stage, batch_size * max(workers, 1), id_maps, ids=changed)
+        total = None if stage.count_rows else len(changed)
+        stats, quarantine = import_stage(stage, batches, total, pool, workers, batch_size)
+        manifest.commit(stage.name, failed_ids=quarantine.failed_ids)
+        all_stats.append(stats)
+
+    manifest.close()
+    if update_text_index:
+        refresh_text_index(changes)
+    any_changes = any(changed or deleted for changed, deleted in changes.values())
+    if bump_version and any_changes:
+        with pool.connection() as memgraph:
+            print(f"Graph version is now {bump_graph_version(memgraph)}.")
+    print("Import summary:")
+    for stats in all_stats:
+        print(f"  {stats.report()}")
+    return all_stats, any_changes
+
+def refresh_derived_state(pool, changed=True, embeddings="graph", vector_index=True, analytics=True):
+    """
+    Rebuild what the searches derive from the graph, then publish it by
+    bumping the graph version. Analytics computed here are stamped with the
+    version being published, in the same statement. When the import changed
+    nothing and the analytics were current, the version stays as it was, so
+    cached search results remain valid. Returns the published version, or
+    None if nothing was published.
+    """
+    if vector_index:
+        start_s = time.time()
+        with span("import_vector_index"):
+            meta = build_index_from_parquet(f"{GRAPHRAG_FOLDER}/create_final_entities.parquet",
+                                            VECTOR_INDEX_FOLDER)
+        print(f"Built vector index over {meta['count']} entities ({meta['n_lists']} lists) "
+              f"in {time.time() - start_s:.2f} s.")
+    refresh_embedding_store(embeddings)
+    with pool.connection() as memgraph:
+        analytics_ran = analytics and refresh_analytics(
+            memgraph, force=changed, embedding_store=None if embeddings == "graph" else embeddings, stamp=False)
+        if not (changed or analytics_ran):
+            print("Nothing changed; the graph version stays as it was.")
+            return None
+        version = bump_graph_version(memgraph, analytics=analytics_ran)
+    print(f"Graph version is now {version}.")
+    return version
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import GraphRAG parquet output into Memgraph.")
+    parser.add_argument("--workers", type=int, default=IMPORT_WORKERS,
+                        help="number of concurrent Memgraph connections (1 imports serially)")
+    parser.add_argument("--backend", choices=["merge", "csv"], default="merge",
+                        help="merge sends UNWIND/MERGE batches over Bolt; csv bulk-loads an empty database with LOAD CSV")
+    parser.add_argument("--mode", choices=["full", "delta"], default="full",
+                        help="full re-MERGEs every row; delta only sends rows changed since the last delta run")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="initial rows per UNWIND batch; adapts between MIN_BATCH_SIZE and MAX_BATCH_SIZE")
+    parser.add_argument("--skip-text-index", action="store_true",
+                        help="don't update the BM25 text index used by keyword, PageRank and community search")
+    parser.add_argument("--skip-vector-index", action="store_true",
+                        help="don't rebuild the approximate nearest-neighbour index used by semantic_search")
+    parser.add_argument("--skip-analytics", action="store_true",
+                        help="don't recompute PageRank/betweenness/Louvain/node2vec after the import")
+    parser.add_argument("--embeddings", choices=["graph", *STORE_DTYPES[1:]], default="graph",
+                        help="graph keeps description and node2vec embeddings as node properties; float16 or int8 "
+                             "keeps them quantized in the memory-mapped embedding store and off the nodes")
+    parser.add_argument("--metrics-file", default=None,
+                        help="write import timings, row/byte counters and latency histograms to this JSON file")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics while importing")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+
+    if args.embeddings != "graph":
+        stages = [without_embeddings(stage) if stage.name == "entities" else stage for stage in stages]
+
+    # One connection per import worker plus one for the calling thread
+    with ConnectionPool(MEMGRAPH_HOST, MEMGRAPH_PORT, size=max(args.workers, 1) + 1) as pool:
+        # Full and CSV imports re-send every row, so assume the graph changed
+        changed = True
+        if args.backend == "csv":
+            with pool.connection() as memgraph:
+                bulk_import(memgraph, constraints, GRAPHRAG_FOLDER, CSV_FOLDER, CSV_SERVER_FOLDER,
+                            embeddings=args.embeddings == "graph")
+            if not args.skip_text_index:
+                refresh_text_index()
+        elif args.mode == "delta":
+            _, changed = run_delta_import(pool, workers=args.workers, batch_size=args.batch_size,
+                                          update_text_index=not args.skip_text_index, bump_version=False)
+        else:
+            run_import(pool, workers=args.workers, batch_size=args.batch_size)
+            if not args.skip_text_index:
+                refresh_text_index()
+
+        # Searches cached from the new version on see the new indexes, stores and analytics
+        refresh_derived_state(pool, changed, embeddings=args.embeddings, vector_index=not args.skip_vector_index,
+                              analytics=not args.skip_analytics)
+
+        print("Import complete. Closing connections...")
 
-# Close connection
-print("Import complete. Closing connection...")
-# memgraph.close()
+    if args.metrics_file:
+        write_json(args.metrics_file)
+        print(f"Wrote import metrics to {args.metrics_file}.")
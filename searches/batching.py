@@ -0,0 +1,20 @@
+from typing import Dict, Iterable, List
+
+# Batch searches send all queries in one UNWIND statement. Each query carries
+# its position as `idx`, and the statement returns one row per query with
+# its results collected in `rows`, so results can be put back in order.
+
+def query_params(queries: List[str], **per_query: List) -> List[Dict]:
+    """
+    One parameter map per query: its position plus any per-query values.
+    """
+    return [{'idx': i, **{name: values[i] for name, values in per_query.items()}} for i in range(len(queries))]
+
+def group_results(result: Iterable[Dict], count: int) -> List[List[Dict]]:
+    """
+    Results in the original query order; queries without matches get an empty list.
+    """
+    grouped = [[] for _ in range(count)]
+    for row in result:
+        grouped[row['idx']] = [dict(item) for item in row['rows']]
+    return grouped
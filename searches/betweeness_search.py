@@ -1,16 +1,17 @@
 from gqlalchemy import Memgraph
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Sequence
+from batching import group_results, query_params
+from result_cache import cached
+from result_stream import KEYSET, PAGE_SIZE, Cursor, iter_pages, projection
 
-def betweenness_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
-    # Run betweenness centrality algorithm
-    betweenness_query = """
-    CALL betweenness_centrality.get()
-    YIELD node, betweenness_centrality
-    SET node.betweenness = betweenness_centrality
-    """
-    memgraph.execute(betweenness_query)
+# Fields betweenness_search_iter can return, and the (id, score) fields pages resume from
+COLUMNS = {'entity_id': 'e.id', 'name': 'e.name', 'description': 'e.description', 'importance': 'importance'}
+KEYS = ('entity_id', 'importance')
 
-    # Search for important connector entities related to the query
+@cached('betweenness')
+def betweenness_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
+    # Search for important connector entities related to the query, using the
+    # betweenness precomputed by graph_analytics.refresh_analytics
     search_query = """
     MATCH (e:__Entity__)
     WHERE e.name CONTAINS $query OR e.description CONTAINS $query
@@ -21,4 +22,38 @@ def betweenness_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[
 
     result = memgraph.execute_and_fetch(search_query, {'query': query.lower(), 'limit': limit})
 
-    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'importance': row['importance']} for row in result]
\ No newline at end of file
+    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'importance': row['importance']} for row in result]
+
+def betweenness_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10) -> List[List[Dict]]:
+    # One round trip for all queries; results come back in query order
+    search_query = """
+    UNWIND $queries AS q
+    CALL {
+        WITH q
+        MATCH (e:__Entity__)
+        WHERE e.name CONTAINS q.query OR e.description CONTAINS q.query
+        WITH e
+        ORDER BY e.betweenness DESC
+        LIMIT $limit
+        RETURN collect({entity_id: e.id, name: e.name, description: e.description, importance: e.betweenness}) AS rows
+    }
+    RETURN q.idx AS idx, rows
+    """
+    params = query_params(queries, query=[query.lower() for query in queries])
+    result = memgraph.execute_and_fetch(search_query, {'queries': params, 'limit': limit})
+    return group_results(result, len(queries))
+
+def betweenness_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                            limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                            after: Optional[Cursor] = None) -> Iterator[Dict]:
+    # Results page by page with only the requested COLUMNS; see result_stream
+    search_query = f"""
+    MATCH (e:__Entity__)
+    WHERE e.name CONTAINS $query OR e.description CONTAINS $query
+    WITH e, coalesce(e.betweenness, 0.0) AS importance
+    WHERE {KEYSET.format(score='importance', id='e.id')}
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY importance DESC, entity_id
+    LIMIT $page_size
+    """
+    return iter_pages(memgraph, search_query, {'query': query.lower()}, KEYS, limit, page_size, after)
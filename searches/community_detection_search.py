@@ -1,16 +1,26 @@
 from gqlalchemy import Memgraph
-from typing import List, Dict
-
-def community_detection_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
-    # Run community detection algorithm
-    community_query = """
-    CALL louvain.get()
-    YIELD node, community
-    SET node.louvain_community = community
-    """
-    memgraph.execute(community_query)
+from typing import Dict, Iterator, List, Optional, Sequence
+from batching import group_results, query_params
+from result_cache import cached
+from result_stream import KEYSET, PAGE_SIZE, Cursor, iter_pages, projection
+
+# Louvain communities can hold thousands of entities; results list the most
+# central ones by PageRank and the full membership pages through
+# community_members_iter
+MEMBERS_PER_COMMUNITY = 50
 
-    # Search for communities related to the query
+# Fields community_detection_search_iter and community_members_iter can
+# return, and the (id, score) fields their pages resume from
+COLUMNS = {'community': 'community', 'relevance': 'relevance', 'member_count': 'member_count'}
+KEYS = ('community', 'relevance')
+MEMBER_COLUMNS = {'entity_id': 'n.id', 'name': 'n.name', 'rank': 'rank'}
+MEMBER_KEYS = ('entity_id', 'rank')
+
+@cached('community_detection')
+def community_detection_search(query: str, memgraph: Memgraph, limit: int = 10,
+                               members: int = MEMBERS_PER_COMMUNITY) -> List[Dict]:
+    # Search for communities related to the query, using the Louvain
+    # communities precomputed by graph_analytics.refresh_analytics
     search_query = """
     MATCH (e:__Entity__)
     WHERE e.name CONTAINS $query OR e.description CONTAINS $query
@@ -18,9 +28,71 @@ def community_detection_search(query: str, memgraph: Memgraph, limit: int = 10)
     ORDER BY relevance DESC
     LIMIT $limit
     MATCH (n:__Entity__ {louvain_community: community})
-    RETURN community, collect(n.name) AS entities, relevance
+    WITH community, relevance, n
+    ORDER BY n.pagerank DESC
+    WITH community, relevance, collect(n.name) AS names
+    RETURN community, names[0..$members] AS entities, size(names) AS member_count, relevance
+    ORDER BY relevance DESC
     """
 
-    result = memgraph.execute_and_fetch(search_query, {'query': query.lower(), 'limit': limit})
+    result = memgraph.execute_and_fetch(search_query, {'query': query.lower(), 'limit': limit, 'members': members})
 
-    return [{'community': row['community'], 'entities': row['entities'], 'relevance': row['relevance']} for row in result]
+    return [{'community': row['community'], 'entities': row['entities'], 'member_count': row['member_count'],
+             'relevance': row['relevance']} for row in result]
+
+def community_detection_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10,
+                                     members: int = MEMBERS_PER_COMMUNITY) -> List[List[Dict]]:
+    # One round trip for all queries; results come back in query order
+    search_query = """
+    UNWIND $queries AS q
+    MATCH (e:__Entity__)
+    WHERE e.name CONTAINS q.query OR e.description CONTAINS q.query
+    WITH q, e.louvain_community AS community, count(*) AS relevance
+    ORDER BY relevance DESC
+    WITH q, collect({community: community, relevance: relevance})[0..$limit] AS communities
+    UNWIND communities AS found
+    MATCH (n:__Entity__ {louvain_community: found.community})
+    WITH q, found, n
+    ORDER BY n.pagerank DESC
+    WITH q, found, collect(n.name) AS names
+    ORDER BY found.relevance DESC
+    RETURN q.idx AS idx, collect({community: found.community, entities: names[0..$members],
+                                  member_count: size(names), relevance: found.relevance}) AS rows
+    """
+    params = query_params(queries, query=[query.lower() for query in queries])
+    result = memgraph.execute_and_fetch(search_query, {'queries': params, 'limit': limit, 'members': members})
+    return group_results(result, len(queries))
+
+def community_detection_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                                    limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                                    after: Optional[Cursor] = None) -> Iterator[Dict]:
+    # Communities page by page with their member count but no members;
+    # see result_stream, and community_members_iter for the members
+    search_query = f"""
+    MATCH (e:__Entity__)
+    WHERE (e.name CONTAINS $query OR e.description CONTAINS $query) AND e.louvain_community IS NOT NULL
+    WITH e.louvain_community AS community, count(*) AS relevance
+    WHERE {KEYSET.format(score='relevance', id='community')}
+    WITH community, relevance
+    ORDER BY relevance DESC, community
+    LIMIT $page_size
+    MATCH (n:__Entity__ {{louvain_community: community}})
+    WITH community, relevance, count(n) AS member_count
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY relevance DESC, community
+    """
+    return iter_pages(memgraph, search_query, {'query': query.lower()}, KEYS, limit, page_size, after)
+
+def community_members_iter(community, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                           limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                           after: Optional[Cursor] = None) -> Iterator[Dict]:
+    # Members of one Louvain community, most central by PageRank first
+    search_query = f"""
+    MATCH (n:__Entity__ {{louvain_community: $community}})
+    WITH n, coalesce(n.pagerank, 0.0) AS rank
+    WHERE {KEYSET.format(score='rank', id='n.id')}
+    RETURN {projection(MEMBER_COLUMNS, fields, MEMBER_KEYS)}
+    ORDER BY rank DESC, entity_id
+    LIMIT $page_size
+    """
+    return iter_pages(memgraph, search_query, {'community': community}, MEMBER_KEYS, limit, page_size, after)
@@ -1,7 +1,46 @@
 from gqlalchemy import Memgraph
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Sequence
+from batching import group_results, query_params
+from result_cache import cached
+from result_stream import KEYSET, PAGE_SIZE, Cursor, iter_hits, iter_pages, projection
+from text_index import load_text_index
 
+# Fields community_search_iter can return, and the (id, score) fields pages
+# resume from. The score is the BM25 score with the text index, otherwise
+# 2 for communities matching in title and summary and 1 for either.
+COLUMNS = {'community_id': 'c.community', 'title': 'c.title', 'summary': 'c.summary', 'rank': 'c.rank',
+           'score': 'score'}
+KEYS = ('community_id', 'score')
+
+def community_keys(community_id: str) -> List:
+    """
+    The values a text index id may be stored as in c.community: GraphRAG
+    writes community ids as strings or as integers depending on its version,
+    and the text index keeps them as strings. Each one is looked up through
+    the index on :__Community__(community).
+    """
+    try:
+        return [community_id, int(community_id)]
+    except ValueError:
+        return [community_id]
+
+@cached('community')
 def community_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
+    # Rank communities by BM25 over title and summary when the text index is built
+    text_index = load_text_index()
+    if text_index is not None:
+        hits = [{'id': community_id, 'keys': community_keys(community_id), 'score': score}
+                for community_id, score in text_index.search('communities', query, limit)]
+        cypher_query = """
+        UNWIND $hits AS hit
+        UNWIND hit.keys AS key
+        MATCH (c:__Community__ {community: key})
+        RETURN c.community AS community_id, c.title AS title, c.summary AS summary, c.rank AS rank, hit.score AS score
+        ORDER BY score DESC, rank DESC
+        """
+        result = memgraph.execute_and_fetch(cypher_query, {'hits': hits})
+        return [{'community_id': row['community_id'], 'title': row['title'], 'summary': row['summary'], 'rank': row['rank']} for row in result]
+
     # Construct the Cypher query
     cypher_query = """
     MATCH (c:__Community__)
@@ -23,6 +62,80 @@ def community_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Di
     # Process and return the results
     return [{'community_id': row['community_id'], 'title': row['title'], 'summary': row['summary'], 'rank': row['rank']} for row in result]
 
+def community_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10) -> List[List[Dict]]:
+    # One round trip for all queries; results come back in query order
+    text_index = load_text_index()
+    if text_index is not None:
+        hits = [[{'id': community_id, 'keys': community_keys(community_id), 'score': score}
+                 for community_id, score in text_index.search('communities', query, limit)]
+                for query in queries]
+        cypher_query = """
+        UNWIND $queries AS q
+        UNWIND q.hits AS hit
+        UNWIND hit.keys AS key
+        MATCH (c:__Community__ {community: key})
+        WITH q, c, hit
+        ORDER BY hit.score DESC, c.rank DESC
+        RETURN q.idx AS idx, collect({community_id: c.community, title: c.title, summary: c.summary, rank: c.rank}) AS rows
+        """
+        result = memgraph.execute_and_fetch(cypher_query, {'queries': query_params(queries, hits=hits)})
+        return group_results(result, len(queries))
+
+    cypher_query = """
+    UNWIND $queries AS q
+    CALL {
+        WITH q
+        MATCH (c:__Community__)
+        WHERE c.title CONTAINS q.query OR c.summary CONTAINS q.query
+        WITH c, (
+            CASE
+                WHEN c.title CONTAINS q.query AND c.summary CONTAINS q.query THEN 2
+                ELSE 1
+            END
+        ) AS relevance
+        ORDER BY relevance DESC, c.rank DESC
+        LIMIT $limit
+        RETURN collect({community_id: c.community, title: c.title, summary: c.summary, rank: c.rank}) AS rows
+    }
+    RETURN q.idx AS idx, rows
+    """
+    params = query_params(queries, query=[query.lower() for query in queries])
+    result = memgraph.execute_and_fetch(cypher_query, {'queries': params, 'limit': limit})
+    return group_results(result, len(queries))
+
+def community_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                          limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                          after: Optional[Cursor] = None) -> Iterator[Dict]:
+    # Results page by page with only the requested COLUMNS; see result_stream
+    text_index = load_text_index()
+    if text_index is not None:
+        cypher_query = f"""
+        UNWIND $hits AS hit
+        UNWIND hit.keys AS key
+        MATCH (c:__Community__ {{community: key}})
+        WITH c, hit.score AS score
+        RETURN {projection(COLUMNS, fields, KEYS)}
+        ORDER BY score DESC, community_id
+        """
+        return iter_hits(memgraph, cypher_query, lambda k: text_index.search('communities', query, k),
+                         KEYS, limit, page_size, after, hit_fields=lambda hit_id: {'keys': community_keys(hit_id)})
+
+    cypher_query = f"""
+    MATCH (c:__Community__)
+    WHERE c.title CONTAINS $query OR c.summary CONTAINS $query
+    WITH c, (
+        CASE
+            WHEN c.title CONTAINS $query AND c.summary CONTAINS $query THEN 2
+            ELSE 1
+        END
+    ) AS score
+    WHERE {KEYSET.format(score='score', id='c.community')}
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY score DESC, community_id
+    LIMIT $page_size
+    """
+    return iter_pages(memgraph, cypher_query, {'query': query.lower()}, KEYS, limit, page_size, after)
+
 # Usage example:
 # memgraph = Memgraph()
 # results = community_search("renewable energy", memgraph)
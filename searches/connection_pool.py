@@ -0,0 +1,171 @@
+import contextlib
+import queue
+import threading
+import time
+from typing import Dict, Iterator, Optional
+import backoff
+from gqlalchemy import Memgraph
+from gqlalchemy.exceptions import GQLAlchemyDatabaseError, GQLAlchemyWaitForConnectionError
+
+MEMGRAPH_HOST = "localhost"
+MEMGRAPH_PORT = 7687
+POOL_SIZE = 8
+# Idle connections older than this are pinged before being handed out
+HEALTH_CHECK_SECONDS = 30.0
+# How long acquire waits for a free slot before giving up; a leaked
+# connection or a stuck worker raises instead of hanging every caller
+ACQUIRE_TIMEOUT_SECONDS = 60.0
+CONNECT_TRIES = 5
+CONNECTION_ERRORS = (GQLAlchemyWaitForConnectionError, GQLAlchemyDatabaseError)
+
+def _close_client(client: Memgraph):
+    connection = client._cached_connection
+    client._cached_connection = None
+    if connection is not None and connection._connection is not None:
+        try:
+            connection._connection.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """
+    Bounded pool of Memgraph clients, each holding one Bolt session.
+    A connection is only ever used by the thread that acquired it. Idle
+    connections are health-checked before reuse and replaced with
+    exponential backoff when Memgraph stops answering.
+
+        with ConnectionPool(size=4) as pool:
+            with pool.connection() as memgraph:
+                memgraph.execute(...)
+    """
+
+    def __init__(self, host: str = MEMGRAPH_HOST, port: int = MEMGRAPH_PORT, size: int = POOL_SIZE,
+                 username: str = "", password: str = "", encrypted: bool = False,
+                 client_name: str = "GQLAlchemy", health_check_seconds: float = HEALTH_CHECK_SECONDS,
+                 acquire_timeout: Optional[float] = ACQUIRE_TIMEOUT_SECONDS):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.username = username
+        self.password = password
+        self.encrypted = encrypted
+        self.client_name = client_name
+        self.health_check_seconds = health_check_seconds
+        self.acquire_timeout = acquire_timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.closed = False
+        self.stats = {'created': 0, 'reused': 0, 'reconnected': 0}
+
+    @classmethod
+    def for_client(cls, memgraph: Memgraph, size: int = POOL_SIZE) -> "ConnectionPool":
+        """
+        A pool connecting to the same server with the same credentials as memgraph.
+        """
+        return cls(memgraph._host, memgraph._port, size, memgraph._username, memgraph._password,
+                   memgraph._encrypted, memgraph._client_name)
+
+    @backoff.on_exception(backoff.expo, CONNECTION_ERRORS, max_tries=CONNECT_TRIES)
+    def _connect(self) -> Memgraph:
+        client = Memgraph(host=self.host, port=self.port, username=self.username, password=self.password,
+                          encrypted=self.encrypted, client_name=self.client_name)
+        # gqlalchemy connects lazily; ping so failures surface here and get retried
+        self._ping(client)
+        with self.lock:
+            self.stats['created'] += 1
+        return client
+
+    @staticmethod
+    def _ping(client: Memgraph):
+        list(client.execute_and_fetch("RETURN 1 AS ok"))
+
+    def _healthy(self, client: Memgraph) -> bool:
+        try:
+            self._ping(client)
+            return True
+        except CONNECTION_ERRORS:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> Memgraph:
+        """
+        Check out a connection, waiting up to timeout seconds for a free
+        slot; None waits for the pool's acquire_timeout. Raises TimeoutError
+        when every connection stays checked out that long.
+        """
+        if self.closed:
+            raise RuntimeError("connection pool is closed")
+        if timeout is None:
+            timeout = self.acquire_timeout
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(f"no free Memgraph connection to {self.host}:{self.port} within {timeout} s: "
+                               f"all {self.size} are checked out, so one may have leaked or its user is stuck")
+        try:
+            try:
+                client, released_at = self.idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - released_at > self.health_check_seconds and not self._healthy(client):
+                _close_client(client)
+                with self.lock:
+                    self.stats['reconnected'] += 1
+                return self._connect()
+            with self.lock:
+                self.stats['reused'] += 1
+            return client
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, client: Memgraph, discard: bool = False):
+        """
+        Return a connection; discarded or late connections are closed instead.
+        """
+        if discard or self.closed:
+            _close_client(client)
+        else:
+            self.idle.put((client, time.monotonic()))
+        self.slots.release()
+
+    @contextlib.contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Memgraph]:
+        client = self.acquire(timeout)
+        discard = False
+        try:
+            yield client
+        except CONNECTION_ERRORS:
+            # Don't hand a session that may be mid-failure to the next caller
+            discard = True
+            raise
+        finally:
+            self.release(client, discard)
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                client, _ = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            _close_client(client)
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_pools: Dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def shared_pool(memgraph: Memgraph, size: int = POOL_SIZE) -> ConnectionPool:
+    """
+    The process-wide pool for memgraph's server and user, created on first use.
+    """
+    key = (memgraph._host, memgraph._port, memgraph._username)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = ConnectionPool.for_client(memgraph, size)
+            _pools[key] = pool
+        return pool
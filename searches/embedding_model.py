@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List
+import numpy as np
+from telemetry import count, span
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+CACHE_SIZE = 4096
+MAX_BATCH_SIZE = 64
+MAX_WAIT_MS = 5
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """
+    Load the SentenceTransformer on first use and share it between all searches.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
+class QueryEncoder:
+    """
+    Encodes queries through one shared model with an LRU cache in front.
+    Cache misses from concurrent callers are queued and encoded together:
+    a background thread waits up to max_wait_ms for more queries (or until
+    max_batch_size are queued) and runs a single forward pass for all of them.
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.cache_size = cache_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.pending = []
+        self.pending_lock = threading.Condition()
+        self.worker = None
+
+    def _cached(self, query):
+        with self.cache_lock:
+            embedding = self.cache.get(query)
+            if embedding is not None:
+                self.cache.move_to_end(query)
+            return embedding
+
+    def _store(self, query, embedding):
+        with self.cache_lock:
+            self.cache[query] = embedding
+            self.cache.move_to_end(query)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def _run(self):
+        while True:
+            with self.pending_lock:
+                while not self.pending:
+                    self.pending_lock.wait()
+                deadline = time.monotonic() + self.max_wait
+                while len(self.pending) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.pending_lock.wait(remaining)
+                batch = self.pending[:self.max_batch_size]
+                del self.pending[:self.max_batch_size]
+
+            queries = list(dict.fromkeys(query for query, _ in batch))
+            try:
+                with span('search_encode'):
+                    embeddings = dict(zip(queries, get_model().encode(queries)))
+                count('search_encoded_queries_total', len(queries))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for query, embedding in embeddings.items():
+                self._store(query, embedding)
+            for query, future in batch:
+                future.set_result(embeddings[query])
+
+    def submit(self, query: str) -> Future:
+        future = Future()
+        embedding = self._cached(query)
+        if embedding is not None:
+            count('search_embedding_cache_hits_total')
+            future.set_result(embedding)
+            return future
+        with self.pending_lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name="query-encoder", daemon=True)
+                self.worker.start()
+            self.pending.append((query, future))
+            self.pending_lock.notify()
+        return future
+
+    def encode(self, query: str) -> np.ndarray:
+        return self.submit(query).result()
+
+    def encode_many(self, queries: List[str]) -> np.ndarray:
+        """
+        Encode a list of queries in one forward pass, skipping cached ones.
+        """
+        embeddings = [self._cached(query) for query in queries]
+        missing = list(dict.fromkeys(q for q, e in zip(queries, embeddings) if e is None))
+        count('search_embedding_cache_hits_total', len(queries) - sum(e is None for e in embeddings))
+        if missing:
+            with span('search_encode'):
+                encoded = dict(zip(missing, get_model().encode(missing)))
+            count('search_encoded_queries_total', len(missing))
+            for query, embedding in encoded.items():
+                self._store(query, embedding)
+            embeddings = [encoded[q] if e is None else e for q, e in zip(queries, embeddings)]
+        return np.stack(embeddings) if embeddings else np.empty((0, 0))
+
+encoder = QueryEncoder()
+
+def encode_query(query: str) -> np.ndarray:
+    return encoder.encode(query)
+
+def encode_queries(queries: List[str]) -> np.ndarray:
+    return encoder.encode_many(queries)
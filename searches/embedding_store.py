@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+import pyarrow.parquet as pq
+from telemetry import timed
+
+# Compact side store for entity embeddings, so __Entity__ nodes don't have
+# to carry description_embedding and node2vec_embedding as float lists.
+# Vectors are L2-normalised and stored as float16, or as int8 with one
+# float32 scale per row, in .npy files opened with mmap_mode='r'. Cosine
+# similarity of a batch of queries against every entity is one matrix
+# product per chunk of rows; only the ids of the best matches go back to
+# Memgraph. int8 is a quarter of float32 and the fastest to scan; float16
+# keeps more recall but NumPy converts it to float32 slowly, so it suits
+# batched searches better than single queries.
+STORE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'embedding_store')
+DESCRIPTION_STORE_PATH = os.path.join(STORE_FOLDER, 'description')
+NODE2VEC_STORE_PATH = os.path.join(STORE_FOLDER, 'node2vec')
+STORE_DTYPES = ('float32', 'float16', 'int8')
+DEFAULT_DTYPE = 'int8'
+# Rows dequantized at a time; small enough for the float32 copy to stay in cache
+CHUNK_ROWS = 2048
+
+def quantize(vectors: np.ndarray, dtype: str = DEFAULT_DTYPE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    L2-normalise vectors and store them as dtype: (matrix, per-row scales).
+    int8 rows are scaled so their largest component maps to 127; the other
+    types keep a scale of 1.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    vectors = vectors / norms
+    if dtype == 'int8':
+        scales = np.abs(vectors).max(axis=1) / 127
+        scales[scales == 0] = 1
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    return vectors.astype(dtype), np.ones(len(vectors), dtype=np.float32)
+
+def build_store(ids: List[str], vectors: np.ndarray, path: str, dtype: str = DEFAULT_DTYPE) -> dict:
+    """
+    Write ids and their quantized embeddings to path.
+    """
+    if dtype not in STORE_DTYPES:
+        raise ValueError(f"Unknown embedding store dtype {dtype!r}, expected one of {STORE_DTYPES}")
+    matrix, scales = quantize(vectors, dtype)
+    os.makedirs(path, exist_ok=True)
+    arrays = {'vectors': matrix, 'scales': scales, 'ids': np.asarray(ids, dtype=str)}
+    # Swap the files in, so searches holding the old store mapped keep reading intact data
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.tmp.npy'), array)
+        os.replace(os.path.join(path, f'{name}.tmp.npy'), os.path.join(path, f'{name}.npy'))
+    meta = {'count': len(matrix), 'dimension': int(matrix.shape[1]) if matrix.ndim == 2 else 0, 'dtype': dtype,
+            'bytes': int(matrix.nbytes + scales.nbytes), 'built_at': time.time()}
+    with open(os.path.join(path, 'meta.tmp.json'), 'w') as f:
+        json.dump(meta, f)
+    os.replace(os.path.join(path, 'meta.tmp.json'), os.path.join(path, 'meta.json'))
+    return meta
+
+def build_store_from_parquet(parquet_path: str, path: str, dtype: str = DEFAULT_DTYPE,
+                             column: str = 'description_embedding') -> dict:
+    """
+    Build the store from create_final_entities.parquet, skipping rows without an embedding.
+    """
+    table = pq.read_table(parquet_path, columns=['id', column])
+    table = table.filter(table.column(column).is_valid())
+    embeddings = table.column(column).combine_chunks()
+    dimension = len(embeddings[0]) if len(embeddings) else 0
+    vectors = embeddings.flatten().to_numpy().reshape(-1, dimension)
+    return build_store(table.column('id').to_pylist(), vectors, path, dtype)
+
+def remove_store(path: str) -> bool:
+    """
+    Retire the store at path, so searches go back to the embeddings on the
+    nodes. Returns True if there was one.
+    """
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+    os.remove(meta_path)
+    return True
+
+class EmbeddingStore:
+    """
+    Memory-mapped, quantized embeddings with an exact cosine top-k search.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        self.scales = np.load(os.path.join(path, 'scales.npy'))
+        self.ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+        self._rows = None
+
+    def vector(self, entity_id: str) -> Optional[np.ndarray]:
+        """
+        The stored unit-length vector of entity_id as float32, or None if
+        the store doesn't hold it.
+        """
+        if self._rows is None:
+            self._rows = {str(stored_id): row for row, stored_id in enumerate(self.ids)}
+        row = self._rows.get(str(entity_id))
+        if row is None:
+            return None
+        return self.vectors[row].astype(np.float32) * self.scales[row]
+
+    def similarities(self, queries: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of each query with every stored vector, as a
+        (queries, stored vectors) matrix.
+        """
+        return np.concatenate([scores for _, scores in self._chunk_scores(queries)], axis=1)
+
+    def _chunk_scores(self, queries: np.ndarray):
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        queries = queries / norms
+        for start in range(0, len(self.vectors), CHUNK_ROWS):
+            chunk = self.vectors[start:start + CHUNK_ROWS]
+            yield start, (queries @ chunk.astype(np.float32, copy=False).T) * self.scales[start:start + len(chunk)]
+
+    @timed('search_embedding_store')
+    def search_many(self, queries: np.ndarray, k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Top k (id, similarity) pairs per query, in one pass over the store.
+        Each chunk of rows keeps only its own top k per query.
+        """
+        queries = np.atleast_2d(queries)
+        k = min(k, len(self.vectors))
+        if not k:
+            return [[] for _ in queries]
+        rows, scores = [], []
+        for start, chunk_scores in self._chunk_scores(queries):
+            chunk_k = min(k, chunk_scores.shape[1])
+            top = np.argpartition(-chunk_scores, chunk_k - 1, axis=1)[:, :chunk_k]
+            rows.append(top + start)
+            scores.append(np.take_along_axis(chunk_scores, top, axis=1))
+        rows, scores = np.concatenate(rows, axis=1), np.concatenate(scores, axis=1)
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+        rows, scores = np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+        return [[(str(self.ids[row]), float(score)) for row, score in zip(query_rows, query_scores)]
+                for query_rows, query_scores in zip(rows, scores)]
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        return self.search_many(query, k)[0]
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def load_store(path: str) -> Optional[EmbeddingStore]:
+    """
+    Open the store at path, reusing the open copy until the store is rebuilt.
+    Returns None if no store has been built there.
+    """
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    mtime = os.path.getmtime(meta_path)
+    with _stores_lock:
+        cached = _stores.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, EmbeddingStore(path))
+            _stores[path] = cached
+        return cached[1]
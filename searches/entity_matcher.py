@@ -0,0 +1,100 @@
+import threading
+from collections import deque
+from typing import Dict, Iterable, List
+from gqlalchemy import Memgraph
+from result_cache import cache, server_of
+from text_index import tokenize
+
+# Finds the names of loaded __Entity__ nodes inside a query. Names are
+# matched as whole token sequences, case-insensitively, with an Aho-Corasick
+# automaton over tokens: one pass over the query finds every (possibly
+# overlapping) name, however many entities the graph holds.
+NAMES_QUERY = """
+MATCH (e:__Entity__)
+WHERE e.name IS NOT NULL
+RETURN e.name AS name
+"""
+# Single-letter names match too much ordinary text to be useful
+MIN_NAME_LENGTH = 2
+
+class EntityMatcher:
+    """
+    Token-level Aho-Corasick automaton mapping matches back to the stored names.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        self.count = 0
+        for name in names:
+            self._add(name)
+        self._link()
+
+    def _add(self, name: str):
+        # Rows without a usable name (null, empty, punctuation only) can't match anything
+        if not isinstance(name, str) or len(name) < MIN_NAME_LENGTH:
+            return
+        tokens = tokenize(name)
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][token] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(name)
+        self.count += 1
+
+    def _link(self):
+        # Breadth-first, so a state's failure target is always linked before it
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for token, next_state in self.goto[state].items():
+                pending.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text: str) -> List[str]:
+        """
+        Stored names occurring in text, in order of first appearance.
+        """
+        if not self.count or not text:
+            # An empty entities table leaves only the root state
+            return []
+        found = {}
+        state = 0
+        for token in tokenize(text):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for name in self.output[state]:
+                found.setdefault(name, None)
+        return list(found)
+
+_matchers: Dict[tuple, tuple] = {}
+_matchers_lock = threading.Lock()
+
+def load_matcher(memgraph: Memgraph) -> EntityMatcher:
+    """
+    The matcher for memgraph's current graph version, rebuilt from the
+    __Entity__ names after load_to_mem.py bumps the version.
+    """
+    server = server_of(memgraph)
+    version = cache.graph_version(memgraph)
+    with _matchers_lock:
+        cached = _matchers.get(server)
+        if cached is None or cached[0] != version:
+            names = (row['name'] for row in memgraph.execute_and_fetch(NAMES_QUERY))
+            cached = (version, EntityMatcher(names))
+            _matchers[server] = cached
+        return cached[1]
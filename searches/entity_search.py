@@ -1,13 +1,59 @@
+import threading
 from gqlalchemy import Memgraph
-from typing import List, Dict
-import spacy
+from typing import Dict, Iterator, List, Optional, Sequence
+from batching import group_results, query_params
+from entity_matcher import load_matcher
+from result_cache import cached
+from result_stream import KEYSET, PAGE_SIZE, Cursor, iter_pages, projection
+from telemetry import timed
 
-nlp = spacy.load("en_core_web_sm")
+try:
+    import spacy
+except ImportError:
+    spacy = None
 
-def entity_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
+SPACY_MODEL = "en_core_web_sm"
+
+# Fields entity_search_iter can return, and the (id, score) fields pages resume from
+COLUMNS = {'chunk_id': 'c.id', 'text': 'c.text', 'entity_matches': 'entity_matches'}
+KEYS = ('chunk_id', 'entity_matches')
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """
+    The spaCy pipeline, loaded on first use; None when spaCy or its model isn't installed.
+    """
+    global _nlp, spacy
+    if _nlp is None and spacy is not None:
+        with _nlp_lock:
+            if _nlp is None and spacy is not None:
+                try:
+                    _nlp = spacy.load(SPACY_MODEL)
+                except OSError as e:
+                    print(f"spaCy fallback disabled: {e}")
+                    spacy = None
+    return _nlp
+
+@timed('search_extract_entities')
+def extract_entities(queries: List[str], memgraph: Memgraph, use_spacy: bool = True) -> List[List[str]]:
+    """
+    Entity names per query, found by the graph's entity-name matcher.
+    Queries without a known name fall back to spaCy NER when enabled and installed.
+    """
+    matcher = load_matcher(memgraph)
+    entities = [matcher.find(query) for query in queries]
+    unmatched = [i for i, found in enumerate(entities) if not found]
+    nlp = get_nlp() if use_spacy and unmatched else None
+    if nlp is not None:
+        for i, doc in zip(unmatched, nlp.pipe([queries[i] for i in unmatched])):
+            entities[i] = [ent.text for ent in doc.ents]
+    return entities
+
+@cached('entity')
+def entity_search(query: str, memgraph: Memgraph, limit: int = 10, use_spacy: bool = True) -> List[Dict]:
     # Extract entities from the query
-    doc = nlp(query)
-    entities = [ent.text for ent in doc.ents]
+    entities = extract_entities([query], memgraph, use_spacy)[0]
     
     # Construct the Cypher query
     cypher_query = """
@@ -26,6 +72,45 @@ def entity_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]
     # Process and return the results
     return [{'chunk_id': row['chunk_id'], 'text': row['text'], 'entity_matches': row['entity_matches']} for row in result]
 
+def entity_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10,
+                        use_spacy: bool = True) -> List[List[Dict]]:
+    entities = extract_entities(queries, memgraph, use_spacy)
+
+    cypher_query = """
+    UNWIND $queries AS q
+    CALL {
+        WITH q
+        MATCH (e:__Entity__)
+        WHERE e.name IN q.entities
+        MATCH (e)<-[:HAS_ENTITY]-(c:__Chunk__)
+        WITH c, count(DISTINCT e) AS entity_matches
+        ORDER BY entity_matches DESC
+        LIMIT $limit
+        RETURN collect({chunk_id: c.id, text: c.text, entity_matches: entity_matches}) AS rows
+    }
+    RETURN q.idx AS idx, rows
+    """
+    result = memgraph.execute_and_fetch(cypher_query, {'queries': query_params(queries, entities=entities), 'limit': limit})
+    return group_results(result, len(queries))
+
+def entity_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                       limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                       after: Optional[Cursor] = None, use_spacy: bool = True) -> Iterator[Dict]:
+    # Results page by page with only the requested COLUMNS; see result_stream
+    entities = extract_entities([query], memgraph, use_spacy)[0]
+
+    cypher_query = f"""
+    MATCH (e:__Entity__)
+    WHERE e.name IN $entities
+    MATCH (e)<-[:HAS_ENTITY]-(c:__Chunk__)
+    WITH c, count(DISTINCT e) AS entity_matches
+    WHERE {KEYSET.format(score='entity_matches', id='c.id')}
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY entity_matches DESC, chunk_id
+    LIMIT $page_size
+    """
+    return iter_pages(memgraph, cypher_query, {'entities': entities}, KEYS, limit, page_size, after)
+
 # Usage example:
 # memgraph = Memgraph()
 # results = entity_search("How does climate change affect New York and London?", memgraph)
@@ -0,0 +1,108 @@
+import argparse
+import time
+from typing import Optional
+import numpy as np
+from gqlalchemy import Memgraph
+from embedding_store import NODE2VEC_STORE_PATH, STORE_DTYPES, build_store, remove_store
+from graph_version import get_versions
+from telemetry import span
+
+# Whole-graph algorithms whose results the searches read back from node properties.
+# They used to run inside every search call; now they run once per graph version.
+ANALYTICS = {
+    'pagerank': """
+    CALL pagerank.get() YIELD node, rank
+    SET node.pagerank = rank
+    """,
+    'betweenness': """
+    CALL betweenness_centrality.get()
+    YIELD node, betweenness_centrality
+    SET node.betweenness = betweenness_centrality
+    """,
+    'louvain': """
+    CALL louvain.get()
+    YIELD node, community
+    SET node.louvain_community = community
+    """,
+    'node2vec': """
+    CALL node2vec.set(128, 10, 1, 1, 'RELATED')
+    YIELD node, embedding
+    SET node.node2vec_embedding = embedding
+    """,
+}
+
+# With an embedding store, node2vec embeddings are read back and stored
+# there instead, and removed from the nodes
+NODE2VEC_EXPORT = """
+CALL node2vec.get(128, 10, 1, 1, 'RELATED')
+YIELD node, embedding
+WITH node, embedding
+WHERE node:__Entity__
+RETURN node.id AS id, embedding
+"""
+
+NODE2VEC_REMOVE = """
+MATCH (e:__Entity__)
+WHERE e.node2vec_embedding IS NOT NULL
+REMOVE e.node2vec_embedding
+"""
+
+STAMP_QUERY = """
+MERGE (v:__GraphVersion__ {id: 'graph'})
+SET v.analytics_version = $version,
+    v.analytics_updated_at = timestamp()
+"""
+
+def export_node2vec(memgraph: Memgraph, dtype: str, path: str = NODE2VEC_STORE_PATH) -> dict:
+    """
+    Compute node2vec embeddings into the embedding store at path.
+    """
+    ids, embeddings = [], []
+    for row in memgraph.execute_and_fetch(NODE2VEC_EXPORT):
+        ids.append(row['id'])
+        embeddings.append(row['embedding'])
+    meta = build_store(ids, np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1), path, dtype)
+    memgraph.execute(NODE2VEC_REMOVE)
+    return meta
+
+def refresh_analytics(memgraph: Memgraph, force: bool = False, embedding_store: Optional[str] = None,
+                      stamp: bool = True) -> bool:
+    """
+    Recompute PageRank, betweenness, Louvain and node2vec if the stored
+    results are older than the current graph version. With embedding_store
+    set to one of STORE_DTYPES, node2vec embeddings go to the embedding
+    store in that type instead of onto the nodes. With stamp False the
+    caller publishes them with bump_graph_version(memgraph, analytics=True),
+    as load_to_mem.py does after an import.
+    Returns True if the algorithms ran.
+    """
+    versions = get_versions(memgraph)
+    if not force and versions['analytics_version'] == versions['version']:
+        print(f"Analytics are up to date with graph version {versions['version']}.")
+        return False
+
+    for name, query in ANALYTICS.items():
+        start_s = time.time()
+        with span('analytics_run', algorithm=name):
+            if name == 'node2vec' and embedding_store:
+                export_node2vec(memgraph, embedding_store)
+            else:
+                memgraph.execute(query)
+                if name == 'node2vec' and remove_store(NODE2VEC_STORE_PATH):
+                    print("Removed the node2vec embedding store; embeddings are on the nodes again.")
+        print(f"Computed {name} in {time.time() - start_s:.2f} s.")
+    if stamp:
+        memgraph.execute(STAMP_QUERY, {'version': versions['version']})
+        print(f"Analytics stamped with graph version {versions['version']}.")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute graph analytics read by the searches.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=7687)
+    parser.add_argument("--force", action="store_true", help="recompute even if the version stamp is current")
+    parser.add_argument("--embedding-store", choices=STORE_DTYPES, default=None,
+                        help="keep node2vec embeddings in the embedding store with this type, not on the nodes")
+    args = parser.parse_args()
+
+    refresh_analytics(Memgraph(host=args.host, port=args.port), force=args.force, embedding_store=args.embedding_store)
@@ -0,0 +1,30 @@
+from gqlalchemy import Memgraph
+from typing import Dict, Optional
+
+# A single marker node records the graph version. load_to_mem.py bumps it
+# after every import that changed data; derived state (analytics, caches,
+# matchers) compares its own version stamp against it.
+VERSION_QUERY = """
+OPTIONAL MATCH (v:__GraphVersion__ {id: 'graph'})
+RETURN v.version AS version, v.analytics_version AS analytics_version
+"""
+
+# With $analytics the analytics are stamped with the new version in the
+# same statement, for analytics computed on the graph being published
+BUMP_QUERY = """
+MERGE (v:__GraphVersion__ {id: 'graph'})
+SET v.version = coalesce(v.version, 0) + 1,
+    v.updated_at = timestamp()
+SET v.analytics_version = CASE WHEN $analytics THEN v.version ELSE v.analytics_version END
+RETURN v.version AS version
+"""
+
+def get_versions(memgraph: Memgraph) -> Dict[str, Optional[int]]:
+    row = next(iter(memgraph.execute_and_fetch(VERSION_QUERY)), None) or {}
+    return {'version': row.get('version') or 0, 'analytics_version': row.get('analytics_version')}
+
+def get_graph_version(memgraph: Memgraph) -> int:
+    return get_versions(memgraph)['version']
+
+def bump_graph_version(memgraph: Memgraph, analytics: bool = False) -> int:
+    return next(iter(memgraph.execute_and_fetch(BUMP_QUERY, {'analytics': analytics})))['version']
@@ -1,78 +1,140 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from gqlalchemy import Memgraph
-from typing import List, Dict
-from keyword_search import keyword_search
-from semantic_search import semantic_search
-from entity_search import entity_search
-from community_search import community_search
-from pagerank_search import pagerank_search
-from node2vec_search import node2vec_search
-from betweenness_search import betweenness_search
-from community_detection_search import community_detection_search
+from typing import List, Dict, Optional, Tuple
+from keyword_search import keyword_search, keyword_search_batch, keyword_search_iter
+from semantic_search import semantic_search, semantic_search_batch, semantic_search_iter
+from entity_search import entity_search, entity_search_batch, entity_search_iter
+from community_search import community_search, community_search_batch, community_search_iter
+from page_rank import pagerank_search, pagerank_search_batch, pagerank_search_iter
+from node2vec_search import node2vec_search, node2vec_search_batch, node2vec_search_iter
+from betweenness_search import betweenness_search, betweenness_search_batch, betweenness_search_iter
+from community_detection_search import community_detection_search, community_detection_search_batch, community_detection_search_iter
+from connection_pool import shared_pool
+from result_cache import Partial, cached
+from score_fusion import DEFAULT_FUSION, fuse
+from telemetry import count, span
 
-def hybrid_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
+STRATEGIES = {
+    'keyword': keyword_search,
+    'semantic': semantic_search,
+    'entity': entity_search,
+    'community': community_search,
+    'pagerank': pagerank_search,
+    'node2vec': node2vec_search,
+    'betweenness': betweenness_search,
+    'community_detection': community_detection_search,
+}
+
+BATCH_STRATEGIES = {
+    'keyword': keyword_search_batch,
+    'semantic': semantic_search_batch,
+    'entity': entity_search_batch,
+    'community': community_search_batch,
+    'pagerank': pagerank_search_batch,
+    'node2vec': node2vec_search_batch,
+    'betweenness': betweenness_search_batch,
+    'community_detection': community_detection_search_batch,
+}
+
+# Paged variants yielding only the requested fields; see result_stream
+ITER_STRATEGIES = {
+    'keyword': keyword_search_iter,
+    'semantic': semantic_search_iter,
+    'entity': entity_search_iter,
+    'community': community_search_iter,
+    'pagerank': pagerank_search_iter,
+    'node2vec': node2vec_search_iter,
+    'betweenness': betweenness_search_iter,
+    'community_detection': community_detection_search_iter,
+}
+
+# Latency budget per strategy in seconds; a strategy that misses it is left out of the results
+DEFAULT_TIMEOUT = 2.0
+STRATEGY_TIMEOUTS = {name: DEFAULT_TIMEOUT for name in STRATEGIES}
+
+HYBRID_WORKERS = len(STRATEGIES) * 4
+_executor = ThreadPoolExecutor(max_workers=HYBRID_WORKERS, thread_name_prefix='hybrid-search')
+
+def _run_strategy(strategy: str, search, query, memgraph: Memgraph, limit: int):
+    """
+    Run one strategy on a pooled connection of its own, so strategies never
+    share a Bolt session. The connection goes back to the shared pool
+    afterwards, even when the caller stopped waiting.
+    """
+    with shared_pool(memgraph, size=HYBRID_WORKERS).connection() as connection:
+        return search(query, connection, limit)
+
+def run_strategies(query: str, memgraph: Memgraph, limit: int = 10,
+                   timeouts: Optional[Dict[str, float]] = None) -> Tuple[Dict[str, List[Dict]], List[str]]:
+    """
+    Fan a query out to all strategies concurrently.
+    Each strategy gets its own latency budget measured from the start of the
+    call; strategies that time out or fail return no results. Returns the
+    results per strategy and the names of the strategies that were dropped.
+    """
+    timeouts = {**STRATEGY_TIMEOUTS, **(timeouts or {})}
+    start = time.monotonic()
+    futures = {name: _executor.submit(_run_strategy, name, search, query, memgraph, limit)
+               for name, search in STRATEGIES.items()}
+
+    results, dropped = {}, []
+    for name, future in futures.items():
+        remaining = max(0.0, timeouts[name] - (time.monotonic() - start))
+        try:
+            results[name] = future.result(timeout=remaining)
+        except TimeoutError:
+            print(f"Dropping {name} search: exceeded {timeouts[name]:.2f} s budget")
+            count('search_dropped_total', strategy=name, reason='timeout')
+            results[name] = []
+            dropped.append(name)
+        except Exception as e:
+            print(f"Dropping {name} search: {e}")
+            count('search_dropped_total', strategy=name, reason='error')
+            results[name] = []
+            dropped.append(name)
+    return results, dropped
+
+def run_strategies_batch(queries: List[str], memgraph: Memgraph, limit: int = 10) -> Dict[str, List[List[Dict]]]:
+    """
+    Run every batch strategy concurrently over the whole query list.
+    A strategy that fails returns no results for any query.
+    """
+    futures = {name: _executor.submit(_run_strategy, name, search, queries, memgraph, limit)
+               for name, search in BATCH_STRATEGIES.items()}
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            print(f"Dropping {name} search: {e}")
+            count('search_dropped_total', strategy=name, reason='error')
+            results[name] = [[] for _ in queries]
+    return results
+
+@cached('hybrid')
+def hybrid_search(query: str, memgraph: Memgraph, limit: int = 10, parallel: bool = True,
+                  timeouts: Optional[Dict[str, float]] = None, fusion: str = DEFAULT_FUSION,
+                  weights: Optional[Dict[str, float]] = None) -> List[Dict]:
     # Perform individual searches
-    keyword_results = keyword_search(query, memgraph, limit)
-    semantic_results = semantic_search(query, memgraph, limit)
-    entity_results = entity_search(query, memgraph, limit)
-    community_results = community_search(query, memgraph, limit)
-    pagerank_results = pagerank_search(query, memgraph, limit)
-    node2vec_results = node2vec_search(query, memgraph, limit)
-    betweenness_results = betweenness_search(query, memgraph, limit)
-    community_detection_results = community_detection_search(query, memgraph, limit)
-    
-    # Combine and rank results
-    combined_results = {}
-    
-    for result in keyword_results:
-        combined_results[result['chunk_id']] = {'text': result['text'], 'score': result['relevance_score']}
-    
-    for result in semantic_results:
-        if result['entity_id'] in combined_results:
-            combined_results[result['entity_id']]['score'] += result['similarity'] * 2
-        else:
-            combined_results[result['entity_id']] = {'text': result['description'], 'score': result['similarity'] * 2}
-    
-    for result in entity_results:
-        if result['chunk_id'] in combined_results:
-            combined_results[result['chunk_id']]['score'] += result['entity_matches'] * 1.5
-        else:
-            combined_results[result['chunk_id']] = {'text': result['text'], 'score': result['entity_matches'] * 1.5}
-    
-    for result in community_results:
-        if result['community_id'] in combined_results:
-            combined_results[result['community_id']]['score'] += result['rank']
-        else:
-            combined_results[result['community_id']] = {'text': result['summary'], 'score': result['rank']}
-    
-    for result in pagerank_results:
-        if result['entity_id'] in combined_results:
-            combined_results[result['entity_id']]['score'] += result['rank'] * 3
-        else:
-            combined_results[result['entity_id']] = {'text': result['description'], 'score': result['rank'] * 3}
-    
-    for result in node2vec_results:
-        if result['entity_id'] in combined_results:
-            combined_results[result['entity_id']]['score'] += result['similarity'] * 2.5
-        else:
-            combined_results[result['entity_id']] = {'text': result['description'], 'score': result['similarity'] * 2.5}
-    
-    for result in betweenness_results:
-        if result['entity_id'] in combined_results:
-            combined_results[result['entity_id']]['score'] += result['importance'] * 2
-        else:
-            combined_results[result['entity_id']] = {'text': result['description'], 'score': result['importance'] * 2}
-    
-    for result in community_detection_results:
-        for entity in result['entities']:
-            if entity in combined_results:
-                combined_results[entity]['score'] += result['relevance'] * 1.5
-            else:
-                combined_results[entity] = {'text': f"Part of community {result['community']}", 'score': result['relevance'] * 1.5}
-    
-    # Sort and limit results
-    sorted_results = sorted(combined_results.items(), key=lambda x: x[1]['score'], reverse=True)[:limit]
-    
-    return [{'id': item[0], 'text': item[1]['text'], 'score': item[1]['score']} for item in sorted_results]
+    dropped = []
+    if parallel:
+        results, dropped = run_strategies(query, memgraph, limit, timeouts)
+    else:
+        results = {name: search(query, memgraph, limit) for name, search in STRATEGIES.items()}
+    # Normalize each strategy's scores and combine them per (id type, id)
+    with span('search_fusion', fusion=fusion):
+        fused = fuse(results, limit, fusion, weights)
+    # Results missing a strategy are returned but not cached
+    return Partial(fused) if dropped else fused
+
+def hybrid_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10, fusion: str = DEFAULT_FUSION,
+                        weights: Optional[Dict[str, float]] = None) -> List[List[Dict]]:
+    # One statement per strategy for the whole batch, then fuse per query
+    results = run_strategies_batch(queries, memgraph, limit)
+    return [fuse({name: rows[i] for name, rows in results.items()}, limit, fusion, weights)
+            for i in range(len(queries))]
 
 # Usage example:
 # memgraph = Memgraph()
@@ -1,10 +1,31 @@
 from gqlalchemy import Memgraph
-from typing import List, Dict
-import re
+from typing import Dict, Iterator, List, Optional, Sequence
+from batching import group_results, query_params
+from result_cache import cached
+from result_stream import KEYSET, PAGE_SIZE, Cursor, iter_hits, iter_pages, projection
+from text_index import load_text_index, tokenize
 
+# Fields keyword_search_iter can return, and the (id, score) fields pages resume from
+COLUMNS = {'chunk_id': 'c.id', 'text': 'c.text', 'relevance_score': 'score'}
+KEYS = ('chunk_id', 'relevance_score')
+
+@cached('keyword')
 def keyword_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
+    # Rank chunks by BM25 from the text index when load_to_mem.py has built it
+    text_index = load_text_index()
+    if text_index is not None:
+        hits = [{'id': chunk_id, 'score': score} for chunk_id, score in text_index.search('chunks', query, limit)]
+        cypher_query = """
+        UNWIND $hits AS hit
+        MATCH (c:__Chunk__ {id: hit.id})
+        RETURN c.id AS chunk_id, c.text AS text, hit.score AS score
+        ORDER BY score DESC
+        """
+        result = memgraph.execute_and_fetch(cypher_query, {'hits': hits})
+        return [{'chunk_id': row['chunk_id'], 'text': row['text'], 'relevance_score': row['score']} for row in result]
+
     # Preprocess the query
-    keywords = re.findall(r'\w+', query.lower())
+    keywords = tokenize(query)
     
     # Construct the Cypher query
     cypher_query = """
@@ -22,6 +43,67 @@ def keyword_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict
     # Process and return the results
     return [{'chunk_id': row['chunk_id'], 'text': row['text'], 'relevance_score': row['matches']} for row in result]
 
+def keyword_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10) -> List[List[Dict]]:
+    # One round trip for all queries; results come back in query order
+    text_index = load_text_index()
+    if text_index is not None:
+        hits = [[{'id': chunk_id, 'score': score} for chunk_id, score in text_index.search('chunks', query, limit)]
+                for query in queries]
+        cypher_query = """
+        UNWIND $queries AS q
+        UNWIND q.hits AS hit
+        MATCH (c:__Chunk__ {id: hit.id})
+        WITH q, c, hit
+        ORDER BY hit.score DESC
+        RETURN q.idx AS idx, collect({chunk_id: c.id, text: c.text, relevance_score: hit.score}) AS rows
+        """
+        result = memgraph.execute_and_fetch(cypher_query, {'queries': query_params(queries, hits=hits)})
+        return group_results(result, len(queries))
+
+    cypher_query = """
+    UNWIND $queries AS q
+    CALL {
+        WITH q
+        MATCH (c:__Chunk__)
+        WHERE ANY(keyword IN q.keywords WHERE c.text CONTAINS keyword)
+        WITH c, size([keyword IN q.keywords WHERE c.text CONTAINS keyword]) AS matches
+        ORDER BY matches DESC
+        LIMIT $limit
+        RETURN collect({chunk_id: c.id, text: c.text, relevance_score: matches}) AS rows
+    }
+    RETURN q.idx AS idx, rows
+    """
+    keywords = [tokenize(query) for query in queries]
+    result = memgraph.execute_and_fetch(cypher_query, {'queries': query_params(queries, keywords=keywords), 'limit': limit})
+    return group_results(result, len(queries))
+
+def keyword_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                        limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                        after: Optional[Cursor] = None) -> Iterator[Dict]:
+    # Results page by page with only the requested COLUMNS; see result_stream
+    text_index = load_text_index()
+    if text_index is not None:
+        cypher_query = f"""
+        UNWIND $hits AS hit
+        MATCH (c:__Chunk__ {{id: hit.id}})
+        WITH c, hit.score AS score
+        RETURN {projection(COLUMNS, fields, KEYS)}
+        ORDER BY relevance_score DESC, chunk_id
+        """
+        return iter_hits(memgraph, cypher_query, lambda k: text_index.search('chunks', query, k),
+                         KEYS, limit, page_size, after)
+
+    cypher_query = f"""
+    MATCH (c:__Chunk__)
+    WHERE ANY(keyword IN $keywords WHERE c.text CONTAINS keyword)
+    WITH c, size([keyword IN $keywords WHERE c.text CONTAINS keyword]) AS score
+    WHERE {KEYSET.format(score='score', id='c.id')}
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY relevance_score DESC, chunk_id
+    LIMIT $page_size
+    """
+    return iter_pages(memgraph, cypher_query, {'keywords': tokenize(query)}, KEYS, limit, page_size, after)
+
 # Usage example:
 # memgraph = Memgraph()
 # results = keyword_search("artificial intelligence and ethics", memgraph)
@@ -30,3 +112,7 @@ def keyword_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict
 #     print(f"Text: {result['text'][:100]}...")
 #     print(f"Relevance Score: {result['relevance_score']}")
 #     print("---")
+#
+# Streaming ids and scores, fetching text only for the chunks kept:
+# rows = list(keyword_search_iter("artificial intelligence", memgraph, fields=['chunk_id', 'relevance_score'], limit=100))
+# fetch_text(memgraph, 'keyword', rows[:5])
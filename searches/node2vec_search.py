@@ -1,32 +1,166 @@
 from gqlalchemy import Memgraph
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Sequence
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from result_cache import cached
+from batching import group_results, query_params
+from embedding_store import NODE2VEC_STORE_PATH, load_store
+from entity_matcher import load_matcher
+from result_stream import KEYSET, PAGE_SIZE, Cursor, iter_hits, iter_pages, projection
+from semantic_search import semantic_search_batch
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+# Fields node2vec_search_iter can return, and the (id, score) fields pages resume from
+COLUMNS = {'entity_id': 'e.id', 'name': 'e.name', 'description': 'e.description', 'similarity': 'similarity'}
+KEYS = ('entity_id', 'similarity')
 
-def node2vec_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
-    # Encode the query
-    query_embedding = model.encode(query)
-
-    # Run node2vec algorithm
-    node2vec_query = """
-    CALL node2vec.set(128, 10, 1, 1, 'RELATED')
-    YIELD node, embedding
-    SET node.node2vec_embedding = embedding
+# node2vec embeds graph structure, not text, so a query can't be compared
+# with them directly. Each query is mapped to a seed entity instead, and
+# the search returns the entities whose node2vec embeddings are closest to
+# the seed's: those in a similar position in the graph.
+SEED_QUERY = """
+UNWIND $names AS name
+MATCH (e:__Entity__ {name: name})
+RETURN e.name AS name, e.id AS id
+"""
+
+def seed_entities(queries: List[str], memgraph: Memgraph) -> List[Optional[str]]:
+    """
+    The entity id each query starts from: the first loaded entity named in
+    the query, else the entity whose description is semantically closest.
     """
-    memgraph.execute(node2vec_query)
+    matcher = load_matcher(memgraph)
+    names = [next(iter(matcher.find(query)), None) for query in queries]
+    seeds: List[Optional[str]] = [None] * len(queries)
+    if any(names):
+        ids = {row['name']: row['id'] for row in memgraph.execute_and_fetch(
+            SEED_QUERY, {'names': sorted({name for name in names if name})})}
+        seeds = [ids.get(name) for name in names]
+    unseeded = [i for i, seed in enumerate(seeds) if seed is None]
+    if unseeded:
+        nearest = semantic_search_batch([queries[i] for i in unseeded], memgraph, limit=1)
+        for i, rows in zip(unseeded, nearest):
+            seeds[i] = rows[0]['entity_id'] if rows else None
+    return seeds
 
-    # Search for similar entities using node2vec embeddings
+def _seed_vector(store, seed: Optional[str]) -> Optional[np.ndarray]:
+    return store.vector(seed) if seed is not None else None
+
+@cached('node2vec')
+def node2vec_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
+    seed = seed_entities([query], memgraph)[0]
+    if seed is None:
+        return []
+
+    # Scan the embedding store when refresh_analytics keeps the node2vec
+    # embeddings there rather than on the nodes
+    store = load_store(NODE2VEC_STORE_PATH)
+    if store is not None:
+        seed_vector = _seed_vector(store, seed)
+        if seed_vector is None:
+            return []
+        hits = [{'id': entity_id, 'similarity': similarity}
+                for entity_id, similarity in store.search(seed_vector, limit)]
+        search_query = """
+        UNWIND $hits AS hit
+        MATCH (e:__Entity__ {id: hit.id})
+        RETURN e.id AS entity_id, e.name AS name, e.description AS description, hit.similarity AS similarity
+        ORDER BY similarity DESC
+        """
+        result = memgraph.execute_and_fetch(search_query, {'hits': hits})
+        return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'similarity': row['similarity']} for row in result]
+
+    # Search for entities near the seed using the node2vec embeddings
+    # precomputed by graph_analytics.refresh_analytics
     search_query = """
+    MATCH (seed:__Entity__ {id: $seed})
+    WHERE seed.node2vec_embedding IS NOT NULL
     MATCH (e:__Entity__)
     WHERE e.node2vec_embedding IS NOT NULL
-    WITH e, mg.vector.similarity.cosine(e.node2vec_embedding, $query_embedding) AS similarity
+    WITH e, mg.vector.similarity.cosine(e.node2vec_embedding, seed.node2vec_embedding) AS similarity
     ORDER BY similarity DESC
     LIMIT $limit
     RETURN e.id AS entity_id, e.name AS name, e.description AS description, similarity
     """
 
-    result = memgraph.execute_and_fetch(search_query, {'query_embedding': query_embedding.tolist(), 'limit': limit})
+    result = memgraph.execute_and_fetch(search_query, {'seed': seed, 'limit': limit})
+
+    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'similarity': row['similarity']} for row in result]
+
+def node2vec_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10) -> List[List[Dict]]:
+    # One seed lookup for every query
+    seeds = seed_entities(queries, memgraph)
+
+    store = load_store(NODE2VEC_STORE_PATH)
+    if store is not None:
+        seed_vectors = [_seed_vector(store, seed) for seed in seeds]
+        seeded = [i for i, vector in enumerate(seed_vectors) if vector is not None]
+        hits = [[] for _ in queries]
+        if seeded:
+            found = store.search_many(np.stack([seed_vectors[i] for i in seeded]), limit)
+            for i, pairs in zip(seeded, found):
+                hits[i] = [{'id': entity_id, 'similarity': similarity} for entity_id, similarity in pairs]
+        search_query = """
+        UNWIND $queries AS q
+        UNWIND q.hits AS hit
+        MATCH (e:__Entity__ {id: hit.id})
+        WITH q, e, hit
+        ORDER BY hit.similarity DESC
+        RETURN q.idx AS idx, collect({entity_id: e.id, name: e.name, description: e.description, similarity: hit.similarity}) AS rows
+        """
+        result = memgraph.execute_and_fetch(search_query, {'queries': query_params(queries, hits=hits)})
+        return group_results(result, len(queries))
+
+    search_query = """
+    UNWIND $queries AS q
+    CALL {
+        WITH q
+        MATCH (seed:__Entity__ {id: q.seed})
+        WHERE seed.node2vec_embedding IS NOT NULL
+        MATCH (e:__Entity__)
+        WHERE e.node2vec_embedding IS NOT NULL
+        WITH e, mg.vector.similarity.cosine(e.node2vec_embedding, seed.node2vec_embedding) AS similarity
+        ORDER BY similarity DESC
+        LIMIT $limit
+        RETURN collect({entity_id: e.id, name: e.name, description: e.description, similarity: similarity}) AS rows
+    }
+    RETURN q.idx AS idx, rows
+    """
+    params = query_params(queries, seed=seeds)
+    result = memgraph.execute_and_fetch(search_query, {'queries': params, 'limit': limit})
+    return group_results(result, len(queries))
+
+def node2vec_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                         limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                         after: Optional[Cursor] = None) -> Iterator[Dict]:
+    # Results page by page with only the requested COLUMNS; see result_stream
+    seed = seed_entities([query], memgraph)[0]
+    if seed is None:
+        return iter(())
 
-    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'similarity': row['similarity']} for row in result]
\ No newline at end of file
+    store = load_store(NODE2VEC_STORE_PATH)
+    if store is not None:
+        seed_vector = _seed_vector(store, seed)
+        if seed_vector is None:
+            return iter(())
+        search_query = f"""
+        UNWIND $hits AS hit
+        MATCH (e:__Entity__ {{id: hit.id}})
+        WITH e, hit.score AS similarity
+        RETURN {projection(COLUMNS, fields, KEYS)}
+        ORDER BY similarity DESC, entity_id
+        """
+        return iter_hits(memgraph, search_query, lambda k: store.search(seed_vector, k),
+                         KEYS, limit, page_size, after)
+
+    search_query = f"""
+    MATCH (seed:__Entity__ {{id: $seed}})
+    WHERE seed.node2vec_embedding IS NOT NULL
+    MATCH (e:__Entity__)
+    WHERE e.node2vec_embedding IS NOT NULL
+    WITH e, mg.vector.similarity.cosine(e.node2vec_embedding, seed.node2vec_embedding) AS similarity
+    WHERE {KEYSET.format(score='similarity', id='e.id')}
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY similarity DESC, entity_id
+    LIMIT $page_size
+    """
+    params = {'seed': seed}
+    return iter_pages(memgraph, search_query, params, KEYS, limit, page_size, after)
@@ -1,15 +1,36 @@
 from gqlalchemy import Memgraph
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Sequence
+from batching import group_results, query_params
+from result_cache import cached
+from result_stream import KEYSET, MAX_INDEX_HITS, PAGE_SIZE, Cursor, iter_pages, projection
+from text_index import load_text_index
 
+# How many BM25 candidates per requested result are re-ranked by PageRank
+CANDIDATES_PER_RESULT = 20
+
+# Fields pagerank_search_iter can return, and the (id, score) fields pages resume from
+COLUMNS = {'entity_id': 'e.id', 'name': 'e.name', 'description': 'e.description', 'rank': 'rank'}
+KEYS = ('entity_id', 'rank')
+
+@cached('pagerank')
 def pagerank_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
-    # First, run PageRank on the graph
-    pagerank_query = """
-    CALL pagerank.get() YIELD node, rank
-    SET node.pagerank = rank
-    """
-    memgraph.execute(pagerank_query)
-    
-    # Now, search for entities related to the query, ordered by PageRank
+    # Take the best text matches from the text index and order them by PageRank
+    text_index = load_text_index()
+    if text_index is not None:
+        candidates = [entity_id for entity_id, _ in
+                      text_index.search('entities', query, limit * CANDIDATES_PER_RESULT)]
+        search_query = """
+        UNWIND $candidates AS entity_id
+        MATCH (e:__Entity__ {id: entity_id})
+        RETURN e.id AS entity_id, e.name AS name, e.description AS description, e.pagerank AS rank
+        ORDER BY e.pagerank DESC
+        LIMIT $limit
+        """
+        result = memgraph.execute_and_fetch(search_query, {'candidates': candidates, 'limit': limit})
+        return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'rank': row['rank']} for row in result]
+
+    # Search for entities related to the query, ordered by the PageRank
+    # precomputed by graph_analytics.refresh_analytics
     search_query = """
     MATCH (e:__Entity__)
     WHERE e.name CONTAINS $query OR e.description CONTAINS $query
@@ -20,4 +41,73 @@ def pagerank_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dic
     
     result = memgraph.execute_and_fetch(search_query, {'query': query.lower(), 'limit': limit})
     
-    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'rank': row['rank']} for row in result]
\ No newline at end of file
+    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'rank': row['rank']} for row in result]
+
+def pagerank_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10) -> List[List[Dict]]:
+    # One round trip for all queries; results come back in query order
+    text_index = load_text_index()
+    if text_index is not None:
+        candidates = [[entity_id for entity_id, _ in
+                       text_index.search('entities', query, limit * CANDIDATES_PER_RESULT)]
+                      for query in queries]
+        search_query = """
+        UNWIND $queries AS q
+        CALL {
+            WITH q
+            UNWIND q.candidates AS entity_id
+            MATCH (e:__Entity__ {id: entity_id})
+            WITH e
+            ORDER BY e.pagerank DESC
+            LIMIT $limit
+            RETURN collect({entity_id: e.id, name: e.name, description: e.description, rank: e.pagerank}) AS rows
+        }
+        RETURN q.idx AS idx, rows
+        """
+        params = query_params(queries, candidates=candidates)
+    else:
+        search_query = """
+        UNWIND $queries AS q
+        CALL {
+            WITH q
+            MATCH (e:__Entity__)
+            WHERE e.name CONTAINS q.query OR e.description CONTAINS q.query
+            WITH e
+            ORDER BY e.pagerank DESC
+            LIMIT $limit
+            RETURN collect({entity_id: e.id, name: e.name, description: e.description, rank: e.pagerank}) AS rows
+        }
+        RETURN q.idx AS idx, rows
+        """
+        params = query_params(queries, query=[query.lower() for query in queries])
+
+    result = memgraph.execute_and_fetch(search_query, {'queries': params, 'limit': limit})
+    return group_results(result, len(queries))
+
+def pagerank_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                         limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+                         after: Optional[Cursor] = None) -> Iterator[Dict]:
+    # Results page by page with only the requested COLUMNS; see result_stream
+    text_index = load_text_index()
+    if text_index is not None:
+        depth = limit * CANDIDATES_PER_RESULT if limit else MAX_INDEX_HITS
+        params = {'candidates': [entity_id for entity_id, _ in text_index.search('entities', query, depth)]}
+        match = """
+        UNWIND $candidates AS entity_id
+        MATCH (e:__Entity__ {id: entity_id})
+        """
+    else:
+        params = {'query': query.lower()}
+        match = """
+        MATCH (e:__Entity__)
+        WHERE e.name CONTAINS $query OR e.description CONTAINS $query
+        """
+
+    search_query = f"""
+    {match}
+    WITH e, coalesce(e.pagerank, 0.0) AS rank
+    WHERE {KEYSET.format(score='rank', id='e.id')}
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY rank DESC, entity_id
+    LIMIT $page_size
+    """
+    return iter_pages(memgraph, search_query, params, KEYS, limit, page_size, after)
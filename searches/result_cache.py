@@ -0,0 +1,134 @@
+import functools
+import inspect
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import Dict
+from gqlalchemy import Memgraph
+from graph_version import get_graph_version
+from telemetry import observe
+
+CACHE_SIZE = 4096
+TTL_SECONDS = 300
+# How long a graph version read is trusted before asking Memgraph again
+VERSION_CHECK_SECONDS = 1.0
+
+def normalize_query(query: str) -> str:
+    return ' '.join(query.lower().split())
+
+def server_of(memgraph: Memgraph) -> tuple:
+    return (memgraph._host, memgraph._port)
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of search results with a TTL.
+    Every entry remembers the graph version it was computed for and is
+    dropped once load_to_mem.py bumps the version.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE, ttl: float = TTL_SECONDS):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.stats = defaultdict(Counter)
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def graph_version(self, memgraph: Memgraph) -> int:
+        server = server_of(memgraph)
+        now = time.monotonic()
+        with self.lock:
+            checked = self.versions.get(server)
+        if checked is None or now - checked[0] > VERSION_CHECK_SECONDS:
+            # Read outside the lock, so lookups don't wait on a Memgraph round trip
+            checked = (now, get_graph_version(memgraph))
+            with self.lock:
+                self.versions[server] = checked
+        return checked[1]
+
+    def get(self, strategy: str, key: tuple, version: int):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats[strategy]['misses'] += 1
+                return None
+            stored_at, stored_version, value = entry
+            if stored_version != version or time.monotonic() - stored_at > self.ttl:
+                del self.entries[key]
+                self.stats[strategy]['invalidations' if stored_version != version else 'expirations'] += 1
+                self.stats[strategy]['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats[strategy]['hits'] += 1
+            return value
+
+    def put(self, strategy: str, key: tuple, version: int, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), version, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                evicted, _ = self.entries.popitem(last=False)
+                self.stats[evicted[0]]['evictions'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.versions.clear()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Hit/miss counters per strategy, with the hit rate.
+        """
+        with self.lock:
+            metrics = {}
+            for strategy, counts in self.stats.items():
+                lookups = counts['hits'] + counts['misses']
+                metrics[strategy] = {**counts, 'hit_rate': counts['hits'] / lookups if lookups else 0.0}
+            return metrics
+
+cache = ResultCache()
+
+class Partial(list):
+    """
+    Results a search returned without some of its inputs, e.g. a hybrid
+    search that dropped a strategy. They go back to the caller but are not
+    cached, so the next call can get the complete results.
+    """
+
+def cached(strategy: str):
+    """
+    Cache a search function of the form f(query, memgraph, limit, **options)
+    under (strategy, server, normalized query, limit and options). Arguments
+    are bound to the function's signature with its defaults applied, so a
+    call passes options positionally or by name and gets the same entry.
+    Partial results are not cached.
+    """
+    def decorator(search):
+        signature = inspect.signature(search)
+        query_name, memgraph_name = list(signature.parameters)[:2]
+
+        @functools.wraps(search)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            options = dict(bound.arguments)
+            query, memgraph = options.pop(query_name), options.pop(memgraph_name)
+            key = (strategy, server_of(memgraph), normalize_query(query), repr(sorted(options.items())))
+            version = cache.graph_version(memgraph)
+            results = cache.get(strategy, key, version)
+            hit = results is not None
+            if not hit:
+                results = search(*bound.args, **bound.kwargs)
+                if not isinstance(results, Partial):
+                    cache.put(strategy, key, version, results)
+            observe('search_latency_seconds', time.perf_counter() - start,
+                    strategy=strategy, cache='hit' if hit else 'miss')
+            # Callers get their own dicts so they can't modify cached results
+            return [dict(row) for row in results]
+        wrapper.uncached = search
+        return wrapper
+    return decorator
+
+def cache_metrics() -> Dict[str, Dict[str, float]]:
+    return cache.metrics()
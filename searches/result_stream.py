@@ -0,0 +1,134 @@
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from gqlalchemy import Memgraph
+from score_fusion import STRATEGY_FIELDS
+
+# Paged, projected search results. The *_search_iter variants yield rows
+# one page at a time and only return the fields the caller asks for, so a
+# caller that wants ids and scores never receives the chunk text or entity
+# descriptions. Pages are keyset paginated on (score, id): each page asks
+# for the rows ranked after the last row seen, so the cost of a page does
+# not grow with how deep the caller has read and a Cursor taken from any
+# row resumes the iteration later. Text left out of the projection can be
+# fetched afterwards for just the rows that were used, with fetch_text.
+
+PAGE_SIZE = 100
+# How many text index candidates an iterator without a limit reranks
+MAX_INDEX_HITS = 1000
+
+# Cypher predicate selecting the rows after $after in (score DESC, id ASC) order
+KEYSET = "($after IS NULL OR {score} < $after.score OR ({score} = $after.score AND {id} > $after.id))"
+
+# How to look up the text of rows later: (match on $ids, id expression, text fields)
+TEXT_LOOKUPS = {
+    'chunk': ("MATCH (n:__Chunk__) WHERE n.id IN $ids", 'n.id', {'text': 'n.text'}),
+    'entity': ("MATCH (n:__Entity__) WHERE n.id IN $ids", 'n.id',
+               {'name': 'n.name', 'description': 'n.description'}),
+    'community': ("MATCH (n:__Community__) WHERE n.community IN $ids", 'n.community',
+                  {'title': 'n.title', 'summary': 'n.summary'}),
+}
+
+class Cursor(NamedTuple):
+    score: float
+    id: object
+
+def cursor(row: Dict, keys: Tuple[str, str]) -> Cursor:
+    """
+    Where to resume after row; keys are the (id field, score field) of the search.
+    """
+    id_field, score_field = keys
+    return Cursor(row[score_field], row[id_field])
+
+def projection(columns: Dict[str, str], fields: Optional[Sequence[str]], keys: Tuple[str, str]) -> str:
+    """
+    The RETURN list for the requested fields, all columns when fields is None.
+    The id and score fields are always returned, since pages resume from them.
+    """
+    names = list(columns) if fields is None else [*keys, *(field for field in fields if field not in keys)]
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}, expected some of {list(columns)}")
+    return ', '.join(f"{columns[name]} AS {name}" for name in names)
+
+def iter_pages(memgraph: Memgraph, statement: str, params: Dict, keys: Tuple[str, str],
+               limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+               after: Optional[Cursor] = None) -> Iterator[Dict]:
+    """
+    Rows of a statement that takes $after and $page_size, filters with
+    KEYSET and orders by (score DESC, id), fetching one page at a time.
+    """
+    returned = 0
+    while limit is None or returned < limit:
+        size = page_size if limit is None else min(page_size, limit - returned)
+        page_params = {**params, 'after': after._asdict() if after else None, 'page_size': size}
+        # Read the whole page before yielding, so the connection is free
+        # for other statements while the caller works through it
+        page = [dict(row) for row in memgraph.execute_and_fetch(statement, page_params)]
+        yield from page
+        returned += len(page)
+        if len(page) < size:
+            return
+        after = cursor(page[-1], keys)
+
+def _ranked_after(hit: Tuple[str, float], after: Optional[Tuple[float, str]]) -> bool:
+    hit_id, score = hit
+    return after is None or score < after[0] or (score == after[0] and hit_id > after[1])
+
+def iter_hits(memgraph: Memgraph, statement: str, search: Callable[[int], List[Tuple[str, float]]],
+              keys: Tuple[str, str], limit: Optional[int] = None, page_size: int = PAGE_SIZE,
+              after: Optional[Cursor] = None,
+              hit_fields: Optional[Callable[[str], Dict]] = None) -> Iterator[Dict]:
+    """
+    Rows for the (id, score) hits search(k) returns from a text or vector
+    index, looked up page by page with a statement taking $hits as
+    [{id, score}] and ordering by (score DESC, id). Hits are taken in
+    (score DESC, id) order strictly after the cursor, then after the last
+    hit looked up, and k doubles whenever they run out, until the index has
+    no more. hit_fields adds fields of its own to each hit, given the hit's id.
+    """
+    # Index ids are strings, whatever type the graph stores them as
+    last = (after.score, str(after.id)) if after is not None else None
+    # One hit past the limit, so a full first search rarely needs a second
+    k = (limit or page_size) + 1
+    returned = 0
+    while True:
+        found = search(k)
+        complete = len(found) < k
+        # A full result may have cut the hits tied with its lowest score
+        # anywhere, so only the hits scored above it are certainly all there are
+        floor = None if complete else min(score for _, score in found)
+        hits = sorted((hit for hit in found if (floor is None or hit[1] > floor) and _ranked_after(hit, last)),
+                      key=lambda hit: (-hit[1], hit[0]))
+        for start in range(0, len(hits), page_size):
+            if limit is not None and returned >= limit:
+                return
+            page_hits = hits[start:start + page_size]
+            params = [{'id': hit_id, 'score': score, **(hit_fields(hit_id) if hit_fields else {})}
+                      for hit_id, score in page_hits]
+            page = [dict(row) for row in memgraph.execute_and_fetch(statement, {'hits': params})]
+            if limit is not None:
+                page = page[:limit - returned]
+            yield from page
+            returned += len(page)
+            last = (page_hits[-1][1], page_hits[-1][0])
+        if complete or (limit is not None and returned >= limit):
+            return
+        k *= 2
+
+def fetch_text(memgraph: Memgraph, strategy: str, rows: List[Dict],
+               fields: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Add the text fields (all of them when fields is None) to rows a search
+    returned without them, in one round trip. Updates and returns rows.
+    """
+    if strategy not in STRATEGY_FIELDS:
+        # Louvain communities have no text of their own; see community_members_iter
+        raise ValueError(f"{strategy} results have no text to fetch, expected one of {list(STRATEGY_FIELDS)}")
+    id_type, id_field = STRATEGY_FIELDS[strategy][:2]
+    match, id_expression, columns = TEXT_LOOKUPS[id_type]
+    names = list(columns) if fields is None else list(fields)
+    statement = f"{match} RETURN {id_expression} AS id, " + ', '.join(f"{columns[name]} AS {name}" for name in names)
+    texts = {row['id']: row for row in memgraph.execute_and_fetch(statement, {'ids': [row[id_field] for row in rows]})}
+    for row in rows:
+        text = texts.get(row[id_field], {})
+        row.update({name: text.get(name) for name in names})
+    return rows
@@ -0,0 +1,195 @@
+import heapq
+from operator import itemgetter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+
+# Fusion of the per-strategy result lists into one ranking. Each strategy's
+# rows become parallel id/score/text arrays tagged with an id type. Scores
+# are normalized per strategy so betweenness values can't swamp cosine
+# similarities, weighted, and summed per (id type, id) with np.bincount
+# over integer id codes. Below ARRAY_MERGE_MIN candidates the fixed cost
+# of those array calls outweighs the per-row work, and a dict sums them.
+
+# How to read each strategy's rows: (id type, id field, text field, score field)
+STRATEGY_FIELDS = {
+    'keyword': ('chunk', 'chunk_id', 'text', 'relevance_score'),
+    'semantic': ('entity', 'entity_id', 'description', 'similarity'),
+    'entity': ('chunk', 'chunk_id', 'text', 'entity_matches'),
+    'community': ('community', 'community_id', 'summary', 'rank'),
+    'pagerank': ('entity', 'entity_id', 'description', 'rank'),
+    'node2vec': ('entity', 'entity_id', 'description', 'similarity'),
+    'betweenness': ('entity', 'entity_id', 'description', 'importance'),
+}
+
+# Relative trust in each strategy, applied after normalization
+DEFAULT_WEIGHTS = {
+    'keyword': 1.0,
+    'semantic': 2.0,
+    'entity': 1.5,
+    'community': 1.0,
+    'pagerank': 3.0,
+    'node2vec': 2.5,
+    'betweenness': 2.0,
+    'community_detection': 1.5,
+}
+DEFAULT_FUSION = 'rrf'
+# Candidates over all strategies from which the bincount merge beats a
+# dict; measured with benchmarks/score_fusion.py
+ARRAY_MERGE_MIN = 800
+RRF_K = 60
+
+class Candidates(NamedTuple):
+    id_type: str
+    ids: list
+    scores: np.ndarray
+    texts: list
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    # Ties share the best rank, so equally scored rows get equal credit
+    # ndarray methods skip the np.* dispatch, which dominates on short result lists
+    order = (-scores).argsort(kind='stable')
+    sorted_scores = scores[order]
+    first = np.empty(len(scores), dtype=bool)
+    first[:1] = True
+    np.not_equal(sorted_scores[1:], sorted_scores[:-1], out=first[1:])
+    ranks = np.empty(len(scores))
+    ranks[order] = first.nonzero()[0][first.cumsum() - 1]
+    return ranks
+
+def reciprocal_rank(scores: np.ndarray) -> np.ndarray:
+    return 1.0 / (RRF_K + 1 + _ranks(scores))
+
+def min_max(scores: np.ndarray) -> np.ndarray:
+    low, high = scores.min(), scores.max()
+    if high == low:
+        return np.ones_like(scores)
+    return (scores - low) / (high - low)
+
+def z_score(scores: np.ndarray) -> np.ndarray:
+    std = scores.std()
+    if std == 0:
+        return np.zeros_like(scores)
+    return (scores - scores.mean()) / std
+
+def raw(scores: np.ndarray) -> np.ndarray:
+    return scores
+
+NORMALIZERS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'rrf': reciprocal_rank,
+    'minmax': min_max,
+    'zscore': z_score,
+    'raw': raw,
+}
+
+def register_normalizer(name: str, normalize: Callable[[np.ndarray], np.ndarray]):
+    """
+    Make normalize(scores) -> scores available as hybrid_search(fusion=name).
+    """
+    NORMALIZERS[name] = normalize
+
+def _community_detection_candidates(rows: List[Dict], name_to_id: Dict[str, str]) -> List[Candidates]:
+    # Communities expand to their member entities, which are only known by
+    # name; names another strategy returned are merged with that entity
+    members = {'entity': ([], [], []), 'entity_name': ([], [], [])}
+    for row in rows:
+        text = f"Part of community {row['community']}"
+        for name in row['entities']:
+            entity_id = name_to_id.get(name)
+            ids, scores, texts = members['entity_name' if entity_id is None else 'entity']
+            ids.append(name if entity_id is None else entity_id)
+            scores.append(row['relevance'])
+            texts.append(text)
+    return [Candidates(id_type, ids, np.array(scores, dtype=float), texts)
+            for id_type, (ids, scores, texts) in members.items() if ids]
+
+def to_candidates(strategy: str, rows: List[Dict], name_to_id: Optional[Dict[str, str]] = None) -> List[Candidates]:
+    if strategy == 'community_detection':
+        return _community_detection_candidates(rows, name_to_id or {})
+    id_type, id_field, text_field, score_field = STRATEGY_FIELDS[strategy]
+    # map over itemgetter walks the rows in C
+    scores = np.array(list(map(itemgetter(score_field), rows)), dtype=float)
+    if np.isnan(scores).any():
+        # Rows without a score count as 0
+        scores = np.nan_to_num(scores, nan=0.0)
+    return [Candidates(
+        id_type,
+        list(map(itemgetter(id_field), rows)),
+        scores,
+        list(map(itemgetter(text_field), rows)),
+    )]
+
+def _merge(parts: List[Candidates]) -> Tuple[list, list, np.ndarray]:
+    """
+    Sum the scores of parts sharing one id type: (ids, texts, totals) with
+    the text of each id's first occurrence.
+    """
+    ids = [key for part in parts for key in part.ids]
+    texts = [text for part in parts for text in part.texts]
+    positions = {}
+    codes = np.fromiter((positions.setdefault(key, len(positions)) for key in ids), dtype=np.int64, count=len(ids))
+    _, first = np.unique(codes, return_index=True)
+    totals = np.bincount(codes, weights=np.concatenate([part.scores for part in parts]), minlength=len(positions))
+    return list(positions), [texts[i] for i in first], totals
+
+def _merge_small(by_type: Dict[str, List[Candidates]], limit: int) -> List[Dict]:
+    """
+    fuse's merge and top-k with one dict over (id type, id), for inputs too
+    small to amortize the array calls.
+    """
+    combined = {}
+    for id_type, parts in by_type.items():
+        for part in parts:
+            for key, score, text in zip(part.ids, part.scores.tolist(), part.texts):
+                entry = combined.get((id_type, key))
+                if entry is None:
+                    combined[(id_type, key)] = [score, text]
+                else:
+                    entry[0] += score
+    top = heapq.nlargest(limit, combined.items(), key=lambda item: item[1][0])
+    return [{'id': key, 'type': id_type, 'text': text, 'score': score} for (id_type, key), (score, text) in top]
+
+def fuse(results: Dict[str, List[Dict]], limit: int = 10, fusion: str = DEFAULT_FUSION,
+         weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    Merge per-strategy results into the top `limit` items by fused score.
+    Items are keyed by (id type, id), so a chunk and an entity never merge
+    just because their ids look alike.
+    """
+    normalize = NORMALIZERS[fusion]
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    name_to_id = {}
+    if results.get('community_detection'):
+        name_to_id = {row['name']: row['entity_id'] for strategy, rows in results.items()
+                      if STRATEGY_FIELDS.get(strategy, ('',))[0] == 'entity' for row in rows if row.get('name')}
+
+    by_type = {}
+    for strategy, rows in results.items():
+        if not rows or not weights.get(strategy):
+            continue
+        parts = to_candidates(strategy, rows, name_to_id)
+        if not parts:
+            continue
+        # Normalize over the whole strategy, even when its rows span id types
+        scores = normalize(np.concatenate([part.scores for part in parts])) * weights[strategy]
+        offset = 0
+        for part in parts:
+            by_type.setdefault(part.id_type, []).append(part._replace(scores=scores[offset:offset + len(part.ids)]))
+            offset += len(part.ids)
+    if not by_type:
+        return []
+    if sum(len(part.ids) for parts in by_type.values() for part in parts) < ARRAY_MERGE_MIN:
+        return _merge_small(by_type, limit)
+
+    id_types, ids, texts, totals = [], [], [], []
+    for id_type, parts in by_type.items():
+        type_ids, type_texts, type_totals = _merge(parts)
+        id_types.extend([id_type] * len(type_ids))
+        ids.extend(type_ids)
+        texts.extend(type_texts)
+        totals.append(type_totals)
+    totals = np.concatenate(totals)
+
+    k = min(limit, len(totals))
+    top = np.argpartition(-totals, k - 1)[:k]
+    top = top[np.argsort(-totals[top], kind='stable')]
+    return [{'id': ids[i], 'type': id_types[i], 'text': texts[i], 'score': float(totals[i])} for i in top]
@@ -1,13 +1,53 @@
+import os
 from gqlalchemy import Memgraph
-from typing import List, Dict
-import numpy as np
-from sentence_transformers import SentenceTransformer
+from typing import Dict, Iterator, List, Optional, Sequence
+from result_cache import cached
+from batching import group_results, query_params
+from result_stream import KEYSET, PAGE_SIZE, Cursor, iter_hits, iter_pages, projection
+from embedding_model import encode_queries, encode_query
+from embedding_store import DESCRIPTION_STORE_PATH, load_store
+from vector_index import DEFAULT_NPROBE, load_index
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+# Built by load_to_mem.py from create_final_entities.parquet; without it the search scans every entity
+VECTOR_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'vector_index')
 
-def semantic_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dict]:
+# Fields semantic_search_iter can return, and the (id, score) fields pages resume from
+COLUMNS = {'entity_id': 'e.id', 'name': 'e.name', 'description': 'e.description', 'similarity': 'similarity'}
+KEYS = ('entity_id', 'similarity')
+
+def nearest_entities(query_embeddings, k: int, nprobe: Optional[int]):
+    """
+    (entity id, similarity) pairs per query embedding from the approximate
+    index when one is built and nprobe is set, else from an exact scan of
+    the embedding store. None when neither exists and Memgraph has to scan
+    the nodes.
+    """
+    index = load_index(VECTOR_INDEX_PATH) if nprobe is not None else None
+    if index is not None:
+        return [index.search(embedding, k, nprobe) for embedding in query_embeddings]
+    store = load_store(DESCRIPTION_STORE_PATH)
+    if store is not None:
+        return store.search_many(query_embeddings, k)
+    return None
+
+@cached('semantic')
+def semantic_search(query: str, memgraph: Memgraph, limit: int = 10,
+                    nprobe: Optional[int] = DEFAULT_NPROBE) -> List[Dict]:
     # Encode the query
-    query_embedding = model.encode(query)
+    query_embedding = encode_query(query)
+
+    # Use the approximate index when one is built; nprobe=None forces an exact scan
+    nearest = nearest_entities([query_embedding], limit, nprobe)
+    if nearest is not None:
+        hits = [{'id': entity_id, 'similarity': similarity} for entity_id, similarity in nearest[0]]
+        cypher_query = """
+        UNWIND $hits AS hit
+        MATCH (e:__Entity__ {id: hit.id})
+        RETURN e.id AS entity_id, e.name AS name, e.description AS description, hit.similarity AS similarity
+        ORDER BY similarity DESC
+        """
+        result = memgraph.execute_and_fetch(cypher_query, {'hits': hits})
+        return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'similarity': row['similarity']} for row in result]
     
     # Construct the Cypher query using Memgraph's vector similarity function
     cypher_query = """
@@ -23,4 +63,71 @@ def semantic_search(query: str, memgraph: Memgraph, limit: int = 10) -> List[Dic
     result = memgraph.execute_and_fetch(cypher_query, {'query_embedding': query_embedding.tolist(), 'limit': limit})
     
     # Process and return the results
-    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'similarity': row['similarity']} for row in result]
\ No newline at end of file
+    return [{'entity_id': row['entity_id'], 'name': row['name'], 'description': row['description'], 'similarity': row['similarity']} for row in result]
+
+def semantic_search_batch(queries: List[str], memgraph: Memgraph, limit: int = 10,
+                          nprobe: Optional[int] = DEFAULT_NPROBE) -> List[List[Dict]]:
+    # Encode every query in a single model call
+    query_embeddings = encode_queries(queries)
+
+    nearest = nearest_entities(query_embeddings, limit, nprobe)
+    if nearest is not None:
+        hits = [[{'id': entity_id, 'similarity': similarity} for entity_id, similarity in found]
+                for found in nearest]
+        cypher_query = """
+        UNWIND $queries AS q
+        UNWIND q.hits AS hit
+        MATCH (e:__Entity__ {id: hit.id})
+        WITH q, e, hit
+        ORDER BY hit.similarity DESC
+        RETURN q.idx AS idx, collect({entity_id: e.id, name: e.name, description: e.description, similarity: hit.similarity}) AS rows
+        """
+        result = memgraph.execute_and_fetch(cypher_query, {'queries': query_params(queries, hits=hits)})
+        return group_results(result, len(queries))
+
+    cypher_query = """
+    UNWIND $queries AS q
+    CALL {
+        WITH q
+        MATCH (e:__Entity__)
+        WHERE e.description_embedding IS NOT NULL
+        WITH e, mg.vector.similarity.cosine(e.description_embedding, q.embedding) AS similarity
+        ORDER BY similarity DESC
+        LIMIT $limit
+        RETURN collect({entity_id: e.id, name: e.name, description: e.description, similarity: similarity}) AS rows
+    }
+    RETURN q.idx AS idx, rows
+    """
+    params = query_params(queries, embedding=query_embeddings.tolist())
+    result = memgraph.execute_and_fetch(cypher_query, {'queries': params, 'limit': limit})
+    return group_results(result, len(queries))
+
+def semantic_search_iter(query: str, memgraph: Memgraph, fields: Optional[Sequence[str]] = None,
+                         limit: Optional[int] = None, page_size: int = PAGE_SIZE, after: Optional[Cursor] = None,
+                         nprobe: Optional[int] = DEFAULT_NPROBE) -> Iterator[Dict]:
+    # Results page by page with only the requested COLUMNS; see result_stream
+    query_embedding = encode_query(query)
+
+    if (nprobe is not None and load_index(VECTOR_INDEX_PATH) is not None) \
+            or load_store(DESCRIPTION_STORE_PATH) is not None:
+        cypher_query = f"""
+        UNWIND $hits AS hit
+        MATCH (e:__Entity__ {{id: hit.id}})
+        WITH e, hit.score AS similarity
+        RETURN {projection(COLUMNS, fields, KEYS)}
+        ORDER BY similarity DESC, entity_id
+        """
+        return iter_hits(memgraph, cypher_query, lambda k: nearest_entities([query_embedding], k, nprobe)[0],
+                         KEYS, limit, page_size, after)
+
+    cypher_query = f"""
+    MATCH (e:__Entity__)
+    WHERE e.description_embedding IS NOT NULL
+    WITH e, mg.vector.similarity.cosine(e.description_embedding, $query_embedding) AS similarity
+    WHERE {KEYSET.format(score='similarity', id='e.id')}
+    RETURN {projection(COLUMNS, fields, KEYS)}
+    ORDER BY similarity DESC, entity_id
+    LIMIT $page_size
+    """
+    params = {'query_embedding': query_embedding.tolist()}
+    return iter_pages(memgraph, cypher_query, params, KEYS, limit, page_size, after)
@@ -0,0 +1,174 @@
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Tuple
+
+# In-process metrics shared by load_to_mem.py and the searches: counters,
+# latency histograms and timing spans. Recording is a dict update under one
+# lock, cheap enough to leave on; set GRAPHRAG_METRICS=0 to turn it off.
+# Metrics export as Prometheus text (serve_metrics) or JSON (write_json).
+ENABLED = os.environ.get("GRAPHRAG_METRICS", "1") != "0"
+# Upper bounds in seconds, from sub-millisecond cache hits to multi-second imports
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RECENT_SPANS = 1000
+
+def _key(name: str, labels: Dict[str, object]) -> Tuple[str, tuple]:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """
+    Thread-safe registry of counters, histograms and the most recent spans.
+    """
+
+    def __init__(self):
+        self.counters: Dict[tuple, float] = {}
+        self.histograms: Dict[tuple, Histogram] = {}
+        self.spans = deque(maxlen=RECENT_SPANS)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def count(self, name: str, value: float = 1, **labels):
+        if not ENABLED:
+            return
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not ENABLED:
+            return
+        key = _key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **labels) -> Iterator[None]:
+        """
+        Time a block into the `<name>_seconds` histogram and the recent-span log.
+        Spans opened inside the block on the same thread record it as parent.
+        """
+        if not ENABLED:
+            yield
+            return
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            self.observe(f"{name}_seconds", elapsed, **labels)
+            self.spans.append({'name': name, 'parent': parent, 'labels': labels,
+                               'start': time.time() - elapsed, 'seconds': elapsed})
+
+    def timed(self, name: str, **labels):
+        """
+        Decorator recording every call of a function as a span.
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                             for (name, labels), value in self.counters.items()],
+                'histograms': [{'name': name, 'labels': dict(labels), 'buckets': list(histogram.buckets),
+                                'counts': list(histogram.counts), 'sum': histogram.sum, 'count': histogram.count}
+                               for (name, labels), histogram in self.histograms.items()],
+                'spans': list(self.spans),
+            }
+
+    def prometheus_text(self) -> str:
+        def render(name, labels, extra=()):
+            pairs = [*labels, *extra]
+            if not pairs:
+                return name
+            return name + '{' + ','.join(f'{label}="{_escape(value)}"' for label, value in pairs) + '}'
+
+        lines = []
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                lines.append(f"{render(name, labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{render(name + '_bucket', labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{render(name + '_sum', labels)} {histogram.sum}")
+                lines.append(f"{render(name + '_count', labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.spans.clear()
+
+metrics = Metrics()
+count = metrics.count
+observe = metrics.observe
+span = metrics.span
+timed = metrics.timed
+
+def write_json(path: str):
+    """
+    Write the current metrics and recent spans to a JSON file, atomically.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(metrics.snapshot(), f, indent=2, default=str)
+    os.replace(f"{path}.tmp", path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = metrics.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def serve_metrics(port: int = 9464, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Serve Prometheus text on http://host:port/metrics from a daemon thread.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
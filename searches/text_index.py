@@ -0,0 +1,136 @@
+import os
+import re
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple
+from telemetry import span
+
+# On-disk inverted index over the text the searches match against, backed by
+# SQLite FTS5. Each collection is one FTS5 table ranked with BM25; a side
+# table maps GraphRAG ids to FTS rowids so single documents can be replaced
+# or deleted when load_to_mem.py reloads changed rows.
+TEXT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'text_index.sqlite')
+
+COLLECTIONS = {
+    'chunks': ['text'],
+    'entities': ['name', 'description'],
+    'communities': ['title', 'summary'],
+}
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r'\w+', text.lower())
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression matching any query token; None for an empty query.
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return None
+    return ' OR '.join(f'"{token}"' for token in tokens)
+
+class TextIndex:
+    """
+    BM25 full-text index with one connection per thread.
+    """
+
+    def __init__(self, path: str = TEXT_INDEX_PATH):
+        self.path = path
+        self.local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            self.local.connection = connection
+        return connection
+
+    def create(self):
+        with self.connection:
+            for collection, fields in COLLECTIONS.items():
+                self.connection.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {collection}_fts
+                USING fts5({', '.join(fields)}, tokenize = 'unicode61')
+                """)
+                self.connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {collection}_docs (
+                    doc_id TEXT PRIMARY KEY,
+                    fts_rowid INTEGER NOT NULL
+                )
+                """)
+
+    def clear(self, collection: str):
+        with self.connection:
+            self.connection.execute(f"DELETE FROM {collection}_fts")
+            self.connection.execute(f"DELETE FROM {collection}_docs")
+
+    def upsert(self, collection: str, documents: Iterable[Tuple[str, Sequence[Optional[str]]]]) -> int:
+        """
+        Add or replace documents given as (id, field values) in COLLECTIONS order.
+        """
+        count = 0
+        with self.connection:
+            for doc_id, values in documents:
+                doc_id = str(doc_id)
+                row = self.connection.execute(
+                    f"SELECT fts_rowid FROM {collection}_docs WHERE doc_id = ?", (doc_id,)).fetchone()
+                if row is not None:
+                    self.connection.execute(f"DELETE FROM {collection}_fts WHERE rowid = ?", row)
+                fields = COLLECTIONS[collection]
+                cursor = self.connection.execute(
+                    f"INSERT INTO {collection}_fts ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})",
+                    [value or '' for value in values])
+                self.connection.execute(
+                    f"INSERT OR REPLACE INTO {collection}_docs (doc_id, fts_rowid) VALUES (?, ?)",
+                    (doc_id, cursor.lastrowid))
+                count += 1
+        return count
+
+    def delete(self, collection: str, doc_ids: Iterable[str]) -> int:
+        count = 0
+        with self.connection:
+            for doc_id in doc_ids:
+                row = self.connection.execute(
+                    f"SELECT fts_rowid FROM {collection}_docs WHERE doc_id = ?", (str(doc_id),)).fetchone()
+                if row is None:
+                    continue
+                self.connection.execute(f"DELETE FROM {collection}_fts WHERE rowid = ?", row)
+                self.connection.execute(f"DELETE FROM {collection}_docs WHERE doc_id = ?", (str(doc_id),))
+                count += 1
+        return count
+
+    def search(self, collection: str, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top documents by BM25 as (id, score), higher scores first.
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return []
+        with span('search_text_index', collection=collection):
+            rows = self.connection.execute(f"""
+            SELECT d.doc_id, -bm25({collection}_fts) AS score
+            FROM {collection}_fts
+            JOIN {collection}_docs d ON d.fts_rowid = {collection}_fts.rowid
+            WHERE {collection}_fts MATCH ?
+            ORDER BY score DESC
+            LIMIT ?
+            """, (expression, limit))
+            return [(doc_id, score) for doc_id, score in rows]
+
+_index = None
+_index_lock = threading.Lock()
+
+def load_text_index(path: Optional[str] = None) -> Optional[TextIndex]:
+    """
+    The shared index, or None if load_to_mem.py hasn't built one yet.
+    Defaults to TEXT_INDEX_PATH as set at call time.
+    """
+    global _index
+    path = path or TEXT_INDEX_PATH
+    if not os.path.exists(path):
+        return None
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = TextIndex(path)
+        return _index
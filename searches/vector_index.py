@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+import pyarrow.parquet as pq
+from telemetry import timed
+
+# IVF (inverted file) index over entity description embeddings.
+# Vectors are L2-normalised and grouped by their nearest k-means centroid, so a
+# query only scores the vectors of its `nprobe` closest lists. All arrays are
+# plain .npy files opened with mmap_mode='r'; nothing but the centroids has to
+# be resident in memory.
+DEFAULT_NPROBE = 16
+KMEANS_ITERATIONS = 10
+TRAINING_SAMPLES_PER_LIST = 64
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        assignments[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+    return assignments
+
+def train_centroids(vectors: np.ndarray, n_lists: int, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means on a sample of the vectors.
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * TRAINING_SAMPLES_PER_LIST)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        empty = np.bincount(assignments, minlength=n_lists) == 0
+        # Re-seed empty lists with random samples so no list stays unused
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+def build_index(ids: List[str], vectors: np.ndarray, path: str, n_lists: Optional[int] = None) -> dict:
+    """
+    Build an IVF index from ids and their embeddings and write it to path.
+    """
+    vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+    n_lists = n_lists or max(1, min(len(vectors), int(4 * np.sqrt(len(vectors)))))
+    centroids = train_centroids(vectors, n_lists)
+    assignments = _assign(vectors, centroids)
+    order = np.argsort(assignments, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))]).astype(np.int64)
+
+    os.makedirs(path, exist_ok=True)
+    arrays = {
+        'centroids': centroids,
+        'vectors': vectors[order],
+        'offsets': offsets,
+        'ids': np.asarray(ids, dtype=str)[order],
+    }
+    # Write next to the old files and swap them in, so searches that still
+    # have the previous index memory-mapped keep reading intact data
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.tmp.npy'), array)
+        os.replace(os.path.join(path, f'{name}.tmp.npy'), os.path.join(path, f'{name}.npy'))
+    meta = {'count': len(vectors), 'dimension': int(vectors.shape[1]), 'n_lists': n_lists, 'built_at': time.time()}
+    with open(os.path.join(path, 'meta.tmp.json'), 'w') as f:
+        json.dump(meta, f)
+    os.replace(os.path.join(path, 'meta.tmp.json'), os.path.join(path, 'meta.json'))
+    return meta
+
+def build_index_from_parquet(parquet_path: str, path: str, n_lists: Optional[int] = None) -> dict:
+    """
+    Build the index from create_final_entities.parquet, skipping rows without an embedding.
+    """
+    table = pq.read_table(parquet_path, columns=['id', 'description_embedding'])
+    table = table.filter(table.column('description_embedding').is_valid())
+    embeddings = table.column('description_embedding').combine_chunks()
+    dimension = len(embeddings[0]) if len(embeddings) else 0
+    vectors = embeddings.flatten().to_numpy().reshape(-1, dimension)
+    return build_index(table.column('id').to_pylist(), vectors, path, n_lists)
+
+class IVFIndex:
+    """
+    Memory-mapped IVF index. search() trades recall for latency via nprobe:
+    nprobe == n_lists is an exact scan.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.centroids = np.load(os.path.join(path, 'centroids.npy'))
+        self.vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'))
+        self.ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+
+    @timed('search_vector_index')
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = DEFAULT_NPROBE) -> List[Tuple[str, float]]:
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        nprobe = min(nprobe, len(self.centroids))
+        lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+
+        candidates = []
+        scores = []
+        for i in lists:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            if start == end:
+                continue
+            candidates.append(np.arange(start, end))
+            scores.append(self.vectors[start:end] @ query)
+        if not candidates:
+            return []
+        candidates = np.concatenate(candidates)
+        scores = np.concatenate(scores)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(str(self.ids[candidates[i]]), float(scores[i])) for i in top]
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def load_index(path: str) -> Optional[IVFIndex]:
+    """
+    Open the index at path, reusing the open copy until the index is rebuilt.
+    Returns None if no index has been built there.
+    """
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    mtime = os.path.getmtime(meta_path)
+    with _indexes_lock:
+        cached = _indexes.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, IVFIndex(path))
+            _indexes[path] = cached
+        return cached[1]
@@ -0,0 +1,78 @@
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "searches"))
+from connection_pool import ConnectionPool
+
+class FakeMemgraph:
+    """
+    Stand-in for a Memgraph client that keeps the graph version marker,
+    records every other statement with its parameters and returns no rows
+    for them. writers maps each statement to the threads that sent it.
+    """
+    _host = "fake"
+    _port = 0
+    _username = ""
+    _password = ""
+    _encrypted = False
+    _client_name = "tests"
+    _cached_connection = None
+
+    def __init__(self):
+        self.version = 0
+        self.analytics_version = None
+        self.statements = []
+        self.writers = {}
+        self.lock = threading.Lock()
+
+    def execute(self, query, parameters=None):
+        list(self.execute_and_fetch(query, parameters))
+
+    def execute_and_fetch(self, query, parameters=None):
+        parameters = parameters or {}
+        with self.lock:
+            if "OPTIONAL MATCH (v:__GraphVersion__" in query:
+                return iter([{"version": self.version, "analytics_version": self.analytics_version}])
+            if "SET v.version" in query:
+                self.version += 1
+                if parameters.get("analytics"):
+                    self.analytics_version = self.version
+                return iter([{"version": self.version}])
+            if "SET v.analytics_version = $version" in query:
+                self.analytics_version = parameters["version"]
+            self.statements.append((query, parameters))
+            self.writers.setdefault(query, set()).add(threading.get_ident())
+            return iter(())
+
+    def ran(self, fragment):
+        """
+        Statements run so far that contain fragment.
+        """
+        with self.lock:
+            return [(query, parameters) for query, parameters in self.statements if fragment in query]
+
+class FakePool(ConnectionPool):
+    """
+    A pool whose connections all share one FakeMemgraph.
+    """
+
+    def __init__(self, graph, size=4):
+        super().__init__(graph._host, graph._port, size)
+        self.graph = graph
+
+    def _connect(self):
+        return self.graph
+
+@pytest.fixture
+def graph():
+    return FakeMemgraph()
+
+@pytest.fixture
+def pool(graph):
+    with FakePool(graph) as pool:
+        yield pool
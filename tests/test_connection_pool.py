@@ -0,0 +1,13 @@
+import pytest
+
+from conftest import FakePool
+
+def test_acquire_times_out_when_every_connection_is_checked_out(graph):
+    with FakePool(graph, size=1) as pool:
+        pool.acquire_timeout = 0.05
+        with pool.connection():
+            with pytest.raises(TimeoutError, match="all 1 are checked out"):
+                pool.acquire()
+        # The slot is free again once the holder releases it
+        with pool.connection(timeout=0.05) as memgraph:
+            assert memgraph is graph
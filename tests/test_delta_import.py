@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+import load_to_mem
+
+# Appended, since some benchmarks share a name with the module they measure
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synthetic_graphrag import generate
+
+@pytest.fixture
+def graphrag(tmp_path, monkeypatch):
+    folder = tmp_path / "graphrag"
+    generate(str(folder), documents=3, chunks_per_document=4, entities=20, dim=8)
+    monkeypatch.setattr(load_to_mem, "GRAPHRAG_FOLDER", str(folder))
+    monkeypatch.setattr(load_to_mem, "QUARANTINE_FOLDER", str(tmp_path / "quarantine"))
+    return folder
+
+def delta(pool, tmp_path):
+    return load_to_mem.run_delta_import(pool, workers=1, manifest_path=str(tmp_path / "manifest.sqlite"),
+                                        update_text_index=False)
+
+def replay_edges(graph):
+    """
+    RELATED and IN_COMMUNITY edges left by the statements sent, in order.
+    """
+    related, in_community = {}, set()
+    for query, parameters in graph.statements:
+        rows = parameters.get("rows", [])
+        if load_to_mem.rel_statement in query:
+            related.update((row["id"], (row["source_id"], row["target_id"])) for row in rows)
+        elif load_to_mem.rel_delete_statement in query:
+            for row in rows:
+                related.pop(row["id"], None)
+        elif load_to_mem.community_member_statement in query:
+            in_community.update((entity_id, row["id"]) for row in rows for entity_id in row["entity_ids"])
+        elif load_to_mem.community_prune_statement in query or load_to_mem.community_delete_statement in query:
+            communities = {row["id"] for row in rows}
+            in_community = {edge for edge in in_community if edge[1] not in communities}
+        elif load_to_mem.entity_delete_statement in query:
+            entities = {row["id"] for row in rows}
+            related = {rel_id: ends for rel_id, ends in related.items() if entities.isdisjoint(ends)}
+            in_community = {edge for edge in in_community if edge[0] not in entities}
+    return related, in_community
+
+def test_replaced_entity_keeps_its_edges(graph, pool, graphrag, tmp_path):
+    delta(pool, tmp_path)
+    related, in_community = replay_edges(graph)
+    old_edges = {rel_id for rel_id, ends in related.items() if "entity-5" in ends}
+    old_communities = {community for entity_id, community in in_community if entity_id == "entity-5"}
+    assert old_edges and old_communities
+
+    # GraphRAG re-runs can give an entity a new id under the same name
+    path = graphrag / "create_final_entities.parquet"
+    table = pq.read_table(path)
+    ids = pc.if_else(pc.equal(table.column("id"), "entity-5"), "entity-5-v2", table.column("id"))
+    pq.write_table(table.set_column(table.schema.get_field_index("id"), "id", ids), path)
+    _, changed = delta(pool, tmp_path)
+    assert changed
+
+    related, in_community = replay_edges(graph)
+    assert {rel_id for rel_id, ends in related.items() if "entity-5-v2" in ends} == old_edges
+    assert {community for entity_id, community in in_community if entity_id == "entity-5-v2"} == old_communities
+    assert not any("entity-5" in ends for ends in related.values())
+
+def test_unchanged_delta_reports_no_changes(graph, pool, graphrag, tmp_path):
+    _, changed = delta(pool, tmp_path)
+    assert changed
+    sent = len(graph.statements)
+    _, changed = delta(pool, tmp_path)
+    assert not changed
+    assert not any("UNWIND $rows" in query for query, _ in graph.statements[sent:])
@@ -0,0 +1,15 @@
+import entity_matcher
+from conftest import FakeMemgraph
+from entity_matcher import EntityMatcher, load_matcher
+
+def test_empty_entities_table_matches_nothing(graph):
+    entity_matcher._matchers.clear()
+    # FakeMemgraph returns no entity names
+    assert load_matcher(graph).find("Who is Alpha?") == []
+    assert EntityMatcher([]).find("") == []
+
+def test_unusable_names_are_skipped():
+    matcher = EntityMatcher([None, "", "?!", "A", "Alpha Beta"])
+    assert matcher.count == 1
+    assert matcher.find("what about alpha beta?") == ["Alpha Beta"]
+    assert matcher.find(None) == []
@@ -0,0 +1,49 @@
+import load_to_mem
+import graph_analytics
+from graph_analytics import refresh_analytics
+from result_cache import cache, cached
+
+def test_unchanged_import_skips_analytics_and_keeps_cache(graph, pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(load_to_mem, "DESCRIPTION_STORE_PATH", str(tmp_path / "description"))
+    monkeypatch.setattr(graph_analytics, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    monkeypatch.setattr(load_to_mem, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    cache.clear()
+    calls = []
+
+    @cached("test")
+    def search(query, memgraph, limit=10):
+        calls.append(query)
+        return [{"id": query}]
+
+    assert load_to_mem.refresh_derived_state(pool, changed=True, vector_index=False) == 1
+    # The analytics carry the version they were published with
+    assert graph.analytics_version == graph.version == 1
+    assert len(graph.ran("pagerank.get")) == 1
+    search("query", graph)
+
+    assert load_to_mem.refresh_derived_state(pool, changed=False, vector_index=False) is None
+    assert not refresh_analytics(graph)
+    assert graph.version == 1
+    assert len(graph.ran("pagerank.get")) == 1
+    cache.versions.clear()
+    search("query", graph)
+    assert calls == ["query"]
+
+def test_changed_import_recomputes_analytics(graph, pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(load_to_mem, "DESCRIPTION_STORE_PATH", str(tmp_path / "description"))
+    monkeypatch.setattr(graph_analytics, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    monkeypatch.setattr(load_to_mem, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    load_to_mem.refresh_derived_state(pool, changed=True, vector_index=False)
+    load_to_mem.refresh_derived_state(pool, changed=True, vector_index=False)
+    assert graph.analytics_version == graph.version == 2
+    assert len(graph.ran("pagerank.get")) == 2
+
+def test_import_without_analytics_leaves_them_stale(graph, pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(load_to_mem, "DESCRIPTION_STORE_PATH", str(tmp_path / "description"))
+    monkeypatch.setattr(graph_analytics, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    monkeypatch.setattr(load_to_mem, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    load_to_mem.refresh_derived_state(pool, changed=True, vector_index=False, analytics=False)
+    assert graph.version == 1 and graph.analytics_version is None
+    # A later standalone run catches up and stamps the current version
+    assert refresh_analytics(graph)
+    assert graph.analytics_version == 1
@@ -0,0 +1,55 @@
+import numpy as np
+
+import entity_matcher
+import load_to_mem
+import node2vec_search
+from conftest import FakeMemgraph
+from embedding_store import build_store, load_store
+from result_cache import cache
+
+NAMES = {"entity-0": "ALPHA", "entity-1": "BETA", "entity-2": "GAMMA"}
+
+class EntityMemgraph(FakeMemgraph):
+    """
+    Answers the entity name, seed and hit lookups the node2vec search sends.
+    """
+
+    def execute_and_fetch(self, query, parameters=None):
+        if query == entity_matcher.NAMES_QUERY:
+            return iter([{"name": name} for name in NAMES.values()])
+        if query == node2vec_search.SEED_QUERY:
+            ids = {name: entity_id for entity_id, name in NAMES.items()}
+            return iter([{"name": name, "id": ids[name]} for name in parameters["names"] if name in ids])
+        if "UNWIND $hits" in query:
+            return iter([self.entity(hit) for hit in parameters["hits"]])
+        if "UNWIND q.hits" in query:
+            return iter([{"idx": q["idx"], "rows": [self.entity(hit) for hit in q["hits"]]}
+                         for q in parameters["queries"]])
+        return super().execute_and_fetch(query, parameters)
+
+    def entity(self, hit):
+        return {"entity_id": hit["id"], "name": NAMES[hit["id"]], "description": None,
+                "similarity": hit["similarity"]}
+
+def test_store_search_ranks_entities_near_the_seed(tmp_path, monkeypatch):
+    # 128-d like node2vec.get; BETA sits next to ALPHA, GAMMA far away
+    rng = np.random.default_rng(0)
+    alpha = rng.normal(size=128)
+    vectors = np.stack([alpha, alpha + rng.normal(scale=0.1, size=128), -alpha])
+    build_store(list(NAMES), vectors, str(tmp_path / "node2vec"), "int8")
+    monkeypatch.setattr(node2vec_search, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    entity_matcher._matchers.clear()
+    cache.clear()
+
+    rows = node2vec_search.node2vec_search("Who works with Alpha?", EntityMemgraph(), limit=2)
+    assert [row["name"] for row in rows] == ["ALPHA", "BETA"]
+    assert rows[0]["similarity"] > rows[1]["similarity"] > 0.9
+    batch = node2vec_search.node2vec_search_batch(["Who works with Alpha?", "And gamma?"], EntityMemgraph(), limit=1)
+    assert [[row["entity_id"] for row in rows] for rows in batch] == [["entity-0"], ["entity-2"]]
+
+def test_graph_embeddings_retire_the_node2vec_store_without_analytics(pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(load_to_mem, "DESCRIPTION_STORE_PATH", str(tmp_path / "description"))
+    monkeypatch.setattr(load_to_mem, "NODE2VEC_STORE_PATH", str(tmp_path / "node2vec"))
+    build_store(["entity-0"], np.ones((1, 128)), str(tmp_path / "node2vec"))
+    load_to_mem.refresh_derived_state(pool, vector_index=False, analytics=False)
+    assert load_store(str(tmp_path / "node2vec")) is None
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+import load_to_mem
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synthetic_graphrag import generate
+
+@pytest.fixture
+def graphrag(tmp_path, monkeypatch):
+    folder = tmp_path / "graphrag"
+    generate(str(folder), documents=6, chunks_per_document=8, entities=200, dim=8)
+    monkeypatch.setattr(load_to_mem, "GRAPHRAG_FOLDER", str(folder))
+    monkeypatch.setattr(load_to_mem, "QUARANTINE_FOLDER", str(tmp_path / "quarantine"))
+    return folder
+
+def test_edge_stages_have_a_single_writer(graph, pool, graphrag):
+    load_to_mem.run_import(pool, workers=4, batch_size=10)
+    for stage in load_to_mem.stages:
+        writers = graph.writers["UNWIND $rows AS value " + stage.statement]
+        if stage.partition_key is None:
+            assert len(writers) == 1, stage.name
+    # Vertex stages still spread over the workers
+    entities = next(stage for stage in load_to_mem.stages if stage.name == "entities")
+    assert len(graph.writers["UNWIND $rows AS value " + entities.statement]) > 1
+
+def test_vertex_stage_rows_of_one_node_share_a_worker():
+    records = [{"community": i % 7, "id": f"{i % 7}:{i}"} for i in range(100)]
+    partitions = load_to_mem.partition_records(records, "community", 4)
+    owners = {}
+    for i, partition in enumerate(partitions):
+        for record in partition:
+            assert owners.setdefault(record["community"], i) == i
+
+def test_parallel_import_prints_one_total(pool, capsys):
+    batches = ([{"id": f"doc-{i}", "title": "title"} for i in range(start, start + 500)]
+               for start in range(0, 3000, 500))
+    imported = load_to_mem.parallel_import(load_to_mem.document_statement, batches, "id", pool, total=3000,
+                                           workers=4, batch_size=50)
+    assert imported == 3000
+    totals = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Total:")]
+    assert len(totals) == 1
+    assert "3000 / 3000 rows committed by 4 workers" in totals[0]
@@ -0,0 +1,30 @@
+import json
+
+from gqlalchemy.exceptions import GQLAlchemyDatabaseError
+
+import load_to_mem
+from conftest import FakeMemgraph
+
+class RejectingMemgraph(FakeMemgraph):
+    """
+    Rejects every batch holding a row without a title, as a constraint would.
+    """
+
+    def execute(self, query, parameters=None):
+        if any(row["title"] is None for row in parameters["rows"]):
+            raise GQLAlchemyDatabaseError("Property title must not be null")
+        super().execute(query, parameters)
+
+def test_quarantined_rows_are_not_counted_and_not_kept(tmp_path):
+    records = [{"id": f"row-{i}", "title": None if i % 100 == 7 else "title"} for i in range(1000)]
+    bad = [record for record in records if record["title"] is None]
+    quarantine = load_to_mem.Quarantine(str(tmp_path / "rows.jsonl"))
+    stats = load_to_mem.ImportStats("rows")
+    committed = load_to_mem.batched_import(load_to_mem.document_statement, [records], RejectingMemgraph(),
+                                           len(records), batch_size=50, stats=stats, quarantine=quarantine)
+    assert committed == stats.rows == 990
+    assert stats.quarantined == 10
+    assert quarantine.failed_ids == [record["id"] for record in bad]
+    assert not hasattr(quarantine, "rows")
+    with open(tmp_path / "rows.jsonl") as f:
+        assert [json.loads(line)["row"] for line in f] == bad
@@ -0,0 +1,32 @@
+from conftest import FakeMemgraph
+from result_cache import cache, cached
+
+class OtherServer(FakeMemgraph):
+    _host = "other"
+
+def counting_search():
+    calls = []
+
+    @cached("test")
+    def search(query, memgraph, limit=10, depth=2):
+        calls.append((query, limit, depth))
+        return [{"id": query, "server": memgraph._host}]
+    return search, calls
+
+def test_positional_keyword_and_default_options_share_an_entry(graph):
+    cache.clear()
+    search, calls = counting_search()
+    search("Query", graph)
+    search("query", graph, 10)
+    search("query", graph, 10, 2)
+    search("query", memgraph=graph, depth=2, limit=10)
+    assert calls == [("Query", 10, 2)]
+    search("query", graph, 10, 3)
+    assert calls[-1] == ("query", 10, 3)
+
+def test_servers_have_their_own_entries(graph):
+    cache.clear()
+    search, calls = counting_search()
+    assert search("query", graph)[0]["server"] == "fake"
+    assert search("query", OtherServer())[0]["server"] == "other"
+    assert len(calls) == 2
@@ -0,0 +1,51 @@
+from result_stream import Cursor, iter_hits
+
+KEYS = ('id', 'score')
+
+class EchoMemgraph:
+    """
+    Returns one row per hit sent, as a lookup statement over $hits would.
+    """
+
+    def execute_and_fetch(self, query, parameters=None):
+        return iter([{'id': hit['id'], 'score': hit['score']} for hit in parameters['hits']])
+
+def index(hits):
+    """
+    A search(k) over hits that breaks ties in reverse id order, so which
+    tied hits make the top k changes as k grows.
+    """
+    ranked = sorted(hits, key=lambda hit: (-hit[1], tuple(-ord(c) for c in hit[0])))
+    calls = []
+
+    def search(k):
+        calls.append(k)
+        return ranked[:k]
+    return search, calls
+
+def ids(rows):
+    return [row['id'] for row in rows]
+
+def test_ties_at_the_cut_are_neither_repeated_nor_skipped():
+    search, _ = index([('a', 3.0), ('b', 2.0), ('c', 2.0), ('d', 2.0), ('e', 1.0)])
+    assert ids(iter_hits(EchoMemgraph(), '', search, KEYS, page_size=1)) == ['a', 'b', 'c', 'd', 'e']
+    for limit in range(1, 6):
+        rows = iter_hits(EchoMemgraph(), '', search, KEYS, limit=limit, page_size=2)
+        assert ids(rows) == ['a', 'b', 'c', 'd', 'e'][:limit]
+
+def test_cursor_resumes_past_the_first_search():
+    hits = [(f'id{i:04d}', 1 - i / 5000) for i in range(2500)]
+    search, _ = index(hits)
+    after = Cursor(hits[1499][1], hits[1499][0])
+    rows = iter_hits(EchoMemgraph(), '', search, KEYS, limit=5, page_size=100, after=after)
+    assert ids(rows) == [f'id{i:04d}' for i in range(1500, 1505)]
+
+def test_unlimited_reads_every_hit():
+    hits = [(f'id{i:04d}', 1 - i / 5000) for i in range(2500)]
+    search, _ = index(hits)
+    assert ids(iter_hits(EchoMemgraph(), '', search, KEYS, page_size=100)) == [hit_id for hit_id, _ in hits]
+
+def test_limited_search_usually_needs_one_index_call():
+    search, calls = index([(f'id{i:04d}', 1 - i / 5000) for i in range(2500)])
+    assert len(list(iter_hits(EchoMemgraph(), '', search, KEYS, limit=250, page_size=100))) == 250
+    assert calls == [251]
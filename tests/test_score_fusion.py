@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+import score_fusion
+from score_fusion import STRATEGY_FIELDS, fuse
+
+def results(n, seed=0):
+    rng = np.random.default_rng(seed)
+    results = {}
+    for strategy, (id_type, id_field, text_field, score_field) in STRATEGY_FIELDS.items():
+        ids = rng.integers(0, n * 2, n)
+        # Rounded, so ties and missing scores come up
+        scores = [None if i % 17 == 3 else round(float(score), 1) for i, score in enumerate(rng.random(n))]
+        results[strategy] = [{id_field: f"{id_type}-{i}", 'name': f"NAME {i}", text_field: f"text {i}",
+                              score_field: score} for i, score in zip(ids, scores)]
+    results['community_detection'] = [{'community': c, 'entities': [f"NAME {i}" for i in rng.integers(0, n * 2, 5)],
+                                       'relevance': c % 3} for c in range(max(1, n // 5))]
+    return results
+
+@pytest.mark.parametrize("fusion", ["rrf", "minmax", "zscore", "raw"])
+@pytest.mark.parametrize("n", [3, 40, 400])
+def test_dict_and_bincount_merges_agree(monkeypatch, fusion, n):
+    fused = {}
+    for merge, minimum in (("dict", float("inf")), ("bincount", 0)):
+        monkeypatch.setattr(score_fusion, "ARRAY_MERGE_MIN", minimum)
+        fused[merge] = fuse(results(n), limit=25, fusion=fusion)
+    # Scores agree; among equal scores either merge may come first
+    assert [row['score'] for row in fused["dict"]] == pytest.approx([row['score'] for row in fused["bincount"]])
+    by_key = {(row['type'], row['id']): row for row in fused["bincount"]}
+    for row in fused["dict"]:
+        other = by_key.get((row['type'], row['id']))
+        if other is not None:
+            assert other == {**row, 'score': pytest.approx(row['score'])}